@@ -10,8 +10,12 @@ def get_nfl_data_bucket():
     """Get the NFL data bucket name"""
     return "alt-nfl-bucket"
 
-def create_lambda_zip_from_directory(directory_path):
-    """Create a zip file from a directory containing handler.py and requirements.txt"""
+def create_lambda_zip_from_directory(directory_path, shared_packages=None):
+    """Create a zip file from a directory containing handler.py and requirements.txt
+
+    shared_packages is an optional list of directories (e.g. genai/nfl_athena, genai/database)
+    copied into the root of the zip so the handler can import or read them.
+    """
     import subprocess
     import tempfile
     import shutil
@@ -27,6 +31,15 @@ def create_lambda_zip_from_directory(directory_path):
         else:
             raise FileNotFoundError(f"handler.py not found in {directory_path}")
         
+        # Copy shared packages (code and DDLs shared with the genai tools)
+        for package_path in shared_packages or []:
+            package_name = os.path.basename(os.path.normpath(package_path))
+            shutil.copytree(
+                package_path,
+                os.path.join(temp_dir, package_name),
+                ignore=shutil.ignore_patterns('__pycache__', '*.pyc')
+            )
+        
         # Install dependencies if requirements.txt exists
         requirements_path = os.path.join(directory_path, 'requirements.txt')
         if os.path.exists(requirements_path):
@@ -190,7 +203,10 @@ def get_or_create_lambda_role():
                         "athena:StartQueryExecution",
                         "athena:GetQueryExecution",
                         "athena:GetQueryResults",
-                        "athena:StopQueryExecution"
+                        "athena:StopQueryExecution",
+                        "athena:GetPreparedStatement",
+                        "athena:CreatePreparedStatement",
+                        "athena:UpdatePreparedStatement"
                     ],
                     "Resource": "*"
                 },
@@ -233,6 +249,7 @@ def main():
     
     # Get current directory
     current_dir = os.path.dirname(os.path.abspath(__file__))
+    genai_dir = os.path.join(current_dir, '..', 'genai')
     
     # Initialize AWS clients
     lambda_client = boto3.client('lambda', region_name='us-east-1')
@@ -248,7 +265,11 @@ def main():
             'directory': os.path.join(current_dir, 'nfl-data-service'),
             'handler': 'handler.lambda_handler',
             'description': 'NFL MCP service for Athena database queries',
-            'environment': {}
+            'environment': {},
+            'shared_packages': [
+                os.path.join(genai_dir, 'nfl_athena'),
+                os.path.join(genai_dir, 'database')
+            ]
         },
         {
             'name': 'nfl-game-service',
@@ -284,7 +305,10 @@ def main():
         
         try:
             # Create zip file
-            zip_content = create_lambda_zip_from_directory(func_config['directory'])
+            zip_content = create_lambda_zip_from_directory(
+                func_config['directory'],
+                shared_packages=func_config.get('shared_packages')
+            )
             
             # Deploy function
             function_info = create_or_update_lambda(
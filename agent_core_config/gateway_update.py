@@ -93,18 +93,57 @@ def main():
                             "properties": {
                                 "operation": {
                                     "type": "string",
-                                    "description": "The data operation to perform (use 'query_database')"
+                                    "description": "The data operation to perform: 'query_database' for one query, 'query_batch' to run several independent queries concurrently, 'run_template' to run a curated query with parameters (no SQL needed), 'submit_query' to start a slow query without waiting and 'get_query_result' to collect it later"
                                 },
                                 "sql": {
                                     "type": "string",
-                                    "description": "The SQL query to execute (SELECT statements only)"
+                                    "description": "The SQL query to execute (SELECT statements only) - for query_database"
+                                },
+                                "statements": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "For query_batch: independent SELECT statements to run concurrently (e.g. player A vs player B)"
+                                },
+                                "return_mode": {
+                                    "type": "string",
+                                    "description": "For query_batch: 'all' (input order, default) or 'as_completed' (finish order)"
+                                },
+                                "max_concurrency": {
+                                    "type": "integer",
+                                    "description": "For query_batch: maximum statements running at once (capped by the service)"
+                                },
+                                "template": {
+                                    "type": "string",
+                                    "enum": ["player_season_totals", "team_game_log", "head_to_head", "weekly_leaders"],
+                                    "description": "For run_template: player_season_totals (player_name, season), team_game_log (team, season), head_to_head (team_a, team_b, optional first_season/last_season), weekly_leaders (season, week, stat_type, stat_label)"
+                                },
+                                "parameters": {
+                                    "type": "object",
+                                    "description": "For run_template: the template parameters, e.g. {\"team\": \"KC\", \"season\": 2024}. Teams are abbreviations (KC, NO, BAL)"
+                                },
+                                "query_id": {
+                                    "type": "string",
+                                    "description": "For get_query_result: the query_id returned by submit_query"
+                                },
+                                "wait_seconds": {
+                                    "type": "integer",
+                                    "description": "For get_query_result: wait up to this many seconds (max 20) for the query to finish before returning its state"
                                 },
                                 "database": {
                                     "type": "string",
                                     "description": "The database name (use 'nfl_stats_database')"
+                                },
+                                "allow_full_scan": {
+                                    "type": "boolean",
+                                    "description": "Set to true only when a query must scan every nfl_season partition of a large table"
+                                },
+                                "format": {
+                                    "type": "string",
+                                    "enum": ["records", "columnar", "csv"],
+                                    "description": "Result layout: records (one object per row, default), columnar (columns + row arrays, minified) or csv (compact CSV text) - columnar/csv are much smaller for large results"
                                 }
                             },
-                            "required": ["operation", "sql"]
+                            "required": ["operation"]
                         }
                     }
                 ]
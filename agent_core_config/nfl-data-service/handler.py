@@ -3,6 +3,35 @@ import boto3
 import time
 # import pandas as pd  # Removed to avoid Lambda import issues
 import os
+from nfl_athena.results import decode_result_set
+from nfl_athena.cost import guard_query, compare_with_actual
+from nfl_athena.parquet import route_to_parquet, unroute_parquet
+from nfl_athena.local_engine import execute_local
+from nfl_athena.batch import iter_batch, MAX_CONCURRENCY, MAX_STATEMENTS
+from nfl_athena.deadline import Deadline, wait_for_query
+from nfl_athena.sql_validation import validate_sql
+from nfl_athena.templates import TEMPLATES, resolve, render, ensure_prepared, execution_parameters
+
+# Result layouts for the 'format' parameter: records (default, one dict per row),
+# columnar (column list + row arrays) and csv (one compact CSV string)
+RESPONSE_FORMATS = ['records', 'columnar', 'csv']
+MAX_RESULT_ROWS = 100
+
+# Longest get_query_result long-poll (the gateway call stays open meanwhile)
+MAX_RESULT_WAIT_SECONDS = int(os.environ.get('ATHENA_RESULT_MAX_WAIT_SECONDS', 20))
+
+# Where query results are written. submit_query uses its own prefix, and
+# get_query_result only reads (or retries) executions found under it, so a
+# query_id can't be used to read or re-run other queries in the account
+ATHENA_WORKGROUP = 'primary'
+S3_OUTPUT_LOCATION = 's3://alt-nfl-bucket/athena_queries/'
+SUBMITTED_OUTPUT_LOCATION = S3_OUTPUT_LOCATION + 'nfl-data-service/submitted/'
+
+def serialize_result(result):
+    """JSON text of a service response; the compact formats are also sent minified"""
+    if result.get('format') in ('columnar', 'csv'):
+        return json.dumps(result, separators=(',', ':'))
+    return json.dumps(result, indent=2)
 
 def lambda_handler(event, context):
     """
@@ -13,15 +42,18 @@ def lambda_handler(event, context):
     # Debug logging
     print(f"DEBUG: Received event: {json.dumps(event)}")
     
+    # Stop Athena work before the Lambda itself times out
+    deadline = Deadline.from_lambda_context(context)
+    
     try:
         # Handle direct format from MCP Gateway
         if 'operation' in event:
             print("DEBUG: Using direct MCP Gateway format")
-            result = handle_data_request(event)
+            result = handle_data_request(event, deadline)
             return {
                 'statusCode': 200,
                 'body': json.dumps({
-                    'content': [{'type': 'text', 'text': json.dumps(result, indent=2)}]
+                    'content': [{'type': 'text', 'text': serialize_result(result)}]
                 })
             }
         
@@ -45,20 +77,66 @@ def lambda_handler(event, context):
                                 'properties': {
                                     'operation': {
                                         'type': 'string',
-                                        'enum': ['query_database'],
+                                        'enum': ['query_database', 'query_batch', 'run_template', 'submit_query', 'get_query_result'],
                                         'description': 'The data operation to perform'
                                     },
                                     'sql': {
                                         'type': 'string',
-                                        'description': 'The SQL query to execute (SELECT statements only)'
+                                        'description': 'The SQL query to execute (SELECT statements only) - for query_database'
+                                    },
+                                    'statements': {
+                                        'type': 'array',
+                                        'items': {'type': 'string'},
+                                        'description': 'For query_batch: independent SELECT statements to run concurrently'
+                                    },
+                                    'return_mode': {
+                                        'type': 'string',
+                                        'enum': ['all', 'as_completed'],
+                                        'description': 'For query_batch: input order (all) or finish order (as_completed)',
+                                        'default': 'all'
+                                    },
+                                    'max_concurrency': {
+                                        'type': 'integer',
+                                        'description': 'For query_batch: maximum statements running at once (capped by the service)'
+                                    },
+                                    'template': {
+                                        'type': 'string',
+                                        'enum': list(TEMPLATES),
+                                        'description': 'For run_template: ' + '; '.join(
+                                            f"{t.name} ({', '.join(p.name for p in t.params)}): {t.description}"
+                                            for t in TEMPLATES.values())
+                                    },
+                                    'parameters': {
+                                        'type': 'object',
+                                        'description': 'For run_template: the template parameters, e.g. {"team": "KC", "season": 2024}'
+                                    },
+                                    'query_id': {
+                                        'type': 'string',
+                                        'description': 'For get_query_result: the query_id returned by submit_query'
+                                    },
+                                    'wait_seconds': {
+                                        'type': 'integer',
+                                        'description': f'For get_query_result: wait up to this many seconds for the query to finish (0-{MAX_RESULT_WAIT_SECONDS}, default 0)',
+                                        'default': 0
                                     },
                                     'database': {
                                         'type': 'string',
                                         'description': 'The database name (default: nfl_stats_database)',
                                         'default': 'nfl_stats_database'
+                                    },
+                                    'allow_full_scan': {
+                                        'type': 'boolean',
+                                        'description': 'Allow scanning every nfl_season partition of a large table (default: false; also applies to the CSV retry in get_query_result)',
+                                        'default': False
+                                    },
+                                    'format': {
+                                        'type': 'string',
+                                        'enum': RESPONSE_FORMATS,
+                                        'description': 'Result layout: records (one object per row), columnar (columns + row arrays, minified) or csv (compact CSV text)',
+                                        'default': 'records'
                                     }
                                 },
-                                'required': ['operation', 'sql']
+                                'required': ['operation']
                             }
                         }
                     ]
@@ -70,11 +148,11 @@ def lambda_handler(event, context):
             arguments = params.get('arguments', {})
             
             if tool_name == 'nfl_data_service':
-                result = handle_data_request(arguments)
+                result = handle_data_request(arguments, deadline)
                 return {
                     'statusCode': 200,
                     'body': json.dumps({
-                        'content': [{'type': 'text', 'text': json.dumps(result, indent=2)}]
+                        'content': [{'type': 'text', 'text': serialize_result(result)}]
                     })
                 }
         
@@ -90,140 +168,485 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': str(e)})
         }
 
-def handle_data_request(request):
+def handle_data_request(request, deadline=None):
     """Handle the actual data request"""
     operation = request.get('operation')
+    deadline = deadline or Deadline()
+    
+    if request.get('format', 'records') not in RESPONSE_FORMATS:
+        return {'error': f"format must be one of: {', '.join(RESPONSE_FORMATS)}"}
     
     if operation == 'query_database':
-        return execute_athena_query(request)
+        return execute_athena_query(request, deadline)
+    elif operation == 'query_batch':
+        return execute_query_batch(request, deadline)
+    elif operation == 'run_template':
+        return execute_template(request, deadline)
+    elif operation == 'submit_query':
+        return submit_query(request)
+    elif operation == 'get_query_result':
+        return get_query_result(request, deadline)
     else:
         return {'error': f'Unknown operation: {operation}'}
 
-def execute_athena_query(request):
+def prepare_query(sql_query, allow_full_scan=False, response_format='records'):
+    """
+    Validate a statement and try the local engine, then apply the scan guard.
+    
+    Returns {'response': ...} when the statement is already answered (error or
+    local result), otherwise the plan for running it on Athena.
+    """
+    # Safety checks - a single read-only statement (literals, comments and identifiers are not keywords)
+    validation_error = validate_sql(sql_query)
+    if validation_error:
+        return {'response': {'error': validation_error}}
+    
+    # Small or mirrored tables are answered by the embedded engine, skipping the Athena round trip
+    local_result, local_route = execute_local(sql_query)
+    if local_result is not None:
+        return {'response': format_query_result(local_result, 'local', local_route['elapsed_ms'] / 1000,
+                                                {'engine': local_route}, response_format)}
+    if local_route.get('error'):
+        return {'response': {'error': local_route['error'], 'engine': local_route}}
+    
+    # Estimate bytes scanned and apply the full-scan policy before submitting
+    guarded_sql, scan_estimate, scan_error = guard_query(sql_query, allow_full_scan=allow_full_scan)
+    if scan_error:
+        return {'response': {'error': scan_error, 'scan_estimate': scan_estimate}}
+    
+    return {
+        'sql': guarded_sql,
+        'original_sql': sql_query,
+        'scan_estimate': scan_estimate,
+        'engine': local_route,
+        'format': response_format
+    }
+
+def finish_query(athena_client, plan, query_execution_id, response, elapsed_time, error, routed_tables, database,
+                 deadline=None, parquet_error=None):
+    """
+    Fall back to CSV if the Parquet query failed, then build the service response.
+    
+    parquet_error is set when the caller already ran the CSV retry itself (query_batch).
+    """
+    parquet_routing = None
+    if routed_tables:
+        parquet_routing = {'tables': routed_tables, 'fallback_to_csv': False}
+        if parquet_error:
+            parquet_routing['fallback_to_csv'] = True
+            parquet_routing['parquet_error'] = parquet_error
+        elif error and response is not None:
+            # Parquet query failed (missing table, type mismatch, ...) - retry on the CSV tables
+            print(f"DEBUG: Parquet query failed, falling back to CSV: {error}")
+            parquet_routing['fallback_to_csv'] = True
+            parquet_routing['parquet_error'] = error
+            query_execution_id, response, retry_time, error = run_query(athena_client, plan['sql'], database,
+                                                                        deadline)
+            elapsed_time += retry_time
+    
+    if error:
+        return {'error': error}
+    
+    # Compare the estimate with what Athena actually scanned
+    scan_estimate = plan['scan_estimate']
+    statistics = response['QueryExecution'].get('Statistics', {})
+    compare_with_actual(scan_estimate, statistics.get('DataScannedInBytes'))
+    if plan['sql'] != plan['original_sql']:
+        scan_estimate['executed_sql'] = plan['sql']
+    
+    extra = {'scan_estimate': scan_estimate, 'engine': plan['engine']}
+    if parquet_routing:
+        extra['parquet_routing'] = parquet_routing
+    
+    return build_query_result(athena_client, query_execution_id, elapsed_time, extra, plan['format'])
+
+def execute_athena_query(request, deadline=None):
     """Execute SQL query against Athena database"""
     sql_query = request.get('sql', '').strip()
     database = request.get('database', 'nfl_stats_database')
     
-    if not sql_query:
-        return {'error': 'SQL query is required'}
-    
-    # Safety checks - only allow SELECT statements
-    query_upper = sql_query.upper().strip()
-    if not query_upper.startswith('SELECT'):
-        return {'error': 'Only SELECT queries are allowed for security reasons'}
-    
-    # Check for potentially dangerous keywords
-    dangerous_keywords = ['DROP', 'DELETE', 'INSERT', 'UPDATE', 'CREATE', 'ALTER', 'TRUNCATE']
-    for keyword in dangerous_keywords:
-        if keyword in query_upper:
-            return {'error': f'Query contains prohibited keyword: {keyword}'}
+    plan = prepare_query(sql_query, bool(request.get('allow_full_scan', False)), request.get('format', 'records'))
+    if 'response' in plan:
+        return plan['response']
     
     try:
         # Initialize Athena client
         athena_client = boto3.client('athena')
         
-        # Configuration
-        s3_output_bucket = "alt-nfl-bucket"
-        s3_output_prefix = "athena_queries/"
-        
-        # Start query execution
-        response = athena_client.start_query_execution(
-            QueryString=sql_query,
-            QueryExecutionContext={'Database': database},
-            ResultConfiguration={
-                'OutputLocation': f's3://{s3_output_bucket}/{s3_output_prefix}'
-            },
-            WorkGroup='primary'
-        )
-        
-        query_execution_id = response['QueryExecutionId']
-        
-        # Wait for query to complete
-        max_wait_time = 60  # seconds
-        wait_interval = 2   # seconds
-        elapsed_time = 0
-        
-        while elapsed_time < max_wait_time:
-            response = athena_client.get_query_execution(QueryExecutionId=query_execution_id)
-            status = response['QueryExecution']['Status']['State']
+        # Prefer the Parquet copies of the CSV tables when they are available
+        routed_sql, routed_tables = route_to_parquet(plan['sql'])
+        query_execution_id, response, elapsed_time, error = run_query(athena_client, routed_sql, database,
+                                                                      deadline)
+        
+        return finish_query(athena_client, plan, query_execution_id, response, elapsed_time, error,
+                            routed_tables, database, deadline)
             
-            if status == 'SUCCEEDED':
-                break
-            elif status in ['FAILED', 'CANCELLED']:
-                error_reason = response['QueryExecution']['Status'].get('StateChangeReason', 'Unknown error')
-                return {'error': f'Query failed: {error_reason}'}
+    except Exception as e:
+        return {'error': f'Error executing Athena query: {str(e)}'}
+
+def execute_template(request, deadline=None):
+    """
+    Run a curated statement from nfl_athena.templates with typed parameters.
+    
+    On Athena the template runs as its prepared statement (EXECUTE ... with
+    ExecutionParameters); the local engine runs the same SQL with the values inlined.
+    """
+    template, values, error = resolve(request.get('template'), request.get('parameters'))
+    if error:
+        return {'error': error}
+    database = request.get('database', 'nfl_stats_database')
+    template_info = {'template': {'name': template.name, 'statement': template.statement_name, 'parameters': values}}
+    
+    plan = prepare_query(render(template, values), False, request.get('format', 'records'))
+    if 'response' in plan:
+        return {**plan['response'], **template_info}
+    
+    try:
+        athena_client = boto3.client('athena')
+        ensure_prepared(athena_client, template)
+        query_execution_id, response, elapsed_time, error = run_query(
+            athena_client, f'EXECUTE {template.statement_name}', database, deadline,
+            execution_parameters=execution_parameters(template, values))
+        
+        result = finish_query(athena_client, plan, query_execution_id, response, elapsed_time, error,
+                              None, database, deadline)
+        return {**result, **template_info}
             
-            time.sleep(wait_interval)
-            elapsed_time += wait_interval
+    except Exception as e:
+        return {'error': f'Error executing template {template.name}: {str(e)}'}
+
+def submit_query(request):
+    """
+    Start a query and return its query_id without waiting for it.
+    
+    The caller collects the result later with get_query_result, so the Lambda
+    (and the agent) is not held open while Athena runs a slow aggregate.
+    Queries the local engine can answer are returned right away.
+    """
+    sql_query = request.get('sql', '').strip()
+    database = request.get('database', 'nfl_stats_database')
+    
+    plan = prepare_query(sql_query, bool(request.get('allow_full_scan', False)), request.get('format', 'records'))
+    if 'response' in plan:
+        response = plan['response']
+        return response if 'error' in response else {**response, 'state': 'SUCCEEDED'}
+    
+    try:
+        athena_client = boto3.client('athena')
+        routed_sql, routed_tables = route_to_parquet(plan['sql'])
+        query_execution_id = start_query(athena_client, routed_sql, database,
+                                         output_location=SUBMITTED_OUTPUT_LOCATION)
         
-        if elapsed_time >= max_wait_time:
-            return {'error': 'Query timed out after 60 seconds'}
+        result = {
+            'success': True,
+            'state': 'QUEUED',
+            'query_id': query_execution_id,
+            'message': 'Query submitted. Call get_query_result with this query_id to collect the results.',
+            'scan_estimate': plan['scan_estimate'],
+            'engine': plan['engine']
+        }
+        if routed_tables:
+            result['parquet_routing'] = {'tables': routed_tables, 'fallback_to_csv': False}
+        return result
+            
+    except Exception as e:
+        return {'error': f'Error submitting Athena query: {str(e)}'}
+
+def get_query_result(request, deadline=None):
+    """
+    Return the state of a submitted query, or its results once it has finished.
+    
+    wait_seconds long-polls (up to MAX_RESULT_WAIT_SECONDS) without stopping the
+    query when the wait ends. A failed query on the Parquet tables is checked
+    again (validate_sql and the scan guard, with this request's allow_full_scan),
+    resubmitted on the CSV tables and reported as running under a new query_id.
+    Only queries started by submit_query are accepted.
+    """
+    query_execution_id = str(request.get('query_id', '')).strip()
+    if not query_execution_id:
+        return {'error': 'query_id is required (returned by submit_query)'}
+    try:
+        wait_seconds = max(0, min(int(request.get('wait_seconds', 0)), MAX_RESULT_WAIT_SECONDS))
+    except (TypeError, ValueError):
+        return {'error': 'wait_seconds must be an integer'}
+    
+    try:
+        athena_client = boto3.client('athena')
+        if not is_submitted_query(athena_client.get_query_execution(QueryExecutionId=query_execution_id)):
+            return {'error': f'{query_execution_id} was not started by submit_query'}
+        poll_deadline = (deadline or Deadline()).child(wait_seconds)
+        try:
+            response, error = wait_for_query(athena_client, query_execution_id, poll_deadline, poll_interval=1,
+                                             stop_on_deadline=False)
+        finally:
+            poll_deadline.close()
         
-        # Get query results
-        results_response = athena_client.get_query_results(QueryExecutionId=query_execution_id)
+        execution = response['QueryExecution'] if response else {}
+        if response and execution.get('StatementType', 'DML') != 'DML':
+            return {'error': f'{query_execution_id} is not a SELECT query'}
+        state = execution.get('Status', {}).get('State', 'UNKNOWN')
+        statistics = execution.get('Statistics', {})
+        elapsed_time = round(statistics.get('TotalExecutionTimeInMillis', 0) / 1000, 2)
         
-        # Parse results
-        result_set = results_response['ResultSet']
-        rows = result_set['Rows']
+        if error:
+            # Retry a failed Parquet query on the CSV tables, as query_database does
+            csv_sql, routed_tables = unroute_parquet(execution.get('Query', ''))
+            if state == 'FAILED' and routed_tables:
+                print(f"DEBUG: Parquet query failed, resubmitting on CSV: {error}")
+                # Same checks as a new submission - the stored text is not trusted as-is
+                validation_error = validate_sql(csv_sql)
+                if validation_error:
+                    return {'error': validation_error, 'state': state, 'query_id': query_execution_id}
+                csv_sql, scan_estimate, scan_error = guard_query(
+                    csv_sql, allow_full_scan=bool(request.get('allow_full_scan', False)))
+                if scan_error:
+                    return {'error': scan_error, 'scan_estimate': scan_estimate, 'state': state,
+                            'query_id': query_execution_id}
+                retry_id = start_query(athena_client, csv_sql,
+                                       execution.get('QueryExecutionContext', {}).get('Database', 'nfl_stats_database'),
+                                       output_location=SUBMITTED_OUTPUT_LOCATION)
+                return {
+                    'success': True,
+                    'state': 'QUEUED',
+                    'query_id': retry_id,
+                    'message': 'Query failed on the Parquet tables and was resubmitted on the CSV tables. '
+                               'Call get_query_result with the new query_id.',
+                    'scan_estimate': scan_estimate,
+                    'parquet_routing': {'tables': routed_tables, 'fallback_to_csv': True, 'parquet_error': error}
+                }
+            return {'error': error, 'state': state, 'query_id': query_execution_id}
         
-        if not rows:
+        if state != 'SUCCEEDED':
             return {
                 'success': True,
-                'message': 'Query executed successfully but returned no results',
+                'state': state,
                 'query_id': query_execution_id,
-                'execution_time': elapsed_time
+                'message': 'Query is still running. Call get_query_result again (optionally with wait_seconds).',
+                'execution_time': round(statistics.get('EngineExecutionTimeInMillis', 0) / 1000, 2)
             }
         
-        # Extract column names from first row
-        columns = [col['VarCharValue'] for col in rows[0]['Data']]
-        
-        # Extract data rows
-        data_rows = []
-        for row in rows[1:]:  # Skip header row
-            row_data = []
-            for cell in row['Data']:
-                # Handle different data types
-                if 'VarCharValue' in cell:
-                    row_data.append(cell['VarCharValue'])
-                else:
-                    row_data.append('')  # Handle null values
-            data_rows.append(row_data)
-        
-        # Create formatted data structure without pandas
-        if data_rows:
-            # Limit results to prevent overwhelming output
-            max_rows = 100
-            if len(data_rows) > max_rows:
-                result_message = f"Query returned {len(data_rows)} rows. Showing first {max_rows} rows."
-                limited_rows = data_rows[:max_rows]
-            else:
-                result_message = f"Query returned {len(data_rows)} rows."
-                limited_rows = data_rows
-            
-            # Convert to list of dictionaries for JSON serialization
-            result_data = []
-            for row in limited_rows:
-                row_dict = {}
-                for i, col in enumerate(columns):
-                    row_dict[col] = row[i] if i < len(row) else None
-                result_data.append(row_dict)
+        extra = {'state': state}
+        if 'DataScannedInBytes' in statistics:
+            extra['scanned_mb'] = round(statistics['DataScannedInBytes'] / (1024 * 1024), 2)
+        return build_query_result(athena_client, query_execution_id, elapsed_time, extra,
+                                  request.get('format', 'records'))
             
-            return {
-                'success': True,
-                'message': result_message,
-                'columns': columns,
-                'data': result_data,
-                'row_count': len(data_rows),
-                'query_id': query_execution_id,
-                'execution_time': elapsed_time
-            }
+    except Exception as e:
+        return {'error': f'Error getting query result: {str(e)}'}
+
+def execute_query_batch(request, deadline=None):
+    """
+    Execute several independent SELECTs concurrently.
+    
+    All Athena statements are started at once (up to max_concurrency) and polled
+    together, so the batch takes about as long as its slowest statement.
+    return_mode 'all' returns results in input order; 'as_completed' returns them
+    in the order they finished.
+    """
+    statements = request.get('statements') or []
+    database = request.get('database', 'nfl_stats_database')
+    return_mode = request.get('return_mode', 'all')
+    
+    if not isinstance(statements, list) or not statements:
+        return {'error': 'statements must be a non-empty list of SQL queries'}
+    if len(statements) > MAX_STATEMENTS:
+        return {'error': f'At most {MAX_STATEMENTS} statements are allowed per batch'}
+    if return_mode not in ('all', 'as_completed'):
+        return {'error': "return_mode must be 'all' or 'as_completed'"}
+    try:
+        max_concurrency = max(1, min(int(request.get('max_concurrency', MAX_CONCURRENCY)), MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        return {'error': 'max_concurrency must be an integer'}
+    
+    start_time = time.time()
+    results = [None] * len(statements)
+    completion_order = []
+    athena_plans = []  # (statement index, plan, routed tables)
+    
+    for index, statement in enumerate(statements):
+        if isinstance(statement, dict):
+            sql_query = str(statement.get('sql', '')).strip()
+            allow_full_scan = bool(statement.get('allow_full_scan', request.get('allow_full_scan', False)))
         else:
-            return {
-                'success': True,
-                'message': 'Query executed successfully but returned no data rows',
-                'query_id': query_execution_id,
-                'execution_time': elapsed_time
-            }
+            sql_query = str(statement).strip()
+            allow_full_scan = bool(request.get('allow_full_scan', False))
+        plan = prepare_query(sql_query, allow_full_scan, request.get('format', 'records'))
+        if 'response' in plan:
+            results[index] = plan['response']
+            completion_order.append(index)
+        else:
+            athena_plans.append((index, plan))
+    
+    if athena_plans:
+        try:
+            athena_client = boto3.client('athena')
+            routed = [route_to_parquet(plan['sql']) for _, plan in athena_plans]
+            parquet_errors = {}  # position -> Parquet failure, for statements retried on the CSV tables
             
-    except Exception as e:
-        return {'error': f'Error executing Athena query: {str(e)}'}
+            def retry_on_csv(position, execution):
+                """A failed Parquet statement is retried on the CSV tables inside the batch, not after it"""
+                if not routed[position][1]:
+                    return None
+                parquet_errors[position] = f"Query failed: {execution['Status'].get('StateChangeReason', 'Unknown error')}"
+                print(f"DEBUG: Parquet query failed, falling back to CSV: {parquet_errors[position]}")
+                return athena_plans[position][1]['sql']
+            
+            batch = iter_batch(athena_client, [routed_sql for routed_sql, _ in routed], database,
+                               max_concurrency=max_concurrency, max_wait_time=60, deadline=deadline,
+                               retry=retry_on_csv)
+            for position, execution, elapsed_time in batch:
+                index, plan = athena_plans[position]
+                state = execution['Status']['State']
+                error = None
+                if state != 'SUCCEEDED':
+                    reason = execution['Status'].get('StateChangeReason', 'Unknown error')
+                    # Timeouts/cancellations from iter_batch already read "Query ..."
+                    error = reason if reason.startswith('Query ') else f"Query failed: {reason}"
+                response = {'QueryExecution': execution} if state == 'SUCCEEDED' else None
+                try:
+                    # Failed Parquet statements were already retried on CSV by iter_batch
+                    results[index] = finish_query(athena_client, plan, execution.get('QueryExecutionId'), response,
+                                                  round(elapsed_time, 2), error, routed[position][1], database,
+                                                  deadline, parquet_error=parquet_errors.get(position))
+                except Exception as e:
+                    results[index] = {'error': f'Error executing Athena query: {str(e)}'}
+                completion_order.append(index)
+        except Exception as e:
+            for index, _ in athena_plans:
+                if results[index] is None:
+                    results[index] = {'error': f'Error executing Athena query: {str(e)}'}
+                    completion_order.append(index)
+    
+    order = completion_order if return_mode == 'as_completed' else range(len(statements))
+    return {
+        'success': all('error' not in results[i] for i in order),
+        'message': f'Executed {len(statements)} statements',
+        'return_mode': return_mode,
+        'format': request.get('format', 'records'),
+        'max_concurrency': max_concurrency,
+        'total_time': round(time.time() - start_time, 2),
+        'results': [{'index': i, **results[i]} for i in order]
+    }
+
+def run_query(athena_client, sql_query, database, deadline=None, execution_parameters=None):
+    """
+    Start a query and wait for it to finish.
+    
+    Returns (query_execution_id, final get_query_execution response, elapsed_time, error).
+    response is None when the query never reached a terminal state; it is stopped
+    after 60 seconds or when the request deadline passes, whichever comes first.
+    execution_parameters are the values for an EXECUTE of a prepared statement.
+    """
+    # Configuration
+    max_wait_time = 60  # seconds
+    wait_interval = 2   # seconds
+    
+    query_deadline = (deadline or Deadline()).child(max_wait_time)
+    if query_deadline.expired():
+        return None, None, 0, f'Query not started: request {query_deadline.describe()}'
+    
+    start_time = time.time()
+    
+    # Start query execution
+    query_execution_id = start_query(athena_client, sql_query, database, execution_parameters)
+    
+    # Wait for query to complete (stop_query_execution on deadline or cancel)
+    try:
+        response, error = wait_for_query(athena_client, query_execution_id, query_deadline, wait_interval)
+    finally:
+        query_deadline.close()
+    
+    return query_execution_id, response, round(time.time() - start_time, 2), error
+
+def start_query(athena_client, sql_query, database, execution_parameters=None, output_location=S3_OUTPUT_LOCATION):
+    """Submit a statement to Athena and return its QueryExecutionId"""
+    extra_args = {'ExecutionParameters': execution_parameters} if execution_parameters else {}
+    response = athena_client.start_query_execution(
+        QueryString=sql_query,
+        QueryExecutionContext={'Database': database},
+        ResultConfiguration={
+            'OutputLocation': output_location
+        },
+        WorkGroup=ATHENA_WORKGROUP,
+        **extra_args
+    )
+    return response['QueryExecutionId']
+
+def is_submitted_query(response):
+    """Whether a get_query_execution response is for a query started by submit_query"""
+    execution = response['QueryExecution']
+    output_location = execution.get('ResultConfiguration', {}).get('OutputLocation', '')
+    return execution.get('WorkGroup') == ATHENA_WORKGROUP and output_location.startswith(SUBMITTED_OUTPUT_LOCATION)
+
+def build_query_result(athena_client, query_execution_id, elapsed_time, extra=None, response_format='records'):
+    """Fetch and decode the results of a finished query into the service response"""
+    # Get query results
+    results_response = athena_client.get_query_results(QueryExecutionId=query_execution_id)
+    
+    # Decode results into typed columns (numbers stay numbers in the JSON output)
+    result = decode_result_set(results_response['ResultSet'])
+    
+    return format_query_result(result, query_execution_id, elapsed_time, extra, response_format)
+
+def format_query_result(result, query_execution_id, elapsed_time, extra=None, response_format='records'):
+    """
+    Shape a decoded result (from Athena or the local engine) into the service response.
+    
+    response_format picks the row layout (see RESPONSE_FORMATS); every layout
+    reports row_count, returned_rows and data_bytes (size of the row payload).
+    """
+    extra = extra or {}
+    
+    if not result.columns:
+        return {
+            'success': True,
+            'message': 'Query executed successfully but returned no results',
+            'query_id': query_execution_id,
+            'execution_time': elapsed_time,
+            **extra
+        }
+    
+    row_count = result.row_count
+    
+    if row_count:
+        # Limit results to prevent overwhelming output
+        max_rows = MAX_RESULT_ROWS
+        if row_count > max_rows:
+            result_message = f"Query returned {row_count} rows. Showing first {max_rows} rows."
+        else:
+            result_message = f"Query returned {row_count} rows."
+        
+        if response_format == 'csv':
+            payload = {'csv': result.to_csv(limit=max_rows)}
+            data_bytes = len(payload['csv'].encode('utf-8'))
+        elif response_format == 'columnar':
+            payload = {'rows': result.to_rows(limit=max_rows)}
+            data_bytes = len(json.dumps(payload['rows'], separators=(',', ':')).encode('utf-8'))
+        else:
+            # Convert to list of dictionaries for JSON serialization
+            payload = {'data': result.to_records(limit=max_rows)}
+            data_bytes = len(json.dumps(payload['data'], indent=2).encode('utf-8'))
+        
+        return {
+            'success': True,
+            'message': result_message,
+            'format': response_format,
+            'columns': result.column_names,
+            'column_types': result.column_types,
+            **payload,
+            'row_count': row_count,
+            'returned_rows': min(row_count, max_rows),
+            'data_bytes': data_bytes,
+            'query_id': query_execution_id,
+            'execution_time': elapsed_time,
+            **extra
+        }
+    else:
+        return {
+            'success': True,
+            'message': 'Query executed successfully but returned no data rows',
+            'columns': result.column_names,
+            'query_id': query_execution_id,
+            'execution_time': elapsed_time,
+            **extra
+        }
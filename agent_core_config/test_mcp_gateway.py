@@ -10,9 +10,11 @@ from strands.models import BedrockModel
 from strands.tools.mcp.mcp_client import MCPClient
 from mcp.client.streamable_http import streamablehttp_client 
 import os
-import requests
-import json
-import boto3
+import sys
+
+# Shared MCP auth provider lives in the genai package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'genai'))
+from nfl_mcp.auth import get_auth_provider
 
 def main():
     # Check for AWS credentials
@@ -23,15 +25,10 @@ def main():
         return
 
     try:
-        secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-        sec_valu = secrets_client.get_secret_value(SecretId='nfl_mcp_auth')
-        client_info = json.loads(sec_valu['SecretString'])['client_info']
-        CLIENT_ID = client_info['client_id']
-        CLIENT_SECRET = client_info['client_secret']
-        TOKEN_URL = client_info['token_endpoint']
-        gateway_url = json.loads(sec_valu['SecretString'])['gateway_url']
+        auth = get_auth_provider()
+        gateway_url = auth.gateway_url()
         
-        print(f"✅ Found gateway: {json.loads(sec_valu['SecretString'])['gateway_id']}")
+        print(f"✅ Found gateway: {auth.config().gateway_id}")
         print(f"Gateway URL: {gateway_url}")
         
     except Exception as e:
@@ -39,14 +36,6 @@ def main():
         print("Please run gateway_deploy.py first")
         return
 
-    def fetch_access_token(client_id, client_secret, token_url):
-        response = requests.post(
-            token_url,
-            data=f"grant_type=client_credentials&client_id={client_id}&client_secret={client_secret}",
-            headers={'Content-Type': 'application/x-www-form-urlencoded'}
-        )
-        return response.json()['access_token']
-
     def create_streamable_http_transport(mcp_url: str, access_token: str):
         return streamablehttp_client(mcp_url, headers={"Authorization": f"Bearer {access_token}"})
 
@@ -140,7 +129,7 @@ def main():
 
     # Get access token and test
     try:
-        access_token = fetch_access_token(CLIENT_ID, CLIENT_SECRET, TOKEN_URL)
+        access_token = auth.access_token()
         success = test_nfl_mcp_gateway(gateway_url, access_token)
         
         if success:
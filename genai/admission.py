@@ -0,0 +1,142 @@
+"""
+Admission control for agent invocations.
+
+Every invocation opens (or leases) an MCP connection, builds an agent and holds
+a Bedrock stream, so without a limit a traffic spike slows every session in the
+container at once. `AdmissionController` admits at most
+`AGENT_MAX_CONCURRENT` invocations; the next `AGENT_MAX_QUEUE` wait in FIFO
+order, each for at most `AGENT_QUEUE_TIMEOUT_SECONDS` (and never past its own
+request deadline). Anything beyond that is shed immediately with
+
+    {"type": "error", "code": "overloaded", "message": ..., "retry_after_seconds": ...}
+
+so the client can back off instead of hanging on a container that cannot
+serve it. `snapshot()` reports queue depth, wait times and shed counts.
+
+The controller knows nothing about agents; benchmarks/bench_admission.py
+drives it with a stub model.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Configuration (override with environment variables)
+MAX_CONCURRENT = int(os.environ.get('AGENT_MAX_CONCURRENT', 16))
+MAX_QUEUE = int(os.environ.get('AGENT_MAX_QUEUE', 32))
+QUEUE_TIMEOUT_SECONDS = float(os.environ.get('AGENT_QUEUE_TIMEOUT_SECONDS', 10))
+
+
+class Overloaded(Exception):
+    """Raised when an invocation is shed (queue full or queue deadline passed)."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def event(self) -> Dict[str, Any]:
+        """The structured SSE error event for the client"""
+        return {"type": "error", "code": "overloaded", "message": f"Agent is overloaded: {self.reason}",
+                "retry_after_seconds": round(self.retry_after, 1)}
+
+
+class AdmissionController:
+    """Concurrency limit plus a bounded FIFO wait queue, for one event loop."""
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_queue: int = MAX_QUEUE,
+                 queue_timeout: float = QUEUE_TIMEOUT_SECONDS):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._recent_hold_s: Deque[float] = deque(maxlen=50)
+        self.stats = {'admitted': 0, 'queued': 0, 'shed_queue_full': 0, 'shed_timeout': 0,
+                      'peak_active': 0, 'peak_queue': 0, 'wait_ms_total': 0.0, 'max_wait_ms': 0.0}
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def retry_after(self) -> float:
+        """Rough time until a slot frees up: average invocation time times queue position"""
+        hold = sum(self._recent_hold_s) / len(self._recent_hold_s) if self._recent_hold_s else 1.0
+        return max(1.0, hold * (self.queue_depth + 1) / self.max_concurrent)
+
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """Wait for a slot; returns the queue wait in ms or raises Overloaded"""
+        start = time.perf_counter()
+        if self.active < self.max_concurrent and not self.queue_depth:
+            self._admit(start)
+            return 0.0
+        if self.queue_depth >= self.max_queue:
+            self.stats['shed_queue_full'] += 1
+            raise Overloaded(f"{self.active} invocations running and {self.queue_depth} queued", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats['queued'] += 1
+        self.stats['peak_queue'] = max(self.stats['peak_queue'], self.queue_depth)
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), max(0.0, timeout))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over as we gave up; pass it on
+            else:
+                waiter.cancel()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.stats['shed_timeout'] += 1
+            raise Overloaded(f"no capacity within {timeout:.1f}s", self.retry_after())
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        # release() kept `active` for us when it handed over the slot
+        return self._record_wait(start)
+
+    def release(self, held_seconds: Optional[float] = None):
+        """Free a slot, handing it straight to the oldest live waiter"""
+        if held_seconds is not None:
+            self._recent_hold_s.append(held_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.stats['admitted'] += 1
+                return
+        self.active = max(0, self.active - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        admitted = self.stats['admitted']
+        return {'active': self.active, 'queue_depth': self.queue_depth, 'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue, **self.stats,
+                'avg_wait_ms': round(self.stats['wait_ms_total'] / admitted, 1) if admitted else 0.0}
+
+    def _admit(self, start: float):
+        self.active += 1
+        self.stats['admitted'] += 1
+        self.stats['peak_active'] = max(self.stats['peak_active'], self.active)
+        self._record_wait(start)
+
+    def _record_wait(self, start: float) -> float:
+        wait_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.stats['wait_ms_total'] = round(self.stats['wait_ms_total'] + wait_ms, 1)
+        self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], wait_ms)
+        return wait_ms
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Per-container controller (AgentCore serves every invocation on one event loop)"""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
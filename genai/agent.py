@@ -1,9 +1,34 @@
+import json
 import os
+import time
 from bedrock_agentcore import BedrockAgentCoreApp
+from admission import Overloaded, get_admission_controller
 from agent_config import create_strands_agent
+from nfl_athena.deadline import Deadline, deadline_scope
+from model_router import AUTO_MODEL, route
+from nfl_athena.tracing import TRACE_ENABLED, current_span, span, trace_scope
+from nfl_mcp.auth import get_auth_provider
+from nfl_mcp.connections import get_connection_manager
+from session_store import flush_session
+from stream_coalescing import CoalesceConfig, stream_tokens
+from tool_runtime import loop_monitor, run_blocking
 
 app = BedrockAgentCoreApp()
 
+# MCP gateway secret + access token, cached per container and fetched before the first request
+mcp_auth = get_auth_provider()
+mcp_auth.prefetch()
+
+# Warm MCP client per gateway URL with a cached tool list, connected before the first request
+mcp_connections = get_connection_manager()
+mcp_connections.prewarm()
+
+# Time budget for one invocation; Athena/S3 work still running when it ends is stopped
+REQUEST_BUDGET_SECONDS = float(os.environ.get('AGENT_REQUEST_BUDGET_SECONDS', 300))
+
+# At most AGENT_MAX_CONCURRENT invocations run; a bounded queue waits, the rest are shed
+admission = get_admission_controller()
+
 def abbreviate_model(model_id):
     """Convert full model ID to abbreviated form for S3 prefix"""
     model_abbreviations = {
@@ -11,17 +36,83 @@ def abbreviate_model(model_id):
         'us.amazon.nova-pro-v1:0': 'nova-pro', 
         'us.amazon.nova-premier-v1:0': 'nova-premier',
         'us.anthropic.claude-3-5-haiku-20241022-v1:0': 'haiku-3-5',
-        'us.anthropic.claude-sonnet-4-20250514-v1:0': 'sonnet-4'
+        'us.anthropic.claude-sonnet-4-20250514-v1:0': 'sonnet-4',
+        AUTO_MODEL: 'auto',  # routed per request; the session stays under one prefix
     }
     return model_abbreviations.get(model_id, 'unknown-model')
 
 @app.entrypoint
 async def agent_invocation(payload):
+    # The deadline is visible to tools through current_deadline(). If the UI disconnects,
+    # closing this generator cancels it and stops in-flight Athena queries.
+    budget, budget_error = request_budget(payload)
+    if budget_error:
+        yield {"type": "error", "message": budget_error}
+        yield {"type": "done"}
+        return
+    deadline = Deadline(budget)
+    # One JSON trace per request (AGENT_TRACE); "metrics": true also sends its summary to the client
+    send_metrics = payload.get("metrics") is True
+    trace = trace_scope('agent_invocation', enabled=TRACE_ENABLED or send_metrics,
+                        model=payload.get("model"), personality=payload.get("personality"))
+    # Reports (and records in the trace) anything that blocks the event loop for LOOP_LAG_WARN_MS
+    loop_monitor.ensure_running()
+    started = time.monotonic()
+    try:
+        with deadline_scope(deadline), trace:
+            try:
+                with span('admission.wait') as admission_span:
+                    wait_ms = await admission.acquire(timeout=deadline.remaining())
+                    admission_span.set(wait_ms=wait_ms, **_queue_metrics())
+            except Overloaded as e:
+                print(f"❌ Shedding invocation: {e.reason} ({admission.snapshot()})")
+                trace.set(shed=e.reason)
+                yield e.event()
+            else:
+                admitted = time.perf_counter()
+                try:
+                    async for event in _agent_invocation(payload, deadline):
+                        yield event
+                finally:
+                    admission.release(time.perf_counter() - admitted)
+    finally:
+        deadline.cancel('request finished')  # stop anything a tool left running, also on disconnect
+        trace.set(event_loop=loop_monitor.blocked_since(started))
+        if trace:
+            print(json.dumps({"trace": trace.record()}, default=str))  # also when the client disconnected
+    if send_metrics:
+        yield {"type": "metrics", **trace.summary(), "admission": _queue_metrics()}
+    # done marker for UI to stop spinners, etc. - always the last event, so clients can stop reading there
+    yield {"type": "done"}
+
+def request_budget(payload):
+    """The request's time budget in seconds (never above REQUEST_BUDGET_SECONDS), or an error message"""
+    value = payload.get("time_budget_seconds", REQUEST_BUDGET_SECONDS)
+    try:
+        if isinstance(value, bool):
+            raise TypeError(value)
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None, "time_budget_seconds must be a number of seconds"
+    if not seconds > 0:  # also NaN
+        return None, "time_budget_seconds must be greater than 0"
+    # A client can shorten the server's budget but not extend it
+    return min(seconds, REQUEST_BUDGET_SECONDS), None
+
+def _queue_metrics():
+    snapshot = admission.snapshot()
+    return {key: snapshot[key] for key in ('active', 'queue_depth', 'avg_wait_ms', 'max_wait_ms',
+                                           'shed_queue_full', 'shed_timeout')}
+
+async def _agent_invocation(payload, deadline):
     user_message = payload.get("prompt", "No prompt found in input...")
     model_selected = payload.get("model", "us.amazon.nova-micro-v1:0")
     model_persona = payload.get("personality", "basic")
     session_id = payload.get("session_id", "default-session")
+    # Without a client session ID every caller lands in default/<model>/session - don't share tool results there
+    shared_memo = bool(payload.get("session_id"))
     s3_session_bucket = payload.get("s3sessionbucket", "")
+    coalesce = CoalesceConfig.from_payload(payload)  # token batching, optional "stream" overrides
     
     print(f'Request - Model: {model_selected}, Personality: {model_persona}, Session: {session_id}, S3 Bucket: {s3_session_bucket}')
     
@@ -38,117 +129,95 @@ async def agent_invocation(payload):
         s3_prefix = f"default/{model_abbrev}"  # default/model format
         print(f'No hyphen in session ID, using default prefix: {s3_prefix}')
     
+    # "model": "auto" - a local classifier picks the model from the prompt and personality
+    # (after the S3 prefix, which stays <username>/auto); larger models take over past a step budget
+    routing = None
+    if model_selected == AUTO_MODEL:
+        routing = route(user_message, model_persona)
+        model_selected = routing.model
+        current_span().set(routed_tier=routing.tier, routed_model=routing.model)
+        print(f"🔧 Auto-routed to {routing.tier} tier: {model_selected} (score {routing.score}: {routing.reasons})")
+    
     # Handle MCP vs Local personality with completely different flows (exactly like PE)
     if model_persona == 'nfl_analyst':
         print("🔧 NFL Analyst personality selected - setting up MCP connection")
         try:
-            import boto3
-            import json
-            import requests
-            from strands.tools.mcp.mcp_client import MCPClient
-            from mcp.client.streamable_http import streamablehttp_client
-            
-            # Get MCP credentials from Secrets Manager (exactly like PE)
-            secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-            sec_valu = secrets_client.get_secret_value(SecretId='nfl_mcp_auth')
-            secret_data = json.loads(sec_valu['SecretString'])
-            
-            client_info = secret_data['client_info']
-            CLIENT_ID = client_info['client_id']
-            CLIENT_SECRET = client_info['client_secret']
-            TOKEN_URL = client_info['token_endpoint']
-            gateway_url = secret_data['gateway_url']
-            
-            print(f"🔧 Got MCP Gateway URL: {gateway_url}")
-            
-            # Get access token (exactly like PE)
-            response = requests.post(
-                TOKEN_URL,
-                data=f"grant_type=client_credentials&client_id={CLIENT_ID}&client_secret={CLIENT_SECRET}",
-                headers={'Content-Type': 'application/x-www-form-urlencoded'}
-            )
-            access_token = response.json()['access_token']
-            print("🔧 Got MCP access token")
-            
-            # Create MCP transport and client (exactly like PE)
-            transport = streamablehttp_client(gateway_url, headers={"Authorization": f"Bearer {access_token}"})
-            mcp_client = MCPClient(lambda: transport)
-            print("🔧 Created MCP client")
-            
-            # tell UI to reset
-            yield {"type": "start"}
+            # Warm client + cached tool list from the per-container connection manager; the
+            # handshake and list_tools only happen on the first request or after a reconnect.
+            # Connecting blocks (token fetch, MCP handshake), so it runs on the tool pool.
+            connection = await run_blocking(mcp_connections.acquire)
+            try:
+                tools = connection.tools
+                print(f"🔧 Leased MCP connection to {connection.gateway_url}: {len(tools)} tools "
+                      f"({mcp_connections.stats}, {mcp_auth.stats()})")
 
-            # MCP Agent Flow - entire lifecycle within MCP context (exactly like PE)
-            with mcp_client:
-                print("🔧 Inside MCP client context")
-                
-                # Get tools (exactly like PE)
-                tools = []
-                more_tools = True
-                pagination_token = None
-                while more_tools:
-                    tmp_tools = mcp_client.list_tools_sync(pagination_token=pagination_token)
-                    tools.extend(tmp_tools)
-                    if tmp_tools.pagination_token is None:
-                        more_tools = False
-                    else:
-                        more_tools = True 
-                        pagination_token = tmp_tools.pagination_token
-                
-                print(f"🔧 Found {len(tools)} MCP tools: {[tool.tool_name for tool in tools]}")
-                
-                # Create agent with MCP tools (exactly like PE)
-                agent = create_strands_agent(
+                # tell UI to reset
+                yield {"type": "start"}
+
+                # Create agent with MCP tools (exactly like PE); reading the S3 session blocks
+                agent = await run_blocking(
+                    create_strands_agent,
                     model=model_selected, 
                     personality=model_persona,
                     session_id=actual_session_id,
                     s3_bucket=s3_session_bucket,
                     s3_prefix=s3_prefix,
-                    tools=tools
+                    tools=tools,
+                    routing=routing,
+                    shared_memo=shared_memo,
+                    toolset=connection.gateway_url
                 )
                 
                 print("🔧 Created MCP agent, starting streaming")
                 
-                # Stream response within MCP context (exactly like PE)
+                # Stream response while holding the lease (exactly like PE)
                 try:
-                    async for event in agent.stream_async(user_message):
-                        txt = event.get("data")
-                        if isinstance(txt, str) and txt:
-                            yield {"type": "token", "text": txt}
+                    async for event in stream_tokens(agent, user_message, deadline, coalesce):
+                        yield event
                     print("🔧 MCP streaming completed")
                 except Exception as e:
                     print(f"❌ Error during MCP streaming: {e}")
+                    mcp_connections.report_error(connection, e)
                     yield {"type": "error", "message": f"Streaming error: {str(e)}"}
                 
-                # done marker for UI to stop spinners, etc. (exactly like PE)
-                yield {"type": "done"}
+                # Session writes are buffered; the turn is on S3 before the UI can send the next one
+                if s3_session_bucket:
+                    await run_blocking(flush_session, s3_session_bucket, s3_prefix, actual_session_id)
+            except BaseException as e:
+                mcp_connections.report_error(connection, e)
+                raise
+            finally:
+                mcp_connections.release(connection)
                 
         except Exception as e:
             print(f"❌ Failed to setup MCP: {e}")
             yield {"type": "error", "message": f"MCP setup failed: {str(e)}"}
-            yield {"type": "done"}
             
     else:
         # Local Agent Flow - original logic (exactly like PE)
         print("🔧 Creating agent with local tools")
-        agent = create_strands_agent(
+        agent = await run_blocking(
+            create_strands_agent,
             model=model_selected, 
             personality=model_persona,
             session_id=actual_session_id,
             s3_bucket=s3_session_bucket,
-            s3_prefix=s3_prefix
+            s3_prefix=s3_prefix,
+            routing=routing,
+            shared_memo=shared_memo
         )
         
         # tell UI to reset
         yield {"type": "start"}
 
         try:
-            async for event in agent.stream_async(user_message):
-                # Yield text data events
-                txt = event.get("data")
-                if isinstance(txt, str) and txt:
-                    yield {"type": "token", "text": txt}
+            async for event in stream_tokens(agent, user_message, deadline, coalesce):
+                yield event
                     
         except Exception as e:
             print(f"Error during agent stream: {e}")
             yield {"type": "error", "message": f"Agent error: {str(e)}"}
+
+        # Session writes are buffered; the turn is on S3 before the UI can send the next one
+        if s3_session_bucket:
+            await run_blocking(flush_session, s3_session_bucket, s3_prefix, actual_session_id)
@@ -1,64 +1,25 @@
 from agent_config import create_strands_agent
 import logging
-from strands.tools.mcp.mcp_client import MCPClient
-from mcp.client.streamable_http import streamablehttp_client 
 import os
-import requests
-import json
-import boto3
 import time
+from nfl_mcp.auth import get_auth_provider
+from nfl_mcp.connections import get_connection_manager, is_connection_error
 
-# NFL MCP Configuration
-secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-sec_valu = secrets_client.get_secret_value(SecretId='nfl_mcp_auth')
-client_info = json.loads(sec_valu['SecretString'])['client_info']
-CLIENT_ID = client_info['client_id']
-CLIENT_SECRET = client_info['client_secret']
-TOKEN_URL = client_info['token_endpoint']
-gateway_url = json.loads(sec_valu['SecretString'])['gateway_url']
+# NFL MCP Configuration - secret and access token are cached and refreshed before the token expires;
+# the MCP client stays connected between questions and is rebuilt when the session drops
+mcp_auth = get_auth_provider()
+mcp_connections = get_connection_manager()
 
-
-def fetch_access_token(client_id, client_secret, token_url):
-    response = requests.post(
-        token_url,
-        data="grant_type=client_credentials&client_id={client_id}&client_secret={client_secret}".format(client_id=client_id, client_secret=client_secret),
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
-    )
-    return response.json()['access_token']
-
-def create_streamable_http_transport(mcp_url: str, access_token: str):
-    return streamablehttp_client(mcp_url, headers={"Authorization": f"Bearer {access_token}"})
-
-
-def get_full_tools_list(client):
-    """
-    List tools w/ support for pagination
-    """
-    more_tools = True
-    tools = []
-    pagination_token = None
-    while more_tools:
-        tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
-        tools.extend(tmp_tools)
-        if tmp_tools.pagination_token is None:
-            more_tools = False
-        else:
-            more_tools = True 
-            pagination_token = tmp_tools.pagination_token
-    return tools
-
-def run_agent_with_retry(mcp_url: str, access_token: str, user_input: str, max_retries: int = 2):
+def run_agent_with_retry(mcp_url: str, user_input: str, max_retries: int = 2):
     """Run agent with retry logic for connection issues"""
     for attempt in range(max_retries + 1):
         try:
-            mcp_client = MCPClient(lambda: create_streamable_http_transport(mcp_url, access_token))
-            
-            with mcp_client:
-                tools = get_full_tools_list(mcp_client)
+            # A lost session retires the connection, so the next attempt reconnects
+            with mcp_connections.lease(mcp_url) as connection:
                 agent = create_strands_agent(
                     model="us.amazon.nova-premier-v1:0",
                     personality="nfl_analyst",
-                    tools=tools,
+                    tools=connection.tools,
                 )
                 
                 # Execute the query
@@ -66,7 +27,7 @@ def run_agent_with_retry(mcp_url: str, access_token: str, user_input: str, max_r
                 return True  # Success
                 
         except Exception as e:
-            if "Response ended prematurely" in str(e) and attempt < max_retries:
+            if is_connection_error(e) and attempt < max_retries:
                 print(f"Connection lost (attempt {attempt + 1}/{max_retries + 1}). Retrying in 2 seconds...")
                 time.sleep(2)
                 continue
@@ -76,13 +37,11 @@ def run_agent_with_retry(mcp_url: str, access_token: str, user_input: str, max_r
     
     return False
 
-def run_agent(mcp_url: str, access_token: str):
+def run_agent(mcp_url: str):
     # Test connection first
     try:
-        mcp_client = MCPClient(lambda: create_streamable_http_transport(mcp_url, access_token))
-        with mcp_client:
-            tools = get_full_tools_list(mcp_client)
-            print(f"Found the following NFL MCP tools: {[tool.tool_name for tool in tools]}")
+        with mcp_connections.lease(mcp_url) as connection:
+            print(f"Found the following NFL MCP tools: {connection.tool_names}")
     except Exception as e:
         print(f"Failed to connect to MCP gateway: {e}")
         return
@@ -98,9 +57,11 @@ def run_agent(mcp_url: str, access_token: str):
             break
         
         print("\nThinking...\n")
-        success = run_agent_with_retry(mcp_url, access_token, user_input)
+        success = run_agent_with_retry(mcp_url, user_input)
         if not success:
             print("Sorry, I encountered an error processing your request. Please try again.")
 
+    mcp_connections.close()
+
 if __name__ == "__main__":
-    run_agent(gateway_url, fetch_access_token(CLIENT_ID, CLIENT_SECRET, TOKEN_URL))
+    run_agent(mcp_auth.gateway_url())
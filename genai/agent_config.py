@@ -4,12 +4,25 @@ This module provides a centralized way to configure and create agents
 to avoid code duplication between CLI and other components.
 """
 
+import copy
 import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
 import boto3
 from strands import Agent
 from strands.models import BedrockModel
 from strands.agent.conversation_manager import SlidingWindowConversationManager
-from strands.session.s3_session_manager import S3SessionManager
+from strands.tools.registry import ToolRegistry
+from strands.hooks import HookProvider, HookRegistry
+from strands.types.tools import AgentTool
+try:
+    from strands.hooks import AfterToolCallEvent, BeforeModelCallEvent, BeforeToolCallEvent
+except ImportError:  # strands < 1.10 (uv.lock pins 1.4) names them ToolInvocation events
+    from strands.experimental.hooks import AfterToolInvocationEvent as AfterToolCallEvent
+    from strands.experimental.hooks import BeforeModelInvocationEvent as BeforeModelCallEvent
+    from strands.experimental.hooks import BeforeToolInvocationEvent as BeforeToolCallEvent
 from strands_tools import shell, editor, python_repl, calculator
 import tools.get_schedules as get_schedules
 import tools.get_context as get_context
@@ -18,6 +31,17 @@ import tools.get_game_outputs as get_game_outputs
 import tools.nfl_kb_search as nfl_kb_search
 import tools.query_athena as query_athena
 import tools.nfl_game_service as nfl_game_service
+from conversation_compaction import (COMPACTION_ENABLED, CompactionConfig, CompactionStats, compact_conversation,
+                                     compaction_config)
+from nfl_athena.tracing import current_span, span
+from model_router import RoutingDecision, next_tier
+from prompt_registry import get_prompt_registry
+from session_store import WRITE_BEHIND_ENABLED, GzipS3SessionManager, WriteBehindS3SessionManager
+from tool_memo import MEMO_ENABLED, SessionMemo, is_memoizable, memo_key, tool_memo
+from tool_runtime import ToolExecutor, call_local_tool, call_local_tool_async, get_tool_executor
+
+# Every prompt file is read and validated here, at import (startup), not per request
+prompt_registry = get_prompt_registry()
 
 def load_prompt_from_file(filename: str) -> str:
     """
@@ -27,18 +51,9 @@ def load_prompt_from_file(filename: str) -> str:
         filename: Name of the file (without .md extension)
         
     Returns:
-        str: Content of the prompt file
+        str: Content of the prompt file (raises PromptError if it is not a known prompt)
     """
-    try:
-        prompts_dir = os.path.join(os.path.dirname(__file__), 'prompts')
-        file_path = os.path.join(prompts_dir, f"{filename}.md")
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read().strip()
-    except FileNotFoundError:
-        return f"Prompt file '{filename}.md' not found"
-    except Exception as e:
-        return f"Error loading prompt file '{filename}.md': {str(e)}"
+    return prompt_registry.prompt_text(filename)
 
 def get_system_prompt(personality: str, model: str = 'us.amazon.nova-micro-v1:0') -> str:
     """
@@ -49,35 +64,433 @@ def get_system_prompt(personality: str, model: str = 'us.amazon.nova-micro-v1:0'
         model: The model ID being used
         
     Returns:
-        str: Complete system prompt with rules appended
+        str: Complete system prompt with rules appended (precompiled by the prompt registry)
     """
-    # Load rules that apply to all prompts
-    rules = load_prompt_from_file('rules')
-    
-    # Handle specific personalities
-    if personality in ['nfl_game_recap', 'nfl_analyst', 'nfl_native_analyst']:
-        if personality == 'nfl_analyst':
-            base_prompt = load_prompt_from_file('nfl_analyst')
-        elif personality == 'nfl_native_analyst':
-            base_prompt = load_prompt_from_file('nfl_native_analyst')
+    return prompt_registry.system_prompt(personality, model)
+
+# Per-process agent templates keyed by (model, personality, toolset): the BedrockModel (and its
+# bedrock-runtime client) and the tool registry are built once and shared;
+# every invocation gets a clone with its own conversation and session managers.
+AGENT_POOL_SIZE = int(os.environ.get('AGENT_POOL_SIZE', 32))
+AGENT_WINDOW_SIZE = 10
+
+
+def _local_toolset(personality: str):
+    """Toolset name and local tool modules for a personality"""
+    if personality == 'nfl_native_analyst':
+        return 'native', [query_athena, nfl_game_service, nfl_kb_search]
+    if personality == 'nfl_game_recap':
+        return 'recap', [get_schedules, get_context, get_game_inputs, get_game_outputs, nfl_kb_search]
+    return 'local', [get_schedules, get_context, get_game_inputs, get_game_outputs]
+
+
+def _toolset_key(personality: str, tools, toolset: Optional[str] = None):
+    """
+    Hashable identity of a toolset. Provided (MCP) tools are keyed by their source
+    (the gateway URL) and tool names - not the client, which changes on every
+    reconnect; AgentPool.template rebinds a hit to the caller's current client.
+    """
+    if tools is None:
+        return _local_toolset(personality)[0]
+    return toolset, tuple(sorted(getattr(tool, 'tool_name', str(tool)) for tool in tools))
+
+
+def _tools_client(tools):
+    """The MCP client provided tools are bound to (None for local tools)"""
+    return getattr(tools[0], 'mcp_client', None) if tools else None
+
+
+def _build_model(model: str) -> BedrockModel:
+    # Configure the Bedrock model (simplified like PE)
+    return BedrockModel(
+        inference_profile_id=model,
+        max_tokens=5000,
+        temperature=0.7,
+        top_p=0.8,
+    )
+
+
+class ToolTracingHooks(HookProvider):
+    """A trace span around every tool call (no-op when the request is not traced)"""
+
+    def __init__(self):
+        self._spans = {}
+
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+
+    def _before_tool(self, event):
+        tool_use = event.tool_use
+        tool_span = span(f"tool.{tool_use.get('name')}", tool_use_id=tool_use.get('toolUseId'))
+        if tool_span:
+            # Made current so Athena polling inside the tool nests under it
+            self._spans[tool_use.get('toolUseId')] = tool_span.__enter__()
+
+    def _after_tool(self, event):
+        tool_span = self._spans.pop(event.tool_use.get('toolUseId'), None)
+        if tool_span is None:
+            return
+        result = getattr(event, 'result', None) or {}
+        tool_span.set(status=result.get('status'))
+        error = getattr(event, 'exception', None)
+        tool_span.__exit__(type(error) if error else None, error, None)
+
+
+class CompactingConversationManager(SlidingWindowConversationManager):
+    """
+    Sliding window that first compacts tool results of earlier turns and trims
+    whole turns to the personality's token budget (conversation_compaction.py).
+    Without a config it is the plain AGENT_WINDOW_SIZE window.
+    """
+
+    def __init__(self, config: Optional[CompactionConfig] = None):
+        super().__init__(window_size=config.window_size if config else AGENT_WINDOW_SIZE)
+        self.config = config
+        self.stats = CompactionStats()
+
+    def compact(self, agent):
+        if self.config is None:
+            return
+        self.removed_message_count += compact_conversation(agent.messages, self.config, self.stats)
+
+    def apply_management(self, agent, **kwargs):
+        self.compact(agent)
+        super().apply_management(agent, **kwargs)
+        if self.config is not None:
+            current_span().set(conversation=self.stats.as_dict())  # token estimate and compaction totals
+
+    def restore_from_session(self, state):
+        # Sessions saved with the plain SlidingWindowConversationManager restore into this one
+        if state.get('__name__') == SlidingWindowConversationManager.__name__:
+            state = {**state, '__name__': self.__class__.__name__}
+        return super().restore_from_session(state)
+
+
+class CompactionHooks(HookProvider):
+    """Compacts the conversation before every model call, so tool loops and restored sessions stay in budget"""
+
+    def __init__(self, manager: CompactingConversationManager):
+        self.manager = manager
+
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeModelCallEvent, lambda event: self.manager.compact(event.agent))
+
+
+class ModelEscalationHooks(HookProvider):
+    """
+    For "model": "auto": when the routed model's tool loop passes its tier's step
+    budget, the rest of the loop runs on the next tier's model (same conversation).
+    """
+
+    def __init__(self, decision: RoutingDecision, personality: str):
+        self.decision = decision
+        self.personality = personality
+        self.steps = 0
+        self._tier_steps = 0
+
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+
+    def _before_tool(self, event):
+        self.steps += 1
+        self._tier_steps += 1
+        budget = self.decision.step_budget
+        if not budget or self._tier_steps <= budget:
+            return
+        if next_tier(self.decision, self.steps) is None:
+            return
+        self._tier_steps = 0
+        agent = event.agent
+        # The model and system prompt are read again at the start of the next model call
+        agent.model = agent_pool.model(self.decision.model)
+        agent.system_prompt = get_system_prompt(self.personality, self.decision.model)
+        current_span().set(escalated_to=self.decision.model)
+        print(f"🔧 Escalated to {self.decision.model} after {self.steps} tool calls")
+
+
+class MemoizedResultTool(AgentTool):
+    """Stands in for a tool whose result is memoized: replays it under the new toolUseId"""
+
+    def __init__(self, tool: AgentTool, result):
+        super().__init__()
+        self._tool = tool
+        self._result = result
+
+    @property
+    def tool_name(self):
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self):
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self):
+        return 'memoized'
+
+    async def stream(self, tool_use, *args, **kwargs):
+        yield {**self._result, 'toolUseId': tool_use['toolUseId']}
+
+
+class ToolMemoHooks(HookProvider):
+    """Answers repeated tool calls (same name + input) from the session's memo"""
+
+    def __init__(self, memo: SessionMemo):
+        self.memo = memo
+        self._pending = {}  # toolUseId -> (memo key, tool name) for calls that ran
+
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+        registry.add_callback(AfterToolCallEvent, self._after_tool)
+
+    def _before_tool(self, event):
+        tool_use = event.tool_use
+        name, tool_input = tool_use.get('name'), tool_use.get('input')
+        if event.selected_tool is None or not is_memoizable(name, tool_input):
+            return
+        key = memo_key(name, tool_input)
+        result = self.memo.get(key)
+        if result is None:
+            self._pending[tool_use.get('toolUseId')] = (key, name)
+            return
+        event.selected_tool = MemoizedResultTool(event.selected_tool, result)
+        current_span().set(memoized=True)
+        print(f"🔧 Tool memo hit: {name} ({self.memo.hits} hits this session)")
+
+    def _after_tool(self, event):
+        pending = self._pending.pop(event.tool_use.get('toolUseId'), None)
+        if pending is None or getattr(event, 'exception', None) is not None or not event.result:
+            return
+        self.memo.put(pending[0], pending[1], event.result)
+
+
+class LocalTool(AgentTool):
+    """
+    A tools/ module run on the shared tool thread pool (instead of the loop's
+    default executor), or awaited directly when the module has a native
+    `<tool>_async` variant that keeps its blocking calls off the event loop.
+    """
+
+    def __init__(self, module, executor: ToolExecutor):
+        super().__init__()
+        self._spec = module.TOOL_SPEC
+        self._func = getattr(module, module.TOOL_SPEC['name'])
+        self._async_func = getattr(module, f"{module.TOOL_SPEC['name']}_async", None)
+        self._executor = executor
+
+    @property
+    def tool_name(self):
+        return self._spec['name']
+
+    @property
+    def tool_spec(self):
+        return self._spec
+
+    @property
+    def tool_type(self):
+        return 'python'
+
+    async def stream(self, tool_use, *args, **kwargs):
+        if self._async_func is not None:
+            yield await call_local_tool_async(self._async_func, tool_use)
         else:
-            base_prompt = load_prompt_from_file('nfl_tools')
-    else:
-        # Treat as custom system prompt
-        base_prompt = personality
-    
-    # Replace model placeholder with actual model name
-    base_prompt = base_prompt.replace('[current model name]', model)
-    
-    # Combine base prompt with rules
-    return f"{base_prompt}\n\n{rules}"
+            yield await self._executor.run_sync(call_local_tool, self._func, tool_use)
+
+
+class ScheduledTool(AgentTool):
+    """Runs a tool under its concurrency limit (strands already runs a turn's tools side by side)"""
+
+    def __init__(self, tool: AgentTool, executor: ToolExecutor):
+        super().__init__()
+        self._tool = tool
+        self._executor = executor
+
+    @property
+    def tool_name(self):
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self):
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self):
+        return self._tool.tool_type
+
+    async def stream(self, tool_use, *args, **kwargs):
+        async with self._executor.slot(self.tool_name):
+            async for event in self._tool.stream(tool_use, *args, **kwargs):
+                yield event
+
+
+class ToolSchedulingHooks(HookProvider):
+    """Routes every tool call through the shared ToolExecutor's per-tool limits"""
+
+    def __init__(self, executor: ToolExecutor):
+        self.executor = executor
+
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self._before_tool)
+
+    def _before_tool(self, event):
+        # Unknown tool (strands answers with an error right away) or a memo replay: nothing to limit
+        if event.selected_tool is None or isinstance(event.selected_tool, MemoizedResultTool):
+            return
+        event.selected_tool = ScheduledTool(event.selected_tool, self.executor)
+
+
+class AgentTemplate:
+    """The shareable parts of an agent for one (model, personality, toolset)."""
+
+    def __init__(self, model: str, personality: str, tools, bedrock_model: BedrockModel):
+        start = time.perf_counter()
+        self.model = model
+        self.personality = personality
+        self.bedrock_model = bedrock_model
+        if tools is None:
+            toolset, modules = _local_toolset(personality)
+            print(f"Using {toolset} NFL tools: {[module.TOOL_SPEC['name'] for module in modules]}")
+            tools = [LocalTool(module, get_tool_executor()) for module in modules]
+        else:
+            print(f"Using provided MCP tools: {[getattr(tool, 'tool_name', str(tool)) for tool in tools]}")
+        self.bind_tools(tools)
+        self.build_ms = (time.perf_counter() - start) * 1000
+
+    def bind_tools(self, tools):
+        """
+        Use a new set of tool objects, e.g. the same MCP tools bound to a reconnected
+        client. Agents already cloned keep the registry they were given.
+        """
+        tool_registry = ToolRegistry()
+        tool_registry.process_tools(tools)
+        self.tool_registry = tool_registry
+        self.tools_client = _tools_client(tools)
+
+    def clone(self, session_manager=None, memo: Optional[SessionMemo] = None,
+              routing: Optional[RoutingDecision] = None) -> Agent:
+        """A new agent sharing the model and tool objects, with fresh conversation state and its own registry"""
+        hooks = [ToolTracingHooks()]
+        if routing is not None:
+            hooks.append(ModelEscalationHooks(routing, self.personality))
+        if memo is not None:
+            hooks.append(ToolMemoHooks(memo))
+        hooks.append(ToolSchedulingHooks(get_tool_executor()))  # after the memo: replayed results skip the limits too
+        # Token budget per personality; old tool results are replaced by summaries
+        conversation_manager = CompactingConversationManager(
+            compaction_config(self.personality) if COMPACTION_ENABLED else None)
+        hooks.append(CompactionHooks(conversation_manager))
+        agent = Agent(
+            model=self.bedrock_model,
+            system_prompt=get_system_prompt(self.personality, self.model),  # registry lookup (follows hot reload)
+            conversation_manager=conversation_manager,
+            session_manager=session_manager,
+            hooks=hooks,
+        )
+        # Strands adds to an agent's registry (MCP tools, dynamic tool loading), so each clone gets its own
+        # copy of the tool maps; the tool objects themselves are shared
+        agent.tool_registry = _copy_registry(self.tool_registry)
+        return agent
+
+
+def _copy_registry(tool_registry: ToolRegistry) -> ToolRegistry:
+    """A shallow copy of a ToolRegistry whose tool maps can change without affecting the original"""
+    registry = copy.copy(tool_registry)
+    registry.registry = dict(tool_registry.registry)
+    registry.dynamic_tools = dict(tool_registry.dynamic_tools)
+    registry.tool_config = copy.deepcopy(tool_registry.tool_config)
+    return registry
+
+
+class AgentPool:
+    """LRU of agent templates plus the Bedrock models they share."""
+
+    def __init__(self, max_templates: int = AGENT_POOL_SIZE):
+        self.max_templates = max_templates
+        self._templates: 'OrderedDict[tuple, AgentTemplate]' = OrderedDict()
+        self._models: Dict[str, BedrockModel] = {}
+        self._lock = threading.Lock()
+        self.stats = {'templates_built': 0, 'template_hits': 0, 'tool_rebinds': 0, 'evictions': 0, 'clones': 0}
+
+    def model(self, model: str) -> BedrockModel:
+        """The shared BedrockModel for a model ID"""
+        with self._lock:
+            return self._model(model)
+
+    def _model(self, model: str) -> BedrockModel:
+        bedrock_model = self._models.get(model)
+        if bedrock_model is None:
+            bedrock_model = self._models[model] = _build_model(model)
+        return bedrock_model
+
+    def template(self, model: str, personality: str, tools=None, toolset: Optional[str] = None) -> AgentTemplate:
+        key = (model, personality, _toolset_key(personality, tools, toolset))
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.stats['template_hits'] += 1
+                if tools is not None and _tools_client(tools) is not template.tools_client:
+                    # Same MCP toolset on a new client (reconnect, token refresh): drop the stopped one
+                    template.bind_tools(tools)
+                    self.stats['tool_rebinds'] += 1
+                current_span().set(template_hit=True)
+                return template
+            # Built under the lock: concurrent first requests for a key wait instead of building twice
+            template = AgentTemplate(model, personality, tools, self._model(model))
+            self._templates[key] = template
+            self.stats['templates_built'] += 1
+            current_span().set(template_hit=False, template_build_ms=round(template.build_ms, 1))
+            if len(self._templates) > self.max_templates:
+                self._templates.popitem(last=False)
+                self.stats['evictions'] += 1
+            return template
+
+
+agent_pool = AgentPool()
+
+_boto_session = None
+_s3_client = None
+_boto_session_lock = threading.Lock()
+
+
+def _create_session_manager(session_id, s3_bucket, s3_prefix):
+    """
+    Session manager on a shared boto3 session (sessions are not thread-safe, so clients are made under a lock):
+    write-behind with a warm cache (session_store.py), or strands' S3SessionManager with SESSION_WRITE_BEHIND=0
+    (as GzipS3SessionManager, so it can read messages written with SESSION_COMPRESS=1)
+    """
+    global _boto_session, _s3_client
+    print(f"Creating {'WriteBehindS3SessionManager' if WRITE_BEHIND_ENABLED else 'GzipS3SessionManager'} - "
+          f"Session: {session_id}, Bucket: {s3_bucket}, Prefix: {s3_prefix}")
+    with _boto_session_lock:
+        if _boto_session is None:
+            # Create boto3 session for better credential handling
+            _boto_session = boto3.Session(region_name="us-east-1")
+        if WRITE_BEHIND_ENABLED:
+            if _s3_client is None:
+                _s3_client = _boto_session.client('s3', region_name="us-east-1")  # clients are thread-safe
+            return WriteBehindS3SessionManager(session_id=session_id, bucket=s3_bucket, prefix=s3_prefix,
+                                               client=_s3_client)
+        return GzipS3SessionManager(
+            session_id=session_id,
+            bucket=s3_bucket,
+            prefix=s3_prefix,
+            boto_session=_boto_session,
+            region_name="us-east-1"
+        )
+
 
 def create_strands_agent(model = 'us.amazon.nova-pro-v1:0',
                          personality = 'nfl_analyst',
                          session_id = None,
                          s3_bucket = None,
                          s3_prefix = None,
-                         tools = None):
+                         tools = None,
+                         pooled = True,
+                         routing = None,
+                         shared_memo = True,
+                         toolset = None):
     """
     Create and return a configured Strands agent instance.
     
@@ -95,72 +508,36 @@ def create_strands_agent(model = 'us.amazon.nova-pro-v1:0',
         s3_bucket (str): S3 bucket for session storage
         s3_prefix (str): S3 prefix for session storage
         tools (list): Optional list of tools to use (for MCP integration)
+        pooled (bool): Clone from the shared agent template (False builds everything from scratch)
+        routing (RoutingDecision): For "model": "auto" - escalate to a larger model past the step budget
+        shared_memo (bool): Share memoized tool results with the session's other invocations
+            (False when the client sent no session ID, so the memo lasts one agent)
+        toolset (str): Where the provided tools come from (the MCP gateway URL), for the template key
         
     Returns:
         Agent: Configured agent ready for use
     """
-    
-    # Configure the Bedrock model (simplified like PE)
-    bedrock_model = BedrockModel(
-        inference_profile_id=model,
-        max_tokens=5000,
-        temperature=0.7,
-        top_p=0.8,
-    )
-
-    # Configure conversation management for production
-    conversation_manager = SlidingWindowConversationManager(
-        window_size=10,  # Limit history size
-    )
-
-    # Get the system prompt based on personality
-    system_prompt = get_system_prompt(personality, model)
-    
+    start = time.perf_counter()
     print(f"Received personality parameter: '{personality}'")
 
-    # Create and return the agent (simplified like PE)
-    if tools is not None:
-        # Use provided tools (e.g., from MCP client)
-        print(f"Using provided MCP tools: {[getattr(tool, 'tool_name', str(tool)) for tool in tools]}")
-        tools_list = tools
-    else:
-        # Use local tools based on personality
-        if personality == 'nfl_native_analyst':
-            print("Using native analyst tools: query_athena, nfl_game_service, nfl_kb_search")
-            tools_list = [query_athena, nfl_game_service, nfl_kb_search]
+    with span('agent.build', model=model, pooled=pooled):
+        if pooled:
+            template = agent_pool.template(model, personality, tools, toolset)
         else:
-            print("Using local NFL tools")
-            tools_list = [get_schedules, get_context, get_game_inputs, get_game_outputs]
-            
-            # Add knowledge base tool for nfl_game_recap personality
-            if personality == 'nfl_game_recap':
-                tools_list.append(nfl_kb_search)
-
-    # Create session manager based on whether S3 parameters are provided
-    session_manager = None
-    if session_id and s3_bucket and s3_prefix:
-        print(f"Creating S3SessionManager - Session: {session_id}, Bucket: {s3_bucket}, Prefix: {s3_prefix}")
-        
-        # Create boto3 session for better credential handling
-        boto_session = boto3.Session(region_name="us-east-1")
-        
-        session_manager = S3SessionManager(
-            session_id=session_id,
-            bucket=s3_bucket,
-            prefix=s3_prefix,
-            boto_session=boto_session,
-            region_name="us-east-1"
-        )
-    else:
-        print("Using default SlidingWindowConversationManager (no S3 session persistence)")
-
-    # Create and return the agent
-    strands_agent = Agent(
-        model=bedrock_model,
-        system_prompt=system_prompt,
-        conversation_manager=conversation_manager,
-        session_manager=session_manager,
-        tools=tools_list
-    )
-    
+            template = AgentTemplate(model, personality, tools, _build_model(model))
+
+        # Create session manager based on whether S3 parameters are provided
+        session_manager = None
+        if session_id and s3_bucket and s3_prefix:
+            session_manager = _create_session_manager(session_id, s3_bucket, s3_prefix)
+        else:
+            print("Using CompactingConversationManager only (no S3 session persistence)")
+
+        # Tool results are memoized per session (username/model prefix + session ID)
+        memo_session = f"{s3_prefix}/{session_id}" if session_id and shared_memo else None
+        memo = tool_memo.session(memo_session) if MEMO_ENABLED else None
+        strands_agent = template.clone(session_manager, memo, routing)
+    agent_pool.stats['clones'] += 1
+    print(f"⏱️ Agent setup {(time.perf_counter() - start) * 1000:.1f} ms ({'pooled' if pooled else 'unpooled'}, "
+          f"{agent_pool.stats})")
     return strands_agent
@@ -91,6 +91,8 @@ try:
                             print("\n✨ Agent finished!", flush=True)
                         elif event_data.get('type') == 'error':
                             print(f"\n❌ Agent error: {event_data.get('message', 'Unknown error')}", flush=True)
+                            if event_data.get('code') == 'overloaded':
+                                print(f"   Retry in {event_data.get('retry_after_seconds', 1)}s", flush=True)
                             
                     except json.JSONDecodeError:
                         # Skip malformed JSON
@@ -0,0 +1,3 @@
+# __init__.py
+# Offline micro-benchmarks. Run from the genai directory, e.g.:
+#   uv run python -m benchmarks.bench_result_decoding
@@ -0,0 +1,108 @@
+"""
+Benchmark: a burst of invocations against one container, unlimited vs
+admission.AdmissionController.
+
+The stub model shares a fixed token throughput between all open streams (like
+one container's CPU, connections and Bedrock quota), so every extra concurrent
+invocation slows the others down. Each simulated invocation follows
+agent.agent_invocation: admit (or shed with the "overloaded" event), then
+stream the answer. Reports completed/shed counts, latency percentiles of the
+completed invocations, how fast shed clients heard back and the controller's
+queue metrics. Runs offline; no AWS calls.
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_admission [--requests 120] [--max-concurrent 16]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from admission import AdmissionController, Overloaded
+
+
+class StubModel:
+    """Streams `tokens` tokens; all open streams share `tokens_per_second`"""
+
+    def __init__(self, tokens_per_second: float):
+        self.tokens_per_second = tokens_per_second
+        self.streams = 0
+
+    async def stream(self, tokens: int):
+        self.streams += 1
+        try:
+            for _ in range(tokens):
+                await asyncio.sleep(self.streams / self.tokens_per_second)
+                yield "tok "
+        finally:
+            self.streams -= 1
+
+
+async def invocation(model, controller, tokens, budget_s):
+    """One client: returns ('done' | 'overloaded' | 'timeout', seconds until its last event)"""
+    start = time.perf_counter()
+    deadline = start + budget_s
+    events = []
+    try:
+        if controller is not None:
+            await controller.acquire(timeout=budget_s)
+        admitted = time.perf_counter()
+        try:
+            async for text in model.stream(tokens):
+                events.append({"type": "token", "text": text})
+                if time.perf_counter() > deadline:
+                    return 'timeout', time.perf_counter() - start
+        finally:
+            if controller is not None:
+                controller.release(time.perf_counter() - admitted)
+    except Overloaded as e:
+        events.append(e.event())
+        return 'overloaded', time.perf_counter() - start
+    return 'done', time.perf_counter() - start
+
+
+async def burst(args, controller):
+    model = StubModel(args.tokens_per_second)
+    tasks = []
+    for _ in range(args.requests):
+        tasks.append(asyncio.create_task(invocation(model, controller, args.tokens, args.budget)))
+        await asyncio.sleep(args.arrival_ms / 1000)
+    return await asyncio.gather(*tasks)
+
+
+def report(label, results, controller):
+    done = sorted(seconds for outcome, seconds in results if outcome == 'done')
+    shed = [seconds for outcome, seconds in results if outcome == 'overloaded']
+    timeouts = sum(1 for outcome, _ in results if outcome == 'timeout')
+    print(label)
+    print(f"  completed {len(done)}, shed {len(shed)}, timed out {timeouts}")
+    if done:
+        p95 = done[min(len(done) - 1, int(len(done) * 0.95))]
+        print(f"  completed latency: p50 {statistics.median(done):.2f}s, p95 {p95:.2f}s")
+    if shed:
+        print(f"  shed clients told after: max {max(shed) * 1000:.0f} ms")
+    if controller is not None:
+        print(f"  admission: {controller.snapshot()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=120)
+    parser.add_argument('--arrival-ms', type=float, default=5, help='time between arrivals')
+    parser.add_argument('--tokens', type=int, default=40, help='tokens per answer')
+    parser.add_argument('--tokens-per-second', type=float, default=800, help='shared model throughput')
+    parser.add_argument('--budget', type=float, default=5, help='per-request time budget (s)')
+    parser.add_argument('--max-concurrent', type=int, default=16)
+    parser.add_argument('--max-queue', type=int, default=32)
+    parser.add_argument('--queue-timeout', type=float, default=3)
+    args = parser.parse_args()
+
+    report('unlimited', asyncio.run(burst(args, None)), None)
+    controller = AdmissionController(args.max_concurrent, args.max_queue, args.queue_timeout)
+    report(f'admission ({args.max_concurrent} running, {args.max_queue} queued, {args.queue_timeout}s queue timeout)',
+           asyncio.run(burst(args, controller)), controller)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: per-request agent setup, built from scratch vs cloned from the pool.
+
+Times create_strands_agent(pooled=False) - a new BedrockModel, conversation
+manager, prompt load and tool registry per call, as every invocation used to
+do - against the pooled path, where the first call builds the template and
+later calls only clone it. No model is invoked; needs strands and an AWS region
+for the bedrock-runtime client (no credentials are used).
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_agent_setup [--iterations 50]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from agent_config import agent_pool, create_strands_agent
+
+CASES = [
+    ('us.amazon.nova-pro-v1:0', 'nfl_native_analyst'),
+    ('us.amazon.nova-micro-v1:0', 'nfl_game_recap'),
+    ('us.anthropic.claude-3-5-haiku-20241022-v1:0', 'basic'),
+]
+
+
+def time_setup(model, personality, pooled, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # create_strands_agent logs every call
+            create_strands_agent(model=model, personality=personality, pooled=pooled)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'personality':<20} {'unpooled p50':>13} {'pooled first':>13} {'pooled p50':>11} {'speedup':>8}")
+    for model, personality in CASES:
+        unpooled = time_setup(model, personality, False, args.iterations)
+        pooled = time_setup(model, personality, True, args.iterations)
+        unpooled_p50 = statistics.median(unpooled)
+        pooled_p50 = statistics.median(pooled[1:])
+        print(f"{personality:<20} {unpooled_p50:11.2f}ms {pooled[0]:11.2f}ms {pooled_p50:9.2f}ms "
+              f"{unpooled_p50 / pooled_p50:7.1f}x")
+    print(f"pool: {agent_pool.stats}")
+
+
+if __name__ == "__main__":
+    main()
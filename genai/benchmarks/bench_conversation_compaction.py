@@ -0,0 +1,127 @@
+"""
+Benchmark: Bedrock input tokens per turn over a long session, with the old
+10-message sliding window vs conversation_compaction.
+
+Replays synthetic sessions with the message shapes the personalities produce -
+recap turns fetching context, game inputs and game outputs in one tool round,
+analyst turns running two Athena queries - and counts the input tokens of every
+model call (system prompt plus conversation, chars/4 like the prompt
+registry). Compaction runs before every model call and after every turn, as
+agent_config.CompactingConversationManager does. Runs offline; no AWS calls.
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_conversation_compaction [--turns 12]
+"""
+
+import argparse
+import json
+
+from conversation_compaction import (CompactionStats, compact_conversation, compaction_config, conversation_tokens,
+                                     turn_starts)
+from prompt_registry import estimate_tokens, get_prompt_registry
+
+MODEL = 'us.amazon.nova-pro-v1:0'
+BASELINE_WINDOW = 10
+
+
+def athena_table(rows):
+    lines = [f"Query Results ({rows} rows):", "", " player_name team  passing_yards  passing_tds  interceptions"]
+    lines += [f" Player {i:<10} KC    {4000 - i * 30:>13}  {30 - i % 20:>11}  {i % 12:>13}" for i in range(rows)]
+    return '\n'.join(lines) + "\n\nScan: estimated 2.4 MB, actual 2.1 MB"
+
+
+def game_json(plays):
+    return json.dumps({'game_id': '2024_01_BAL_KC', 'home_team': 'KC', 'away_team': 'BAL',
+                       'plays': [{'play_id': i, 'qtr': 1 + i // 40, 'desc': f"P.Mahomes pass short right to T.Kelce for {i % 15} yards",
+                                  'epa': round((i % 7 - 3) / 3, 3)} for i in range(plays)]})
+
+
+# Each turn: (user prompt, [tool rounds: [(tool name, input, result text)]], answer)
+def recap_turn(week):
+    game = {'game_id': f"2024_{week:02d}_KC"}
+    return (f"Write a recap of the Chiefs' week {week} game",
+            [[('get_context', game, "Context: " + "Division rivals, playoff implications. " * 40),
+              ('get_game_inputs', game, game_json(160)),
+              ('get_game_outputs', game, game_json(110))]],
+            "## Chiefs edge Ravens\n" + "Patrick Mahomes led a late drive to seal the win. " * 45)
+
+
+def analyst_turn(week):
+    return (f"How did the Chiefs passing game look through week {week}?",
+            [[('query_athena', {'sql_query': f"SELECT ... WHERE week <= {week}"}, athena_table(100))],
+             [('query_athena', {'sql_query': f"SELECT ... team = 'KC' AND week = {week}"}, athena_table(25))]],
+            "Mahomes is averaging 265 passing yards per game. " * 25)
+
+
+def tool_rounds_messages(turn, index):
+    prompt, rounds, answer = turn
+    yield {'role': 'user', 'content': [{'text': prompt}]}
+    for r, tool_round in enumerate(rounds):
+        uses, results = [], []
+        for t, (name, tool_input, result) in enumerate(tool_round):
+            tool_use_id = f"tooluse_{index}_{r}_{t}"
+            uses.append({'toolUse': {'toolUseId': tool_use_id, 'name': name, 'input': tool_input}})
+            results.append({'toolResult': {'toolUseId': tool_use_id, 'status': 'success', 'content': [{'text': result}]}})
+        yield {'role': 'assistant', 'content': uses}
+        yield {'role': 'user', 'content': results}
+    yield {'role': 'assistant', 'content': [{'text': answer}]}
+
+
+def sliding_window(messages, window_size):
+    """SlidingWindowConversationManager.apply_management: keep the last N messages, no dangling tool pairs"""
+    if len(messages) <= window_size:
+        return
+    trim = len(messages) - window_size
+    while trim < len(messages) and (
+            any('toolResult' in block for block in messages[trim]['content'])
+            or (any('toolUse' in block for block in messages[trim]['content'])
+                and not (trim + 1 < len(messages) and any('toolResult' in block for block in messages[trim + 1]['content'])))):
+        trim += 1
+    del messages[:trim]
+
+
+def run_session(turns, system_tokens, config=None):
+    """Input tokens sent per turn (sum over the turn's model calls) and turns still in context"""
+    messages, per_turn, kept = [], [], []
+    stats = CompactionStats()
+    for index, turn in enumerate(turns):
+        sent = 0
+        for message in tool_rounds_messages(turn, index):
+            if message['role'] == 'assistant':  # a model call produced this message
+                if config is not None:
+                    compact_conversation(messages, config, stats)
+                sent += system_tokens + conversation_tokens(messages)
+            messages.append(message)
+        if config is not None:
+            compact_conversation(messages, config, stats)
+        else:
+            sliding_window(messages, BASELINE_WINDOW)
+        per_turn.append(sent)
+        kept.append(len(turn_starts(messages)))
+    return per_turn, kept, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--turns', type=int, default=12)
+    args = parser.parse_args()
+
+    registry = get_prompt_registry()
+    for personality, make_turn in (('nfl_game_recap', recap_turn), ('nfl_native_analyst', analyst_turn)):
+        turns = [make_turn(week) for week in range(1, args.turns + 1)]
+        system_tokens = estimate_tokens(registry.system_prompt(personality, MODEL))
+        config = compaction_config(personality)
+        baseline, baseline_kept, _ = run_session(turns, system_tokens)
+        compacted, compacted_kept, stats = run_session(turns, system_tokens, config)
+        print(f"{personality} ({config.max_tokens} token budget, keep {config.keep_turns} turn(s), "
+              f"system prompt ~{system_tokens} tokens)")
+        print(f"  {'turn':>5} {'window 10':>10} {'compacted':>10}   turns in context")
+        for i, row in enumerate(zip(baseline, compacted, baseline_kept, compacted_kept), 1):
+            print(f"  {i:>5} {row[0]:>10} {row[1]:>10}   {row[2]:>2} vs {row[3]:>2}")
+        print(f"  {'total':>5} {sum(baseline):>10} {sum(compacted):>10} "
+              f"({100 * (sum(compacted) / sum(baseline) - 1):+.0f}% input tokens)")
+        print(f"  {stats.as_dict()}\n")
+
+
+if __name__ == "__main__":
+    main()
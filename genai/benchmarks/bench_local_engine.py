@@ -0,0 +1,85 @@
+"""
+Benchmark: embedded DuckDB engine vs Athena for queries over small tables.
+
+Runs each query through nfl_athena.local_engine (from the local mirror) and,
+unless --offline is given, through Athena, and reports the median latency.
+Mirror the tables first with sync_local_mirror.py.
+
+Usage (from the genai directory):
+    AWS_PROFILE=nfl uv run python -m benchmarks.bench_local_engine [--repeat 5]
+    uv run python -m benchmarks.bench_local_engine --offline   # local engine only, no AWS
+"""
+
+import argparse
+import statistics
+import time
+
+from nfl_athena.local_engine import execute_local
+
+QUERIES = {
+    'team_lookup': """
+        select col0 as team_id, col1 as team_names
+        from nfl_stats_database.team_mapping
+        where col1 like '%Packers%'""",
+    'road_wins': """
+        select season, count(*) as road_wins
+        from nfl_stats_database.clean_schedule
+        where away_team = 'NO' and winning_team = 'NO'
+        group by 1 order by season""",
+    'home_record_2024': """
+        select home_team, count(*) as games,
+               sum(case when winning_team = home_team then 1 else 0 end) as wins
+        from nfl_stats_database.clean_schedule
+        where season = 2024
+        group by 1 order by wins desc""",
+    'schedule_join': """
+        select s.season, m.col1 as team, count(*) as games
+        from nfl_stats_database.clean_schedule s
+        join nfl_stats_database.team_mapping m on s.home_team = m.col0
+        group by 1,2 order by 1 desc, 3 desc limit 10""",
+}
+
+
+def time_local(sql, repeat):
+    timings, rows = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result, route = execute_local(sql, mode='offline')
+        timings.append((time.perf_counter() - start) * 1000)
+        if result is None:
+            return None, route.get('error', route['reason'])
+        rows = result.row_count
+    return statistics.median(timings), rows
+
+
+def time_athena(sql, repeat):
+    from benchmarks.bench_parquet_routing import run
+    import boto3
+
+    athena_client = boto3.client('athena', region_name='us-east-1')
+    runs = [run(athena_client, sql) for _ in range(repeat)]
+    return statistics.median(r[3] for r in runs), runs[-1][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--offline', action='store_true', help='Only time the local engine')
+    args = parser.parse_args()
+
+    print(f"{'query':<18} | {'local ms':>9} | {'rows':>5} | {'athena ms':>9} | speedup")
+    print("-" * 60)
+    for name, sql in QUERIES.items():
+        local_ms, rows = time_local(sql, args.repeat)
+        if local_ms is None:
+            print(f"{name:<18} | {'-':>9} | {'-':>5} | {'':>9} | {rows}")
+            continue
+        if args.offline:
+            print(f"{name:<18} | {local_ms:>9.1f} | {rows:>5} | {'-':>9} |")
+            continue
+        athena_ms, state = time_athena(sql, args.repeat)
+        print(f"{name:<18} | {local_ms:>9.1f} | {rows:>5} | {athena_ms:>9.0f} | {athena_ms / local_ms:.0f}x ({state})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: CSV tables vs their Parquet copies for representative analyst queries.
+
+Runs each query against the original CSV tables and against the Parquet tables
+(via nfl_athena.parquet.route_to_parquet) and reports Athena's bytes scanned,
+engine time and wall-clock latency. Requires AWS credentials and the Parquet
+tables created by convert_to_parquet.py.
+
+Usage (from the genai directory):
+    AWS_PROFILE=nfl uv run python -m benchmarks.bench_parquet_routing [--repeat 3]
+"""
+
+import argparse
+import statistics
+import time
+
+import boto3
+
+from nfl_athena.parquet import DATABASE, route_to_parquet
+
+S3_OUTPUT_LOCATION = "s3://alt-nfl-bucket/athena_queries/"
+
+QUERIES = {
+    'player_td_by_season': """
+        select athlete_name, team_abbreviation, stat_label, nfl_season,
+               sum(cast(stat_value as double)) as touchdowns
+        from nfl_stats_database.player_stats
+        where lower(athlete_name) = 'tom brady' and stat_label = 'TD'
+        group by 1,2,3,4 order by nfl_season""",
+    'top_passers_2015': """
+        select athlete_name, sum(cast(stat_value as double)) as passing_yards
+        from nfl_stats_database.player_stats
+        where stat_label = 'YDS' and stat_type = 'passing' and nfl_season = '2015'
+        group by 1 order by passing_yards desc limit 5""",
+    'team_first_downs': """
+        select team_abbreviation, nfl_season, sum(value) as value
+        from nfl_stats_database.team_stats
+        where team_abbreviation = 'GB' and name = 'firstDowns'
+        group by 1,2 order by nfl_season""",
+    'long_drives_by_season': """
+        select team_abbreviation, nfl_season, count(*) as drive_count
+        from nfl_stats_database.drive_report
+        where yards > 40 and team_abbreviation = 'WSH'
+        group by 1,2 order by nfl_season""",
+    'deep_passes_2024': """
+        select full_name, avg(case when cast(throw_yards as double) > 15 then 1.0 else 0.0 end) as deep_rate
+        from nfl_stats_database.pbp_stats_passing
+        where throw_yards <> 'NA' and nfl_season = '2024'
+        group by 1 having count(*) > 50 order by deep_rate desc""",
+    'scoring_plays_2024': """
+        select possession, count(*) as scoring_plays
+        from nfl_stats_database.play_by_play
+        where scoring_play = true and nfl_season = '2024'
+        group by 1 order by 2 desc""",
+    'road_wins': """
+        select season, count(*) as road_wins
+        from nfl_stats_database.clean_schedule
+        where away_team = 'NO' and winning_team = 'NO'
+        group by 1 order by season""",
+}
+
+
+def run(athena_client, sql):
+    """Run a query to completion; returns (state, bytes scanned, engine ms, wall ms)."""
+    start = time.perf_counter()
+    query_execution_id = athena_client.start_query_execution(
+        QueryString=sql,
+        QueryExecutionContext={'Database': DATABASE},
+        ResultConfiguration={'OutputLocation': S3_OUTPUT_LOCATION},
+        WorkGroup='primary'
+    )['QueryExecutionId']
+    while True:
+        execution = athena_client.get_query_execution(QueryExecutionId=query_execution_id)['QueryExecution']
+        state = execution['Status']['State']
+        if state in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+            break
+        time.sleep(0.25)
+    wall_ms = (time.perf_counter() - start) * 1000
+    stats = execution.get('Statistics', {})
+    return state, stats.get('DataScannedInBytes', 0), stats.get('EngineExecutionTimeInMillis', 0), wall_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--query', choices=sorted(QUERIES), help='Only run this query')
+    args = parser.parse_args()
+
+    athena_client = boto3.client('athena', region_name='us-east-1')
+
+    print(f"{'query':<24} | {'format':<7} | {'scanned MB':>10} | {'engine ms':>9} | {'wall ms':>8} | state")
+    print("-" * 80)
+    totals = {'csv': [0, 0.0], 'parquet': [0, 0.0]}
+    for name, csv_sql in QUERIES.items():
+        if args.query and name != args.query:
+            continue
+        parquet_sql, _ = route_to_parquet(csv_sql, enabled=True)
+        for label, sql in (('csv', csv_sql), ('parquet', parquet_sql)):
+            runs = [run(athena_client, sql) for _ in range(args.repeat)]
+            state = runs[-1][0]
+            scanned = runs[-1][1]
+            engine = statistics.median(r[2] for r in runs)
+            wall = statistics.median(r[3] for r in runs)
+            totals[label][0] += scanned
+            totals[label][1] += wall
+            print(f"{name:<24} | {label:<7} | {scanned / 1024 / 1024:>10.2f} | {engine:>9.0f} | {wall:>8.0f} | {state}")
+
+    print("-" * 80)
+    for label, (scanned, wall) in totals.items():
+        print(f"{'TOTAL':<24} | {label:<7} | {scanned / 1024 / 1024:>10.2f} | {'':>9} | {wall:>8.0f} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: sequential Athena queries vs one concurrent batch.
+
+Runs a comparative question's independent SELECTs one after another (the old
+one-call-per-query flow) and then through nfl_athena.batch.run_batch, and
+reports the wall-clock time of each. Requires AWS credentials.
+
+Usage (from the genai directory):
+    AWS_PROFILE=nfl uv run python -m benchmarks.bench_query_batch [--concurrency 5]
+"""
+
+import argparse
+import time
+
+import boto3
+
+from benchmarks.bench_parquet_routing import run
+from nfl_athena.batch import run_batch
+
+# "Compare Mahomes and Allen passing yards in 2023 and 2024"
+STATEMENTS = [
+    f"""select athlete_name, nfl_season, sum(cast(stat_value as double)) as passing_yards
+        from nfl_stats_database.player_stats
+        where lower(athlete_name) = '{player}' and stat_type = 'passing' and stat_label = 'YDS'
+          and nfl_season = '{season}'
+        group by 1, 2"""
+    for player in ('patrick mahomes', 'josh allen')
+    for season in ('2023', '2024')
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=5)
+    args = parser.parse_args()
+
+    athena_client = boto3.client('athena', region_name='us-east-1')
+
+    start = time.perf_counter()
+    sequential = [run(athena_client, sql) for sql in STATEMENTS]
+    sequential_s = time.perf_counter() - start
+    slowest_s = max(r[3] for r in sequential) / 1000
+
+    start = time.perf_counter()
+    batch = run_batch(athena_client, STATEMENTS, max_concurrency=args.concurrency, poll_interval=0.25)
+    batch_s = time.perf_counter() - start
+
+    print(f"{len(STATEMENTS)} statements")
+    print(f"sequential: {sequential_s:6.2f}s (slowest single query {slowest_s:.2f}s)")
+    print(f"batch:      {batch_s:6.2f}s (concurrency {args.concurrency}, "
+          f"states: {', '.join(execution['Status']['State'] for execution, _ in batch)})")
+    print(f"speedup:    {sequential_s / batch_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Micro-benchmark: row-of-strings decoding vs typed columnar decoding of an
+Athena ResultSet.
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_result_decoding [--rows 1000] [--repeat 20]
+"""
+
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from nfl_athena.results import decode_result_set
+
+COLUMN_INFO = [
+    {'Name': 'athlete_name', 'Type': 'varchar'},
+    {'Name': 'team_abbreviation', 'Type': 'varchar'},
+    {'Name': 'nfl_season', 'Type': 'varchar'},
+    {'Name': 'espn_id', 'Type': 'bigint'},
+    {'Name': 'games', 'Type': 'integer'},
+    {'Name': 'passing_yards', 'Type': 'double'},
+    {'Name': 'touchdowns', 'Type': 'bigint'},
+    {'Name': 'yards_per_attempt', 'Type': 'double'},
+    {'Name': 'scoring_play', 'Type': 'boolean'},
+    {'Name': 'game_date', 'Type': 'date'},
+]
+
+
+def build_result_set(n_rows, null_rate=0.05, seed=7):
+    """Build a synthetic get_query_results ResultSet with mixed column types."""
+    rng = random.Random(seed)
+    teams = ['WSH', 'DAL', 'PHI', 'NYG', 'KC', 'BUF', 'SF', 'GB']
+
+    def cell(value):
+        return {} if rng.random() < null_rate else {'VarCharValue': value}
+
+    rows = [{'Data': [{'VarCharValue': info['Name']} for info in COLUMN_INFO]}]
+    for i in range(n_rows):
+        rows.append({'Data': [
+            cell(f"Player {i}"),
+            cell(rng.choice(teams)),
+            cell(str(rng.randint(2005, 2024))),
+            cell(str(400000000 + i)),
+            cell(str(rng.randint(1, 17))),
+            cell(f"{rng.uniform(0, 5500):.1f}"),
+            cell(str(rng.randint(0, 55))),
+            cell(f"{rng.uniform(3, 10):.2f}"),
+            cell(rng.choice(['true', 'false'])),
+            cell(f"20{rng.randint(10, 24)}-{rng.randint(9, 12):02d}-{rng.randint(1, 28):02d}"),
+        ]})
+    return {'Rows': rows, 'ResultSetMetadata': {'ColumnInfo': COLUMN_INFO}}
+
+
+def legacy_decode(result_set):
+    """The previous approach: header row + list of string rows, nulls flattened to ''."""
+    rows = result_set['Rows']
+    columns = [col['VarCharValue'] for col in rows[0]['Data']]
+    data_rows = []
+    for row in rows[1:]:
+        row_data = []
+        for cell in row['Data']:
+            if 'VarCharValue' in cell:
+                row_data.append(cell['VarCharValue'])
+            else:
+                row_data.append('')
+        data_rows.append(row_data)
+    return columns, data_rows
+
+
+def legacy_dataframe(result_set):
+    columns, data_rows = legacy_decode(result_set)
+    return pd.DataFrame(data_rows, columns=columns)
+
+
+def legacy_pipeline(result_set):
+    columns, data_rows = legacy_decode(result_set)
+    df = pd.DataFrame(data_rows, columns=columns)
+    # Downstream consumers have to re-parse strings before sorting/summing
+    yards = pd.to_numeric(df['passing_yards'], errors='coerce')
+    top = df.assign(passing_yards=yards).sort_values('passing_yards', ascending=False).head(10)
+    return yards.sum(), top, json.dumps([dict(zip(columns, r)) for r in data_rows[:100]])
+
+
+def typed_pipeline(result_set):
+    result = decode_result_set(result_set)
+    df = result.to_pandas()
+    top = df.sort_values('passing_yards', ascending=False).head(10)
+    return df['passing_yards'].sum(), top, json.dumps(result.to_records(limit=100))
+
+
+NUMERIC = ['games', 'passing_yards', 'touchdowns', 'yards_per_attempt']
+
+
+def legacy_summaries(df):
+    """Typical analyst follow-ups over a string-typed frame: every access re-parses."""
+    out = []
+    for _ in range(5):
+        numeric = df[NUMERIC].apply(pd.to_numeric, errors='coerce')
+        frame = df.assign(**{col: numeric[col] for col in NUMERIC})
+        out.append(frame.groupby('team_abbreviation')[NUMERIC].sum())
+        out.append(frame[frame['passing_yards'] > 4000].sort_values(['touchdowns', 'passing_yards']).head(10))
+    return out
+
+
+def typed_summaries(df):
+    out = []
+    for _ in range(5):
+        out.append(df.groupby('team_abbreviation')[NUMERIC].sum())
+        out.append(df[df['passing_yards'] > 4000].sort_values(['touchdowns', 'passing_yards']).head(10))
+    return out
+
+
+def time_it(fn, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} | {'stage':<24} | {'legacy ms':>10} | {'typed ms':>10} | {'speedup':>8}")
+    print("-" * 72)
+    print("Typed decoding parses every cell up front; the payoff is in downstream work.")
+    for n_rows in args.rows:
+        result_set = build_result_set(n_rows)
+        stages = [
+            ('decode', legacy_decode, lambda rs: decode_result_set(rs)),
+            ('decode+DataFrame', legacy_dataframe, lambda rs: decode_result_set(rs).to_pandas()),
+            ('decode+sort+sum+json', legacy_pipeline, typed_pipeline),
+            ('decode+5 summaries', lambda rs: legacy_summaries(legacy_dataframe(rs)),
+             lambda rs: typed_summaries(decode_result_set(rs).to_pandas())),
+        ]
+        for name, legacy_fn, typed_fn in stages:
+            legacy = time_it(legacy_fn, result_set, args.repeat) * 1000
+            typed = time_it(typed_fn, result_set, args.repeat) * 1000
+            print(f"{n_rows:>8} | {name:<24} | {legacy:>10.3f} | {typed:>10.3f} | {legacy / typed:>7.2f}x")
+
+        # Zero-copy check: the DataFrame column shares memory with the decoded buffer
+        result = decode_result_set(result_set)
+        df = result.to_pandas()
+        shared = df['espn_id'].array._data.ctypes.data == result.column('espn_id').to_numpy().ctypes.data
+        print(f"{n_rows:>8} | zero-copy int64 handoff: {shared}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: SSE token events per response, one per delta vs coalesced.
+
+Replays a canned analyst answer as a stream of small text deltas at a fixed
+rate (Nova Micro sends a few characters every few milliseconds) through
+stream_coalescing.coalesce_text with several configurations, and reports the
+number of token events, events/sec, SSE bytes on the wire and time to the
+first event. Runs offline; no AWS calls.
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_token_coalescing [--delta-ms 4] [--chars-per-delta 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+from stream_coalescing import CoalesceConfig, StreamStats, coalesce_text
+
+ANSWER = """The Kansas City Chiefs went 15-2 in the 2024 regular season. Patrick Mahomes threw for 3,928 yards with 26 touchdowns and 11 interceptions.
+
+| Week | Opponent | Result |
+|------|----------|--------|
+| 1 | BAL | W 27-20 |
+| 2 | CIN | W 26-25 |
+| 3 | @ATL | W 22-17 |
+
+Their defense allowed 19.2 points per game, fourth best in the league. Would you like the game-by-game breakdown?
+""" * 3
+
+CONFIGS = [
+    ('one event per delta', CoalesceConfig(enabled=False)),
+    ('default (64 chars / 30 ms / sentence)', CoalesceConfig(enabled=True, max_chars=64, max_delay_ms=30, sentence_flush=True)),
+    ('64 chars / 30 ms, no sentence flush', CoalesceConfig(enabled=True, max_chars=64, max_delay_ms=30, sentence_flush=False)),
+    ('256 chars / 100 ms', CoalesceConfig(enabled=True, max_chars=256, max_delay_ms=100, sentence_flush=False)),
+]
+
+
+async def deltas(chars_per_delta, delta_s):
+    for i in range(0, len(ANSWER), chars_per_delta):
+        await asyncio.sleep(delta_s)
+        yield ANSWER[i:i + chars_per_delta]
+
+
+async def measure(config, chars_per_delta, delta_s):
+    stats = StreamStats()
+    start = time.perf_counter()
+    first_ms = None
+    text = []
+    async for chunk in coalesce_text(deltas(chars_per_delta, delta_s), config, stats):
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+        text.append(chunk)
+    elapsed = time.perf_counter() - start
+    assert ''.join(text) == ANSWER
+    return stats, elapsed, first_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--delta-ms', type=float, default=4)
+    parser.add_argument('--chars-per-delta', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{len(ANSWER)} chars in {args.chars_per_delta}-char deltas every {args.delta_ms} ms\n")
+    print(f"{'config':<40} {'events':>7} {'events/s':>9} {'SSE bytes':>10} {'first ms':>9}")
+    for name, config in CONFIGS:
+        stats, elapsed, first_ms = asyncio.run(measure(config, args.chars_per_delta, args.delta_ms / 1000))
+        print(f"{name:<40} {stats.events:>7} {stats.events / elapsed:>9.0f} {stats.sse_bytes:>10} {first_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: one model turn with several tool uses, run one after another vs
+through tool_runtime.ToolExecutor.
+
+Each simulated tool blocks like the real boto3 tools do (time.sleep for the
+S3/Athena latency). Reports the turn latency of both modes and the order the
+tools finished in (strands returns results in tool-use order either way).
+Runs offline; no AWS calls.
+
+Usage (from the genai directory):
+    uv run python -m benchmarks.bench_tool_executor
+"""
+
+import argparse
+import asyncio
+import time
+
+from tool_runtime import ToolExecutor, call_local_tool
+
+# (tool name, simulated latency in seconds)
+TURNS = {
+    'recap (context + inputs + outputs)': [('get_context', 0.35), ('get_game_inputs', 0.25), ('get_game_outputs', 0.30)],
+    'four Athena queries (limit 2)': [('query_athena', 0.4), ('query_athena', 0.2), ('query_athena', 0.3),
+                                      ('query_athena', 0.1)],
+}
+
+
+def make_tool(name, latency):
+    def tool(tool, **kwargs):
+        time.sleep(latency)  # blocking, like boto3
+        return {'toolUseId': tool['toolUseId'], 'status': 'success', 'content': [{'text': f"{name} done"}]}
+    return tool
+
+
+def sequential(tool_uses):
+    start = time.perf_counter()
+    for name, latency, tool_use in tool_uses:
+        call_local_tool(make_tool(name, latency), tool_use)
+    return time.perf_counter() - start
+
+
+async def concurrent(executor, tool_uses):
+    finished = []
+
+    async def one(name, latency, tool_use):
+        result = await executor.run(name, lambda: executor.run_sync(call_local_tool, make_tool(name, latency), tool_use))
+        finished.append(tool_use['toolUseId'])
+        return result
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(*tool_use) for tool_use in tool_uses))
+    return time.perf_counter() - start, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    executor = ToolExecutor(max_workers=args.workers)
+    for label, tools in TURNS.items():
+        tool_uses = [(name, latency, {'toolUseId': f"t{i}", 'name': name, 'input': {}})
+                     for i, (name, latency) in enumerate(tools)]
+        sequential_s = sequential(tool_uses)
+        concurrent_s, finished = asyncio.run(concurrent(executor, tool_uses))
+        print(f"{label}")
+        print(f"  sequential: {sequential_s * 1000:6.0f} ms")
+        print(f"  executor:   {concurrent_s * 1000:6.0f} ms ({sequential_s / concurrent_s:.1f}x)")
+        print(f"  finished:   {' '.join(finished)}")
+    print(f"executor: {executor.stats}")
+
+
+if __name__ == "__main__":
+    main()
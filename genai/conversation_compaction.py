@@ -0,0 +1,202 @@
+"""
+Tool-result-aware conversation compaction.
+
+With a plain message window, every tool result - a whole get_game_inputs JSON,
+a 100-row Athena table - stays in the conversation for up to ten messages and
+is re-sent to Bedrock on every later model call. Once a turn is over, the model
+has already used those results to answer, so `compact_messages` replaces them
+with a short summary (what the tool returned, its first lines) and a handle:
+calling the tool again with the same input, which the session's tool memo
+(tool_memo.py) answers without touching S3 or Athena.
+
+`trim_to_budget` then drops the oldest whole turns while the running token
+estimate is over the personality's budget, instead of cutting at a message
+count. agent_config.CompactingConversationManager applies both before every
+model call and after every invocation.
+
+Budgets are per personality (`COMPACTION_CONFIGS`); `CONVERSATION_COMPACTION=0`
+falls back to the plain sliding window.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from prompt_registry import estimate_tokens
+
+COMPACTION_ENABLED = os.environ.get('CONVERSATION_COMPACTION', 'true').lower() not in ('0', 'false', 'no')
+
+# Marks a tool result that was already compacted
+COMPACTED_PREFIX = '[compacted tool result]'
+
+# Tokens counted for a non-text block (image, document)
+OTHER_BLOCK_TOKENS = 1000
+
+
+@dataclass(frozen=True)
+class CompactionConfig:
+    max_tokens: int = 12000         # conversation budget (system prompt excluded)
+    keep_turns: int = 1             # most recent user turns whose tool results stay intact
+    min_result_tokens: int = 150    # smaller results are cheaper to keep than to summarize
+    summary_lines: int = 6          # lines of the original result kept in the summary
+    window_size: int = 40           # message-count backstop (the strands default)
+
+
+# Recaps pull large game JSON once and write the story from the whole of it, so their
+# budget is larger and summaries shorter; the analysts' summaries keep more table rows
+# for follow-ups ("now sort that by yards") that the model can answer without re-querying
+COMPACTION_CONFIGS: Dict[str, CompactionConfig] = {
+    'nfl_game_recap': CompactionConfig(max_tokens=16000, summary_lines=4),
+    'nfl_analyst': CompactionConfig(max_tokens=6000, summary_lines=12),
+    'nfl_native_analyst': CompactionConfig(max_tokens=6000, summary_lines=12),
+}
+
+
+def compaction_config(personality: str) -> CompactionConfig:
+    return COMPACTION_CONFIGS.get(personality, CompactionConfig())
+
+
+def _block_text(block: Dict[str, Any]) -> str:
+    if 'text' in block:
+        return block['text']
+    if 'json' in block:
+        return json.dumps(block['json'], default=str)
+    if 'toolUse' in block:
+        tool_use = block['toolUse']
+        return f"{tool_use.get('name', '')} {json.dumps(tool_use.get('input'), default=str)}"
+    if 'toolResult' in block:
+        return ''.join(_block_text(item) for item in block['toolResult'].get('content', []))
+    return ''
+
+
+def block_tokens(block: Dict[str, Any]) -> int:
+    if not any(key in block for key in ('text', 'json', 'toolUse', 'toolResult')):
+        return OTHER_BLOCK_TOKENS
+    return estimate_tokens(_block_text(block))
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    return sum(block_tokens(block) for block in message.get('content', []))
+
+
+def conversation_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(message_tokens(message) for message in messages)
+
+
+def _is_user_prompt(message: Dict[str, Any]) -> bool:
+    """A user message that starts a turn (not one carrying tool results)"""
+    return message.get('role') == 'user' and not any('toolResult' in block for block in message.get('content', []))
+
+
+def turn_starts(messages: List[Dict[str, Any]]) -> List[int]:
+    return [i for i, message in enumerate(messages) if _is_user_prompt(message)]
+
+
+def summarize_result(tool_name: str, tool_input: Any, tool_result: Dict[str, Any], summary_lines: int) -> str:
+    """Short stand-in for a used tool result, with a handle to get it back"""
+    text = ''.join(_block_text(item) for item in tool_result.get('content', []))
+    lines = [line for line in text.splitlines() if line.strip()]
+    if text.lstrip().startswith('{'):
+        try:
+            keys = list(json.loads(text))
+            lines = [f"JSON object with keys: {', '.join(map(str, keys[:20]))}"]
+        except ValueError:
+            pass
+    head = '\n'.join(line[:200] for line in lines[:summary_lines])
+    more = f"\n... ({len(lines) - summary_lines} more lines)" if len(lines) > summary_lines else ''
+    arguments = json.dumps(tool_input, sort_keys=True, default=str) if tool_input else '{}'
+    return (f"{COMPACTED_PREFIX} {tool_name} returned ~{estimate_tokens(text)} tokens, already used above.\n"
+            f"{head}{more}\n"
+            f"Call {tool_name} again with {arguments} for the full result.")
+
+
+def compact_messages(messages: List[Dict[str, Any]], config: CompactionConfig) -> Dict[str, int]:
+    """
+    Replace tool results older than the last `keep_turns` user turns with
+    summaries (in place; results are copied, never mutated, since the tool memo
+    may share them). Returns counts for logging.
+    """
+    stats = {'compacted': 0, 'tokens_saved': 0}
+    starts = turn_starts(messages)
+    if len(starts) <= config.keep_turns:
+        return stats
+    keep_from = starts[-config.keep_turns] if config.keep_turns > 0 else len(messages)
+
+    tool_uses = {}
+    for message in messages[:keep_from]:
+        for block in message.get('content', []):
+            if 'toolUse' in block:
+                tool_uses[block['toolUse'].get('toolUseId')] = block['toolUse']
+
+    for message in messages[:keep_from]:
+        content = message.get('content', [])
+        if not any('toolResult' in block for block in content):
+            continue
+        new_content = []
+        for block in content:
+            tool_result = block.get('toolResult')
+            if tool_result is None:
+                new_content.append(block)
+                continue
+            text = ''.join(_block_text(item) for item in tool_result.get('content', []))
+            tokens = estimate_tokens(text)
+            if text.startswith(COMPACTED_PREFIX) or tokens < config.min_result_tokens:
+                new_content.append(block)
+                continue
+            tool_use = tool_uses.get(tool_result.get('toolUseId'), {})
+            summary = summarize_result(tool_use.get('name', 'the tool'), tool_use.get('input'), tool_result,
+                                       config.summary_lines)
+            new_content.append({'toolResult': {**tool_result, 'content': [{'text': summary}]}})
+            stats['compacted'] += 1
+            stats['tokens_saved'] += tokens - estimate_tokens(summary)
+        message['content'] = new_content
+    return stats
+
+
+def trim_to_budget(messages: List[Dict[str, Any]], max_tokens: int) -> int:
+    """
+    Drop the oldest whole turns (in place) while the conversation is over
+    `max_tokens`; the latest turn is always kept. Returns the number of
+    messages removed.
+    """
+    starts = turn_starts(messages)
+    if not starts:
+        return 0
+    cut = starts[0]  # messages before the first user prompt are orphans of an earlier trim
+    total = conversation_tokens(messages[cut:])
+    for next_start in starts[1:]:
+        if total <= max_tokens:
+            break
+        total -= conversation_tokens(messages[cut:next_start])
+        cut = next_start
+    if cut:
+        del messages[:cut]
+    return cut
+
+
+class CompactionStats:
+    """Running token estimate and totals for one conversation"""
+
+    def __init__(self):
+        self.tokens = 0
+        self.compacted = 0
+        self.tokens_saved = 0
+        self.trimmed_messages = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'tokens': self.tokens, 'compacted': self.compacted, 'tokens_saved': self.tokens_saved,
+                'trimmed_messages': self.trimmed_messages}
+
+
+def compact_conversation(messages: List[Dict[str, Any]], config: CompactionConfig,
+                         stats: Optional[CompactionStats] = None) -> int:
+    """compact_messages then trim_to_budget; returns the number of messages removed"""
+    stats = stats or CompactionStats()
+    compacted = compact_messages(messages, config)
+    removed = trim_to_budget(messages, config.max_tokens)
+    stats.compacted += compacted['compacted']
+    stats.tokens_saved += compacted['tokens_saved']
+    stats.trimmed_messages += removed
+    stats.tokens = conversation_tokens(messages)
+    return removed
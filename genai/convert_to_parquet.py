@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Convert the crawler-generated CSV tables in nfl_stats_database to Parquet.
+
+Usage (from the genai directory):
+    uv run convert_to_parquet.py ddl                     # write database/ddl_<table>_parquet.sql
+    uv run convert_to_parquet.py sql [--table player_stats] [--season 2025]
+    AWS_PROFILE=nfl uv run convert_to_parquet.py run [--table player_stats] [--season 2025]
+
+Without --season, `sql`/`run` use CTAS to create the full Parquet copies.
+With --season, they append just that nfl_season partition with INSERT INTO.
+Once the tables exist, set ATHENA_PARQUET_ROUTING=true on the nfl-data-service
+Lambda to route queries to them (with a fallback to the CSV tables).
+"""
+
+import argparse
+import time
+
+import boto3
+
+from nfl_athena.parquet import (
+    DATABASE, csv_tables, ctas_statement, insert_partition_statement, parquet_name, write_parquet_ddls
+)
+
+S3_OUTPUT_LOCATION = "s3://alt-nfl-bucket/athena_queries/"
+
+
+def statements_for(table_name=None, season=None):
+    """Yield (table, statement) for the selected tables."""
+    for table in csv_tables():
+        if table_name and table.name != table_name:
+            continue
+        if season:
+            if not table.partition_names:
+                continue  # nothing to append for unpartitioned tables
+            yield table, insert_partition_statement(table, season)
+        else:
+            yield table, ctas_statement(table)
+
+
+def run_statement(athena_client, statement, max_wait_time=1800, wait_interval=5):
+    """Run one statement and wait for it; returns the final QueryExecution."""
+    response = athena_client.start_query_execution(
+        QueryString=statement,
+        QueryExecutionContext={'Database': DATABASE},
+        ResultConfiguration={'OutputLocation': S3_OUTPUT_LOCATION},
+        WorkGroup='primary'
+    )
+    query_execution_id = response['QueryExecutionId']
+
+    elapsed_time = 0
+    while elapsed_time < max_wait_time:
+        execution = athena_client.get_query_execution(QueryExecutionId=query_execution_id)['QueryExecution']
+        if execution['Status']['State'] in ['SUCCEEDED', 'FAILED', 'CANCELLED']:
+            return execution
+        time.sleep(wait_interval)
+        elapsed_time += wait_interval
+
+    athena_client.stop_query_execution(QueryExecutionId=query_execution_id)
+    raise TimeoutError(f"Statement {query_execution_id} did not finish in {max_wait_time} seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['ddl', 'sql', 'run'])
+    parser.add_argument('--table', help='Only convert this table (default: all CSV tables)')
+    parser.add_argument('--season', help='Append a single nfl_season partition instead of a full CTAS')
+    args = parser.parse_args()
+
+    if args.command == 'ddl':
+        for path in write_parquet_ddls():
+            print(f"✅ Wrote {path}")
+        return
+
+    if args.command == 'sql':
+        for _, statement in statements_for(args.table, args.season):
+            print(f"{statement};\n")
+        return
+
+    athena_client = boto3.client('athena', region_name='us-east-1')
+    for table, statement in statements_for(args.table, args.season):
+        print(f"🔧 {parquet_name(table.name)} ...")
+        execution = run_statement(athena_client, statement)
+        state = execution['Status']['State']
+        scanned = execution.get('Statistics', {}).get('DataScannedInBytes', 0)
+        if state == 'SUCCEEDED':
+            print(f"✅ {parquet_name(table.name)}: scanned {scanned / 1024 / 1024:.1f} MB of CSV")
+        else:
+            print(f"❌ {parquet_name(table.name)}: {state} - {execution['Status'].get('StateChangeReason', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+--- Table: clean_schedule_parquet
+--- Parquet copy of clean_schedule (generated by convert_to_parquet.py - do not edit)
+--- Same columns as clean_schedule; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `clean_schedule_parquet`(
+  `season` bigint, 
+  `season_type` bigint, 
+  `season_name` string, 
+  `season_week` bigint, 
+  `game_week` bigint, 
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `date_time` string, 
+  `date` string, 
+  `game_short_name` string, 
+  `matchup` string, 
+  `home_team` string, 
+  `home_score` bigint, 
+  `away_team` string, 
+  `away_score` bigint, 
+  `winning_team` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/clean_schedule/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='clean_schedule')
@@ -0,0 +1,33 @@
+--- Table: drive_report_parquet
+--- Parquet copy of drive_report (generated by convert_to_parquet.py - do not edit)
+--- Same columns as drive_report; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `drive_report_parquet`(
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `team_abbreviation` string, 
+  `team_id` string, 
+  `team_id_num` bigint, 
+  `description` string, 
+  `start_quarter` bigint, 
+  `start_time` string, 
+  `yards` bigint, 
+  `scoring` boolean, 
+  `offensive_plays` bigint, 
+  `result` string, 
+  `display_result` string, 
+  `start_text` string, 
+  `start_yard` bigint, 
+  `end_text` string, 
+  `end_yard` string, 
+  `end_yard_num` bigint, 
+  `time_length` string)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/drive_report/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='drive_report')
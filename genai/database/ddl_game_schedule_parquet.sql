@@ -0,0 +1,51 @@
+--- Table: game_schedule_parquet
+--- Parquet copy of game_schedule (generated by convert_to_parquet.py - do not edit)
+--- Same columns as game_schedule; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `game_schedule_parquet`(
+  `season` bigint, 
+  `season_type` bigint, 
+  `season_name` string, 
+  `season_week` bigint, 
+  `game_week` bigint, 
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `date_time` string, 
+  `date` string, 
+  `game_short_name` string, 
+  `game_long_name` string, 
+  `game_description` string, 
+  `venue` string, 
+  `location` string, 
+  `game_winner` string, 
+  `team_1_id` bigint, 
+  `team_1_home_away` string, 
+  `team_1_location` string, 
+  `team_1_name` string, 
+  `team_1_abbreviation` string, 
+  `team_1_full_name` string, 
+  `team_1_mascot` string, 
+  `team_1_q1_score` bigint, 
+  `team_1_q2_score` bigint, 
+  `team_1_q3_score` bigint, 
+  `team_1_q4_score` bigint, 
+  `team_1_final_score` bigint, 
+  `team_2_id` bigint, 
+  `team_2_home_away` string, 
+  `team_2_location` string, 
+  `team_2_name` string, 
+  `team_2_abbreviation` string, 
+  `team_2_full_name` string, 
+  `team_2_mascot` string, 
+  `team_2_q1_score` bigint, 
+  `team_2_q2_score` bigint, 
+  `team_2_q3_score` bigint, 
+  `team_2_q4_score` bigint, 
+  `team_2_final_score` bigint)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/game_schedule/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='game_schedule')
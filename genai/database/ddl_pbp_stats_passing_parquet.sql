@@ -0,0 +1,46 @@
+--- Table: pbp_stats_passing_parquet
+--- Parquet copy of pbp_stats_passing (generated by convert_to_parquet.py - do not edit)
+--- Same columns as pbp_stats_passing; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `pbp_stats_passing_parquet`(
+  `temp` string, 
+  `game_id` string, 
+  `posteam` string, 
+  `player_id` string, 
+  `down` string, 
+  `down_num` bigint, 
+  `ydstogo` bigint, 
+  `play_type` string, 
+  `yards_gained` bigint, 
+  `shotgun` bigint, 
+  `no_huddle` bigint, 
+  `qb_dropback` bigint, 
+  `qb_kneel` bigint, 
+  `qb_spike` bigint, 
+  `qb_scramble` bigint, 
+  `pass_length` string, 
+  `pass_location` string, 
+  `air_yards` string, 
+  `air_yards_num` double, 
+  `yards_after_catch` bigint, 
+  `throw_yards` string, 
+  `throw_yards_num` double, 
+  `play_result` string, 
+  `play_type_nfl` string, 
+  `fumble` bigint, 
+  `touchdown` bigint, 
+  `interception` bigint, 
+  `success` bigint, 
+  `desc` string, 
+  `full_name` string, 
+  `first_name` string, 
+  `last_name` string)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/pbp_stats_passing/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='pbp_stats_passing')
@@ -0,0 +1,38 @@
+--- Table: play_by_play_parquet
+--- Parquet copy of play_by_play (generated by convert_to_parquet.py - do not edit)
+--- Same columns as play_by_play; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `play_by_play_parquet`(
+  `espn_id` string, 
+  `espn_id_num` bigint, 
+  `unique_id` string, 
+  `drive_id` string, 
+  `play_id` string, 
+  `sequence` string, 
+  `sequence_num` bigint, 
+  `yardage` string, 
+  `yardage_num` bigint, 
+  `quarter` string, 
+  `quarter_num` bigint, 
+  `time_remaining` string, 
+  `home_score` string, 
+  `home_score_num` bigint, 
+  `away_score` bigint, 
+  `down` bigint, 
+  `distance` bigint, 
+  `yardline` bigint, 
+  `yards_to_endzone` bigint, 
+  `possession` string, 
+  `scoring_play` boolean, 
+  `play_text` string, 
+  `col17` string, 
+  `col18` string)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/play_by_play/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='play_by_play')
@@ -0,0 +1,85 @@
+--- Table: player_game_stats
+--- player_stats pivoted to one row per player per game (generated by materialize_player_stats.py - do not edit)
+--- Numeric columns are already typed: no CAST needed. NULL means the player had no such stat
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `player_game_stats`(
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `athlete_id` bigint, 
+  `athlete_name` string, 
+  `athlete_first` string, 
+  `athlete_last` string, 
+  `athlete_jersey` string, 
+  `team_abbreviation` string, 
+  `team_id` bigint, 
+  `passing_completions` bigint, 
+  `passing_attempts` bigint, 
+  `passing_yards` bigint, 
+  `passing_touchdowns` bigint, 
+  `passing_interceptions` bigint, 
+  `sacks_taken` bigint, 
+  `sack_yards_lost` bigint, 
+  `qbr` double, 
+  `passer_rating` double, 
+  `rushing_attempts` bigint, 
+  `rushing_yards` bigint, 
+  `rushing_touchdowns` bigint, 
+  `rushing_long` bigint, 
+  `receptions` bigint, 
+  `receiving_targets` bigint, 
+  `receiving_yards` bigint, 
+  `receiving_touchdowns` bigint, 
+  `receiving_long` bigint, 
+  `fumbles` bigint, 
+  `fumbles_lost` bigint, 
+  `fumbles_recovered` bigint, 
+  `tackles` bigint, 
+  `solo_tackles` bigint, 
+  `sacks` double, 
+  `tackles_for_loss` bigint, 
+  `passes_defended` bigint, 
+  `qb_hits` bigint, 
+  `defensive_touchdowns` bigint, 
+  `interceptions` bigint, 
+  `interception_yards` bigint, 
+  `interception_touchdowns` bigint, 
+  `kick_returns` bigint, 
+  `kick_return_yards` bigint, 
+  `kick_return_touchdowns` bigint, 
+  `punt_returns` bigint, 
+  `punt_return_yards` bigint, 
+  `punt_return_touchdowns` bigint, 
+  `field_goals_made` bigint, 
+  `field_goals_attempted` bigint, 
+  `field_goal_long` bigint, 
+  `extra_points_made` bigint, 
+  `extra_points_attempted` bigint, 
+  `kicking_points` bigint, 
+  `punts` bigint, 
+  `punt_yards` bigint, 
+  `punts_inside_20` bigint, 
+  `punt_touchbacks` bigint)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/derived/player_game_stats/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'derived_from'='player_stats')
+
+--- Sample queries for player_game_stats
+--- --------------------------------------------------------
+
+--- Patrick Mahomes passing line in every 2024 game
+select unique_id, passing_completions, passing_attempts, passing_yards, passing_touchdowns, passing_interceptions
+from nfl_stats_database.player_game_stats
+where lower(athlete_name) = 'patrick mahomes' and nfl_season = '2024'
+order by unique_id
+
+--- 150+ yard rushing games in 2023
+select athlete_name, team_abbreviation, unique_id, rushing_yards
+from nfl_stats_database.player_game_stats
+where nfl_season = '2023' and rushing_yards >= 150
+order by rushing_yards desc
@@ -0,0 +1,88 @@
+--- Table: player_season_stats
+--- player_stats pivoted to one row per player per season (generated by materialize_player_stats.py - do not edit)
+--- Numeric columns are already typed: no CAST needed. NULL means the player had no such stat
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `player_season_stats`(
+  `athlete_id` bigint, 
+  `athlete_name` string, 
+  `team_abbreviation` string, 
+  `team_id` bigint, 
+  `games` bigint, 
+  `passing_completions` bigint, 
+  `passing_attempts` bigint, 
+  `passing_yards` bigint, 
+  `passing_touchdowns` bigint, 
+  `passing_interceptions` bigint, 
+  `sacks_taken` bigint, 
+  `sack_yards_lost` bigint, 
+  `qbr` double, 
+  `passer_rating` double, 
+  `rushing_attempts` bigint, 
+  `rushing_yards` bigint, 
+  `rushing_touchdowns` bigint, 
+  `rushing_long` bigint, 
+  `receptions` bigint, 
+  `receiving_targets` bigint, 
+  `receiving_yards` bigint, 
+  `receiving_touchdowns` bigint, 
+  `receiving_long` bigint, 
+  `fumbles` bigint, 
+  `fumbles_lost` bigint, 
+  `fumbles_recovered` bigint, 
+  `tackles` bigint, 
+  `solo_tackles` bigint, 
+  `sacks` double, 
+  `tackles_for_loss` bigint, 
+  `passes_defended` bigint, 
+  `qb_hits` bigint, 
+  `defensive_touchdowns` bigint, 
+  `interceptions` bigint, 
+  `interception_yards` bigint, 
+  `interception_touchdowns` bigint, 
+  `kick_returns` bigint, 
+  `kick_return_yards` bigint, 
+  `kick_return_touchdowns` bigint, 
+  `punt_returns` bigint, 
+  `punt_return_yards` bigint, 
+  `punt_return_touchdowns` bigint, 
+  `field_goals_made` bigint, 
+  `field_goals_attempted` bigint, 
+  `field_goal_long` bigint, 
+  `extra_points_made` bigint, 
+  `extra_points_attempted` bigint, 
+  `kicking_points` bigint, 
+  `punts` bigint, 
+  `punt_yards` bigint, 
+  `punts_inside_20` bigint, 
+  `punt_touchbacks` bigint, 
+  `passing_completion_pct` double, 
+  `passing_yards_per_attempt` double, 
+  `rushing_yards_per_carry` double, 
+  `receiving_yards_per_reception` double, 
+  `catch_rate` double, 
+  `field_goal_pct` double)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/derived/player_season_stats/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'derived_from'='player_stats')
+
+--- Sample queries for player_season_stats
+--- --------------------------------------------------------
+
+--- How many touchdowns has Tom Brady had by nfl season
+select nfl_season, team_abbreviation, passing_touchdowns
+from nfl_stats_database.player_season_stats
+where lower(athlete_name) = 'tom brady'
+order by nfl_season
+
+--- Top 5 passers by yardage in 2015
+select athlete_name, team_abbreviation, passing_yards, passing_touchdowns, passing_completion_pct
+from nfl_stats_database.player_season_stats
+where nfl_season = '2015'
+order by passing_yards desc
+limit 5
@@ -54,7 +54,7 @@ from nfl_stats_database.player_stats
 --- Sample queries for player_stats
 --- --------------------------------------------------------
 
--- How many touchdowns has Tom Brady had by nfl season
+-- How many touchdowns has Tom Brady had by nfl season (reads every season: run with allow_full_scan = true)
 select 
 athlete_name
 ,team_abbreviation
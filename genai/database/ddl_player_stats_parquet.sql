@@ -0,0 +1,28 @@
+--- Table: player_stats_parquet
+--- Parquet copy of player_stats (generated by convert_to_parquet.py - do not edit)
+--- Same columns as player_stats; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `player_stats_parquet`(
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `team_abbreviation` string, 
+  `team_id` bigint, 
+  `athlete_id` bigint, 
+  `athlete_name` string, 
+  `athlete_first` string, 
+  `athlete_last` string, 
+  `stat_type` string, 
+  `stat_label` string, 
+  `stat_description` string, 
+  `stat_value` string, 
+  `stat_value_num` double, 
+  `athlete_jersey` string)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/player_stats/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='player_stats')
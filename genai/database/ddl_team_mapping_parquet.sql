@@ -0,0 +1,14 @@
+--- Table: team_mapping_parquet
+--- Parquet copy of team_mapping (generated by convert_to_parquet.py - do not edit)
+--- Same columns as team_mapping; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `team_mapping_parquet`(
+  `col0` string, 
+  `col1` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/team_mapping/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='team_mapping')
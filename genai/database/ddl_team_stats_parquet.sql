@@ -0,0 +1,22 @@
+--- Table: team_stats_parquet
+--- Parquet copy of team_stats (generated by convert_to_parquet.py - do not edit)
+--- Same columns as team_stats; *_num columns are TRY_CAST numeric versions of string columns
+--- --------------------------------------------------------
+CREATE EXTERNAL TABLE `team_stats_parquet`(
+  `espn_id` bigint, 
+  `unique_id` string, 
+  `team_abbreviation` string, 
+  `team_id` bigint, 
+  `label` string, 
+  `name` string, 
+  `value` double, 
+  `display` string)
+PARTITIONED BY ( 
+  `nfl_season` string)
+STORED AS PARQUET
+LOCATION
+  's3://alt-nfl-database/parquet/team_stats/'
+TBLPROPERTIES (
+  'classification'='parquet', 
+  'parquet.compression'='SNAPPY', 
+  'source_table'='team_stats')
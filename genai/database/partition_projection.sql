@@ -0,0 +1,150 @@
+--- Partition projection for nfl_season-partitioned tables
+--- Generated by partition_projection.py - do not edit
+--- Validate first: uv run partition_projection.py validate
+--- NOTE: stop NFL-DB-Crawler from updating these tables (or set its schema change
+---       policy to log only) so it does not overwrite the projection properties
+--- --------------------------------------------------------
+
+ALTER TABLE nfl_stats_database.drive_report SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/drive_report/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.drive_report_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/drive_report/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_passing SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/pbp_stats_passing/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_passing_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/pbp_stats_passing/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_receiving SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/pbp_stats_receiving/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_receiving_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/pbp_stats_receiving/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_rushing SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/pbp_stats_rushing/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.pbp_stats_rushing_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/pbp_stats_rushing/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.play_by_play SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/play_by_play/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.play_by_play_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/play_by_play/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.player_game_stats SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/derived/player_game_stats/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.player_season_stats SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/derived/player_season_stats/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.player_stats SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/player_stats/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.player_stats_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/player_stats/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.team_stats SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/team_stats/nfl_season=${nfl_season}/');
+
+ALTER TABLE nfl_stats_database.team_stats_parquet SET TBLPROPERTIES (
+  'projection.enabled'='true',
+  'projection.nfl_season.type'='date',
+  'projection.nfl_season.format'='yyyy',
+  'projection.nfl_season.range'='2004,NOW',
+  'projection.nfl_season.interval'='1',
+  'projection.nfl_season.interval.unit'='YEARS',
+  'storage.location.template'='s3://alt-nfl-database/parquet/team_stats/nfl_season=${nfl_season}/');
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Build the wide player tables (player_game_stats, player_season_stats) from player_stats.
+
+Usage (from the genai directory):
+    uv run materialize_player_stats.py ddl                      # write database/ddl_player_*_stats.sql
+    uv run materialize_player_stats.py sql [--season 2025]
+    AWS_PROFILE=nfl uv run materialize_player_stats.py create   # first build: CTAS over every season
+    AWS_PROFILE=nfl uv run materialize_player_stats.py refresh [--season 2025 ...]
+    uv run materialize_player_stats.py local [--season 2025 | --all]
+    AWS_PROFILE=nfl uv run materialize_player_stats.py coverage
+
+`refresh` rebuilds only the given nfl_season partitions (default: the current
+season) - the game table first, then the season table from it. `local` does
+the same with DuckDB over the local mirror (`sync_local_mirror.py --table
+player_stats` first). `coverage` lists the stat_type/stat_label pairs in
+player_stats and whether they are pivoted into a column.
+"""
+
+import argparse
+
+import boto3
+
+from convert_to_parquet import run_statement
+from nfl_athena.cost import LAST_SEASON
+from nfl_athena.player_pivot import (
+    GAME_TABLE, SEASON_TABLE, coverage_sql, ctas_statement, partition_prefix, refresh_statements, write_derived_ddls
+)
+
+TABLES = (GAME_TABLE, SEASON_TABLE)  # the season table is built from the game table
+
+
+def statements_for(seasons=None):
+    """Yield (table, statement, season) in the order they must run."""
+    for table in TABLES:
+        if not seasons:
+            yield table, ctas_statement(table), None
+            continue
+        for season in seasons:
+            for statement in refresh_statements(table, season):
+                yield table, statement, season
+
+
+def delete_partition(s3_client, table, season):
+    """Remove a partition's Parquet files so INSERT INTO does not duplicate rows."""
+    bucket, prefix = partition_prefix(table, season)
+    paginator = s3_client.get_paginator('list_objects_v2')
+    deleted = 0
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+        if keys:
+            s3_client.delete_objects(Bucket=bucket, Delete={'Objects': keys})
+            deleted += len(keys)
+    return deleted
+
+
+def run(seasons=None):
+    athena_client = boto3.client('athena', region_name='us-east-1')
+    s3_client = boto3.client('s3', region_name='us-east-1')
+    cleared = set()
+    for table, statement, season in statements_for(seasons):
+        if season and (table, season) not in cleared:
+            deleted = delete_partition(s3_client, table, season)
+            cleared.add((table, season))
+            print(f"🔧 {table} nfl_season={season}: removed {deleted} old objects")
+        label = f"{table} nfl_season={season}" if season else table
+        execution = run_statement(athena_client, statement)
+        state = execution['Status']['State']
+        scanned = execution.get('Statistics', {}).get('DataScannedInBytes', 0)
+        if state != 'SUCCEEDED':
+            print(f"❌ {label}: {state} - {execution['Status'].get('StateChangeReason', '')}")
+            return
+        if statement.startswith(('CREATE', 'INSERT')):
+            print(f"✅ {label}: scanned {scanned / 1024 / 1024:.1f} MB")
+
+
+def coverage():
+    athena_client = boto3.client('athena', region_name='us-east-1')
+    execution = run_statement(athena_client, coverage_sql())
+    if execution['Status']['State'] != 'SUCCEEDED':
+        print(f"❌ {execution['Status'].get('StateChangeReason', '')}")
+        return
+    paginator = athena_client.get_paginator('get_query_results')
+    header = True
+    for page in paginator.paginate(QueryExecutionId=execution['QueryExecutionId']):
+        for row in page['ResultSet']['Rows']:
+            values = [d.get('VarCharValue', '') for d in row['Data']]
+            if header:
+                header = False
+                continue
+            stat_type, stat_label, description, row_count, pivoted = values
+            mark = '✅' if pivoted == 'true' else '⚠️ '
+            print(f"{mark} {stat_type:<14} {stat_label:<10} {row_count:>9}  {description}")
+
+
+def local(seasons=None):
+    from nfl_athena.local_engine import LocalEngine, mirror_status
+    from nfl_athena.player_pivot import materialize_local
+
+    if mirror_status('player_stats') is None:
+        print("❌ player_stats is not mirrored - run: uv run sync_local_mirror.py --table player_stats")
+        return
+    written = materialize_local(LocalEngine(), seasons)
+    for table, rows in written.items():
+        print(f"✅ {table}: {rows:,} rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['ddl', 'sql', 'create', 'refresh', 'local', 'coverage'])
+    parser.add_argument('--season', action='append', help='nfl_season to rebuild (repeatable, default: current season)')
+    parser.add_argument('--all', action='store_true', help='local: rebuild every season in the mirror')
+    args = parser.parse_args()
+    seasons = args.season or [str(LAST_SEASON)]
+
+    if args.command == 'ddl':
+        for path in write_derived_ddls():
+            print(f"✅ Wrote {path}")
+    elif args.command == 'sql':
+        for _, statement, _ in statements_for(args.season):
+            print(f"{statement};\n")
+    elif args.command == 'create':
+        run()
+    elif args.command == 'refresh':
+        run(seasons)
+    elif args.command == 'local':
+        local(None if args.all else seasons)
+    else:
+        coverage()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Complexity-based model routing for `"model": "auto"`.
+
+Many requests are lookups ("show me Washington's 2024 schedule") that Nova
+Micro answers as well as Sonnet, while long recaps and multi-part analyses
+wander on Micro. `route` scores the prompt with local rules - no network, a
+few microseconds - and picks a tier:
+
+- small:  Nova Micro   (lookups, single facts)
+- medium: Nova Pro     (comparisons, aggregations, short recaps)
+- large:  Claude Sonnet 4 (multi-part analysis, long-form writing)
+
+The personality sets a floor (recaps never go to Micro). If the chosen model's
+tool loop runs past the tier's step budget, agent_config.ModelEscalationHooks
+moves the same conversation to the next tier (`next_tier`).
+
+Every decision and escalation is printed as one JSON line
+(`{"routing": {...}}`) with the features that produced it, so the rules can
+be tuned from the logs. The prompt text itself is not logged.
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+AUTO_MODEL = 'auto'
+
+TIERS = ['small', 'medium', 'large']
+TIER_MODELS = {
+    'small': os.environ.get('ROUTER_SMALL_MODEL', 'us.amazon.nova-micro-v1:0'),
+    'medium': os.environ.get('ROUTER_MEDIUM_MODEL', 'us.amazon.nova-pro-v1:0'),
+    'large': os.environ.get('ROUTER_LARGE_MODEL', 'us.anthropic.claude-sonnet-4-20250514-v1:0'),
+}
+
+# Tool calls a tier may make before the conversation moves up a tier
+STEP_BUDGETS = {
+    'small': int(os.environ.get('ROUTER_SMALL_STEP_BUDGET', 4)),
+    'medium': int(os.environ.get('ROUTER_MEDIUM_STEP_BUDGET', 10)),
+    'large': 0,  # no tier above
+}
+
+# Lowest tier per personality
+PERSONALITY_FLOOR = {
+    'nfl_game_recap': 'medium',
+}
+
+# Score thresholds: below MEDIUM_SCORE -> small, below LARGE_SCORE -> medium
+MEDIUM_SCORE = 2
+LARGE_SCORE = 5
+
+_LOOKUP_RE = re.compile(r"\b(show|list|what|when|who|where|schedule|score|result|record|roster|time|date|kickoff)\b")
+_ANALYSIS_RE = re.compile(r"\b(compare|comparison|why|analy[sz]e|analysis|trend|trends|explain|predict|"
+                          r"projection|correlat\w*|impact|efficien\w*|evaluate|breakdown|insight\w*)\b")
+_AGGREGATE_RE = re.compile(r"\b(average|avg|per game|total|most|least|best|worst|rank\w*|leaders?|top \d+|percent\w*|"
+                           r"rate|epa|sum)\b")
+_WRITING_RE = re.compile(r"\b(recap|write|story|article|narrative|summar\w*|report|preview|detailed|in-depth)\b")
+_MULTI_STEP_RE = re.compile(r"\b(and then|then|also|each|every|for all|over the last|by week|week by week|"
+                            r"game by game|season by season|across)\b")
+_SEASON_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_TEAM_CODES_RE = re.compile(r"\b(ARI|ATL|BAL|BUF|CAR|CHI|CIN|CLE|DAL|DEN|DET|GB|HOU|IND|JAX|KC|LAC|LAR|LV|MIA|MIN|NE|NO|"
+                            r"NYG|NYJ|PHI|PIT|SEA|SF|TB|TEN|WAS)\b")
+
+
+@dataclass
+class RoutingDecision:
+    tier: str
+    model: str
+    score: int
+    personality: str
+    reasons: List[str] = field(default_factory=list)
+    features: Dict[str, Any] = field(default_factory=dict)
+    escalations: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def step_budget(self) -> int:
+        return STEP_BUDGETS[self.tier]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def features(prompt: str) -> Dict[str, Any]:
+    """Cheap prompt features the rules score (also logged with the decision)"""
+    text = prompt.lower()
+    return {
+        'words': len(prompt.split()),
+        'questions': prompt.count('?'),
+        'lookup_terms': len(_LOOKUP_RE.findall(text)),
+        'analysis_terms': len(_ANALYSIS_RE.findall(text)),
+        'aggregate_terms': len(_AGGREGATE_RE.findall(text)),
+        'writing_terms': len(_WRITING_RE.findall(text)),
+        'multi_step_terms': len(_MULTI_STEP_RE.findall(text)),
+        'seasons': len(set(_SEASON_RE.findall(prompt))),
+        'teams': len(set(_TEAM_CODES_RE.findall(prompt))),
+    }
+
+
+def score(f: Dict[str, Any]) -> Tuple[int, List[str]]:
+    points, reasons = 0, []
+
+    def add(value: int, reason: str):
+        nonlocal points
+        points += value
+        reasons.append(f"{'+' if value >= 0 else ''}{value} {reason}")
+
+    if f['analysis_terms']:
+        add(2 + min(f['analysis_terms'] - 1, 2), 'analysis')
+    if f['aggregate_terms']:
+        add(1 + min(f['aggregate_terms'] - 1, 1), 'aggregation')
+    if f['writing_terms']:
+        add(3, 'long-form writing')
+    if f['multi_step_terms']:
+        add(min(f['multi_step_terms'], 2), 'multi-step')
+    if f['questions'] > 1:
+        add(min(f['questions'] - 1, 2), 'several questions')
+    if f['seasons'] > 1 or f['teams'] > 2:
+        add(1, 'several seasons/teams')
+    if f['words'] > 60:
+        add(2, 'long prompt')
+    elif f['words'] > 30:
+        add(1, 'medium prompt')
+    if f['lookup_terms'] and not (f['analysis_terms'] or f['aggregate_terms'] or f['writing_terms']) and f['words'] <= 20:
+        add(-1, 'short lookup')
+    return points, reasons
+
+
+def route(prompt: str, personality: str) -> RoutingDecision:
+    """Tier and model for a request; logs the decision"""
+    f = features(prompt or '')
+    points, reasons = score(f)
+    tier = 'small' if points < MEDIUM_SCORE else 'medium' if points < LARGE_SCORE else 'large'
+    floor = PERSONALITY_FLOOR.get(personality)
+    if floor and TIERS.index(floor) > TIERS.index(tier):
+        tier = floor
+        reasons.append(f"floor {floor} for {personality}")
+    decision = RoutingDecision(tier=tier, model=TIER_MODELS[tier], score=points, personality=personality,
+                               reasons=reasons, features=f)
+    log_decision(decision)
+    return decision
+
+
+def next_tier(decision: RoutingDecision, steps: int) -> Optional[str]:
+    """Move the decision up one tier (recording why); None when already at the top"""
+    index = TIERS.index(decision.tier)
+    if index + 1 >= len(TIERS):
+        return None
+    previous = decision.tier
+    decision.tier = TIERS[index + 1]
+    decision.model = TIER_MODELS[decision.tier]
+    decision.escalations.append({'from': previous, 'to': decision.tier, 'steps': steps})
+    log_decision(decision, event='escalation')
+    return decision.tier
+
+
+def log_decision(decision: RoutingDecision, event: str = 'decision'):
+    print(json.dumps({'routing': {'event': event, **decision.to_dict()}}, default=str))
+
+
+def main():
+    """Route prompts from the command line, e.g. when tuning the rules"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Show the routing decision for each prompt")
+    parser.add_argument('prompts', nargs='+')
+    parser.add_argument('--personality', default='basic')
+    args = parser.parse_args()
+    for prompt in args.prompts:
+        route(prompt, args.personality)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# __init__.py
+# Shared Athena helpers used by the local tools (tools/query_athena.py) and the
+# nfl-data-service Lambda. Keep these modules free of hard numpy/pandas imports
+# so they can be packaged into the Lambda as-is. Modules are imported directly.
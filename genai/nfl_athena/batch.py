@@ -0,0 +1,149 @@
+# batch.py
+"""
+Run several independent Athena statements concurrently.
+
+Comparative questions (player A vs B, season X vs Y) produce a handful of
+independent SELECTs. Submitting and polling them one at a time costs the sum
+of their latencies; here every statement is started up front (up to a
+concurrency cap) and all running executions are polled together with a single
+`batch_get_query_execution` call per round, so the batch finishes in roughly
+the time of its slowest statement.
+
+`iter_batch` yields each execution as soon as it reaches a terminal state, so
+callers can fetch and return results as they complete; `run_batch` collects
+them in input order.
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from nfl_athena.deadline import Deadline, stop_query
+
+DATABASE = 'nfl_stats_database'
+S3_OUTPUT_LOCATION = 's3://alt-nfl-bucket/athena_queries/'
+
+# Configuration (override with environment variables)
+MAX_CONCURRENCY = int(os.environ.get('ATHENA_BATCH_MAX_CONCURRENCY', 5))
+MAX_STATEMENTS = int(os.environ.get('ATHENA_BATCH_MAX_STATEMENTS', 10))
+
+TERMINAL_STATES = ('SUCCEEDED', 'FAILED', 'CANCELLED')
+_BATCH_GET_LIMIT = 50  # batch_get_query_execution accepts at most 50 ids
+_THROTTLE_CODES = ('TooManyRequestsException', 'ThrottlingException')
+
+
+def _synthetic_execution(state: str, reason: str, query_execution_id: Optional[str] = None) -> Dict[str, Any]:
+    """A QueryExecution-shaped dict for statements that never ran to completion."""
+    return {
+        'QueryExecutionId': query_execution_id,
+        'Status': {'State': state, 'StateChangeReason': reason},
+        'Statistics': {},
+    }
+
+
+def iter_batch(athena_client,
+               statements: List[str],
+               database: str = DATABASE,
+               max_concurrency: int = MAX_CONCURRENCY,
+               max_wait_time: float = 60,
+               poll_interval: float = 0.5,
+               max_poll_interval: float = 2.0,
+               output_location: str = S3_OUTPUT_LOCATION,
+               work_group: str = 'primary',
+               deadline: Optional[Deadline] = None,
+               retry: Optional[Callable[[int, Dict[str, Any]], Optional[str]]] = None
+               ) -> Iterator[Tuple[int, Dict[str, Any], float]]:
+    """
+    Start the statements and yield (index, QueryExecution, elapsed_seconds) as each finishes.
+
+    At most `max_concurrency` statements run at once; the rest start as slots
+    free up. Statements still running at `max_wait_time` (or when `deadline`
+    passes or is cancelled) are stopped and reported as CANCELLED, as are
+    statements that never got a slot.
+
+    `retry(index, execution)` is called once for a statement that FAILED; if it
+    returns SQL, that runs in the statement's place (next free slot, polled with
+    the rest) and its execution is the one yielded.
+    """
+    start = time.time()
+    batch_deadline = (deadline or Deadline()).child(max_wait_time)
+    try:
+        yield from _run(athena_client, list(statements), database, max_concurrency, poll_interval, max_poll_interval,
+                        output_location, work_group, batch_deadline, start, retry)
+    finally:
+        batch_deadline.close()
+
+
+def _run(athena_client, statements, database, max_concurrency, poll_interval, max_poll_interval,
+         output_location, work_group, batch_deadline, start, retry):
+    max_concurrency = max(1, max_concurrency)
+    pending = list(range(len(statements)))
+    running: Dict[str, int] = {}  # QueryExecutionId -> statement index
+    retried = set()
+    interval = poll_interval
+
+    # A cancelled request stops everything still running right away
+    batch_deadline.on_cancel(lambda reason: [stop_query(athena_client, qid) for qid in list(running)])
+
+    while pending or running:
+        # Fill free slots
+        while pending and len(running) < max_concurrency and not batch_deadline.expired():
+            index = pending[0]
+            try:
+                response = athena_client.start_query_execution(
+                    QueryString=statements[index],
+                    QueryExecutionContext={'Database': database},
+                    ResultConfiguration={'OutputLocation': output_location},
+                    WorkGroup=work_group
+                )
+            except Exception as e:
+                code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+                if code in _THROTTLE_CODES and running:
+                    break  # account-level limit hit - retry once something finishes
+                pending.pop(0)
+                yield index, _synthetic_execution('FAILED', f'Could not start query: {e}'), time.time() - start
+                continue
+            pending.pop(0)
+            running[response['QueryExecutionId']] = index
+
+        if not running and not batch_deadline.expired():
+            continue
+
+        if not running or not batch_deadline.wait(interval):
+            elapsed = time.time() - start
+            reason = batch_deadline.describe()
+            for query_execution_id, index in list(running.items()):
+                if not batch_deadline.cancelled:
+                    stop_query(athena_client, query_execution_id)  # cancel() already stopped these otherwise
+                yield index, _synthetic_execution('CANCELLED', f'Query {reason}', query_execution_id), elapsed
+            for index in pending:
+                yield index, _synthetic_execution('CANCELLED', f'Query not started: {reason}'), elapsed
+            return
+        interval = min(interval * 1.5, max_poll_interval)
+
+        # One round trip for every running execution
+        ids = list(running)
+        for offset in range(0, len(ids), _BATCH_GET_LIMIT):
+            response = athena_client.batch_get_query_execution(QueryExecutionIds=ids[offset:offset + _BATCH_GET_LIMIT])
+            for execution in response.get('QueryExecutions', []):
+                if execution['Status']['State'] in TERMINAL_STATES:
+                    index = running.pop(execution['QueryExecutionId'])
+                    if execution['Status']['State'] == 'FAILED' and retry and index not in retried:
+                        retried.add(index)
+                        retry_sql = retry(index, execution)
+                        if retry_sql:
+                            statements[index] = retry_sql
+                            pending.insert(0, index)  # takes the slot this execution just freed
+                            continue
+                    yield index, execution, time.time() - start
+            for unprocessed in response.get('UnprocessedQueryExecutionIds', []):
+                print(f"DEBUG: Unprocessed execution {unprocessed.get('QueryExecutionId')}: "
+                      f"{unprocessed.get('ErrorMessage')}")
+
+
+def run_batch(athena_client, statements: List[str], **kwargs) -> List[Tuple[Dict[str, Any], float]]:
+    """Run all statements and return [(QueryExecution, elapsed_seconds)] in input order."""
+    results: List[Any] = [None] * len(statements)
+    for index, execution, elapsed in iter_batch(athena_client, statements, **kwargs):
+        results[index] = (execution, elapsed)
+    return results
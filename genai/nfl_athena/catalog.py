@@ -0,0 +1,116 @@
+# catalog.py
+"""
+Table catalog built from the crawler DDLs in genai/database.
+
+Each ddl_*.sql file holds a `CREATE EXTERNAL TABLE` statement (plus sample
+queries). We only read the DDL part: columns, partition keys, S3 location and
+the crawler statistics in TBLPROPERTIES (recordCount, sizeKey, objectCount).
+"""
+
+import glob
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# genai/database when running from the repo or the agent container;
+# <zip root>/database when packaged into the nfl-data-service Lambda.
+DEFAULT_DDL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database')
+
+_CREATE_RE = re.compile(r"CREATE\s+EXTERNAL\s+TABLE\s+`?(\w+)`?\s*\(", re.IGNORECASE)
+_COLUMN_RE = re.compile(r"`(\w+)`\s+([\w<>(),:\s]+?)\s*(?:,|$)")
+_PARTITION_RE = re.compile(r"PARTITIONED\s+BY\s*\((.*?)\)", re.IGNORECASE | re.DOTALL)
+_LOCATION_RE = re.compile(r"LOCATION\s+'([^']+)'", re.IGNORECASE)
+_PROPERTIES_RE = re.compile(r"TBLPROPERTIES\s*\((.*?)\)", re.IGNORECASE | re.DOTALL)
+_PROPERTY_RE = re.compile(r"'([^']+)'\s*=\s*'([^']*)'")
+
+
+@dataclass
+class TableInfo:
+    """Schema and crawler statistics for one Athena table."""
+    name: str
+    columns: List[Tuple[str, str]]
+    partition_keys: List[Tuple[str, str]] = field(default_factory=list)
+    location: str = ''
+    properties: Dict[str, str] = field(default_factory=dict)
+    ddl_path: str = ''
+
+    @property
+    def record_count(self) -> int:
+        return int(self.properties.get('recordCount', 0))
+
+    @property
+    def size_bytes(self) -> int:
+        return int(self.properties.get('sizeKey', 0))
+
+    @property
+    def object_count(self) -> int:
+        return int(self.properties.get('objectCount', 0))
+
+    @property
+    def classification(self) -> str:
+        return self.properties.get('classification', '')
+
+    @property
+    def partition_names(self) -> List[str]:
+        return [name for name, _ in self.partition_keys]
+
+    def is_partitioned_by(self, column: str) -> bool:
+        return column in self.partition_names
+
+
+def _balanced_body(text: str, open_index: int) -> str:
+    """Return the text between the parenthesis at open_index and its match."""
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] == '(':
+            depth += 1
+        elif text[i] == ')':
+            depth -= 1
+            if depth == 0:
+                return text[open_index + 1:i]
+    return text[open_index + 1:]
+
+
+def _parse_columns(body: str) -> List[Tuple[str, str]]:
+    return [(name, col_type.strip()) for name, col_type in _COLUMN_RE.findall(body)]
+
+
+def parse_ddl(text: str, ddl_path: str = '') -> Optional[TableInfo]:
+    """Parse the first CREATE EXTERNAL TABLE statement in a DDL file."""
+    match = _CREATE_RE.search(text)
+    if not match:
+        return None
+
+    columns_body = _balanced_body(text, match.end() - 1)
+    rest = text[match.end() + len(columns_body):]
+
+    # Only look at the DDL statement itself, not the sample queries after it
+    properties_match = _PROPERTIES_RE.search(rest)
+    statement = rest[:properties_match.end()] if properties_match else rest
+
+    partition_match = _PARTITION_RE.search(statement)
+    location_match = _LOCATION_RE.search(statement)
+
+    return TableInfo(
+        name=match.group(1),
+        columns=_parse_columns(columns_body),
+        partition_keys=_parse_columns(partition_match.group(1)) if partition_match else [],
+        location=location_match.group(1) if location_match else '',
+        properties=dict(_PROPERTY_RE.findall(properties_match.group(1))) if properties_match else {},
+        ddl_path=ddl_path,
+    )
+
+
+@lru_cache(maxsize=4)
+def load_catalog(ddl_dir: Optional[str] = None) -> Dict[str, TableInfo]:
+    """Load every ddl_*.sql file into {table_name: TableInfo}."""
+    ddl_dir = ddl_dir or os.environ.get('NFL_DDL_DIR', DEFAULT_DDL_DIR)
+    catalog = {}
+    for path in sorted(glob.glob(os.path.join(ddl_dir, 'ddl_*.sql'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            table = parse_ddl(f.read(), ddl_path=path)
+        if table:
+            catalog[table.name] = table
+    return catalog
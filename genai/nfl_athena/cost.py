@@ -0,0 +1,356 @@
+# cost.py
+"""
+Pre-execution scan-cost estimation and full-scan guard for Athena queries.
+
+The crawler DDLs record the total size of each table (`sizeKey`) and the big
+tables are partitioned by `nfl_season`. Before a query is submitted we find
+the tables it reads and any `nfl_season` predicates, and estimate the bytes
+Athena will scan assuming data is spread evenly across seasons. Unpartitioned
+scans of large tables can then be rejected with a fix-it hint (the caller
+resends with `allow_full_scan` when it really needs every season) or confined
+to the most recent seasons.
+
+The estimate is deliberately simple (string-typed CSV, predicates combined as
+AND, no column pruning) - compare it against Athena's `DataScannedInBytes`
+with `compare_with_actual` to see how far off it is.
+"""
+
+import os
+import re
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from nfl_athena.catalog import TableInfo, load_catalog
+
+PARTITION_COLUMN = 'nfl_season'
+
+# Athena bills $5 per TB scanned with a 10 MB minimum per query
+PRICE_PER_TB_USD = 5.0
+MIN_BILLED_BYTES = 10 * 1024 * 1024
+
+
+def current_season(today: Optional[date] = None) -> int:
+    """NFL seasons start in September; January games belong to the previous season."""
+    today = today or date.today()
+    return today.year if today.month >= 9 else today.year - 1
+
+
+# Configuration (override with environment variables)
+SCAN_POLICY = os.environ.get('ATHENA_SCAN_POLICY', 'reject')  # reject | confine | allow
+FULL_SCAN_LIMIT_BYTES = int(os.environ.get('ATHENA_FULL_SCAN_LIMIT_BYTES', 50 * 1024 * 1024))
+DEFAULT_SEASON_WINDOW = int(os.environ.get('ATHENA_DEFAULT_SEASON_WINDOW', 3))
+FIRST_SEASON = int(os.environ.get('NFL_FIRST_SEASON', 2004))
+LAST_SEASON = int(os.environ.get('NFL_LAST_SEASON', current_season()))
+
+_KEYWORDS_AFTER_TABLE = {
+    'where', 'on', 'join', 'left', 'right', 'inner', 'outer', 'full', 'cross', 'natural',
+    'group', 'order', 'limit', 'union', 'having', 'using', 'window', 'except', 'intersect',
+    'tablesample', 'offset', 'fetch', 'unnest', 'lateral',
+}
+
+_TABLE_NAME = r'(?:[`"]?\w+[`"]?\.)?[`"]?(\w+)[`"]?'
+_TABLE_REF_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(' + _TABLE_NAME + r')(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_COMMA_REF_RE = re.compile(r'\s*,\s*(' + _TABLE_NAME + r')(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_CTE_RE = re.compile(r'(?:\bWITH|,)\s+(\w+)\s+AS\s*\(', re.IGNORECASE)
+
+_SEASON = r"(?:cast\s*\(\s*)?(?:(\w+)\.)?nfl_season(?:\s+as\s+\w+\s*\))?"
+_YEAR = r"'?(\d{4})'?"
+_COMPARE_RE = re.compile(_SEASON + r"\s*(=|>=|<=|<>|!=|>|<)\s*" + _YEAR, re.IGNORECASE)
+_IN_RE = re.compile(_SEASON + r"\s+(NOT\s+)?IN\s*\(([^)]*)\)", re.IGNORECASE)
+_BETWEEN_RE = re.compile(_SEASON + r"\s+BETWEEN\s+" + _YEAR + r"\s+AND\s+" + _YEAR, re.IGNORECASE)
+_CLAUSE_RE = re.compile(r'\b(select|from|where|on|join|group|order|having|limit|union|intersect|except|'
+                        r'case|when|then|else|end)\b', re.IGNORECASE)
+_SET_OP_RE = re.compile(r'\b(?:union|intersect|except)\b', re.IGNORECASE)
+_OR_RE = re.compile(r'\bor\b', re.IGNORECASE)
+
+
+def mask_sql(sql: str, keep_literals: bool = False) -> str:
+    """
+    Blank out comments (and string literals unless keep_literals) while keeping
+    every character position, so matches can be mapped back onto the original SQL.
+    """
+    out = list(sql)
+    i, n = 0, len(sql)
+    while i < n:
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            end = n if end == -1 else end
+            out[i:end] = ' ' * (end - i)
+            i = end
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            out[i:end] = ' ' * (end - i)
+            i = end
+        elif sql[i] == "'":
+            end = i + 1
+            while end < n:
+                if sql[end] == "'" and sql.startswith("''", end):
+                    end += 2
+                elif sql[end] == "'":
+                    break
+                else:
+                    end += 1
+            if not keep_literals:
+                out[i + 1:end] = ' ' * (end - i - 1)
+            i = end + 1
+        else:
+            i += 1
+    return ''.join(out)
+
+
+def _enclosing_groups(masked: str) -> Tuple[List[int], Dict[int, int]]:
+    """
+    For each position, the index of the innermost '(' around it (-1 at top
+    level; a parenthesis itself belongs to the outer group), plus the matching
+    ')' for each '('.
+    """
+    opens, closes, stack = [], {}, []
+    for i, char in enumerate(masked):
+        if char == ')' and stack:
+            closes[stack.pop()] = i
+        opens.append(stack[-1] if stack else -1)
+        if char == '(':
+            stack.append(i)
+    for start in stack:  # unbalanced: the group runs to the end
+        closes[start] = len(masked)
+    return opens, closes
+
+
+def _level_text(masked: str, opens: List[int], closes: Dict[int, int], group: int) -> Tuple[int, str]:
+    """(offset, text) of one group with its nested groups blanked out"""
+    start = group + 1
+    end = closes[group] if group >= 0 else len(masked)
+    return start, ''.join(c if opens[i] == group else ' ' for i, c in enumerate(masked[start:end], start))
+
+
+def _scope(masked: str, opens: List[int], closes: Dict[int, int], pos: int) -> Tuple[int, int]:
+    """The SELECT block a position belongs to: (enclosing group, set-operation branch)"""
+    group = opens[pos]
+    offset, text = _level_text(masked, opens, closes, group)
+    return group, len(_SET_OP_RE.findall(text[:pos - offset]))
+
+
+def find_table_refs(sql: str) -> List[Dict[str, Any]]:
+    """Return [{'table', 'alias', 'start', 'end', 'scope'}] for each table read in FROM/JOIN clauses."""
+    masked = mask_sql(sql)
+    opens, closes = _enclosing_groups(masked)
+    cte_names = {name.lower() for name in _CTE_RE.findall(masked)}
+    refs = []
+
+    def add(match):
+        table = match.group(2).lower()
+        alias = match.group(3)
+        end = match.end(1)
+        if alias and alias.lower() in _KEYWORDS_AFTER_TABLE:
+            alias = None
+        elif alias:
+            end = match.end(3)
+        if table not in cte_names:
+            refs.append({'table': table, 'alias': alias.lower() if alias else None,
+                         'start': match.start(1), 'end': end,
+                         'scope': _scope(masked, opens, closes, match.start(1))})
+        return end
+
+    for match in _TABLE_REF_RE.finditer(masked):
+        pos = add(match)
+        # Comma-separated tables: FROM a, b x
+        while True:
+            comma = _COMMA_REF_RE.match(masked, pos)
+            if not comma:
+                break
+            pos = add(comma)
+    return refs
+
+
+def season_universe() -> List[str]:
+    return [str(season) for season in range(FIRST_SEASON, LAST_SEASON + 1)]
+
+
+def _filter_key(masked: str, opens: List[int], closes: Dict[int, int], pos: int,
+                qualifier: Optional[str]) -> Optional[Any]:
+    """
+    Key a season predicate at `pos` narrows: its qualifier, or ('scope', scope)
+    when unqualified. None when it does not narrow anything - it is OR'd with
+    another condition (at its own level or any enclosing boolean group), or it
+    is not in a WHERE/ON/HAVING clause (e.g. a CASE in the select list).
+    """
+    while True:
+        group = opens[pos]
+        offset, text = _level_text(masked, opens, closes, group)
+        before = list(_CLAUSE_RE.finditer(text[:pos - offset]))
+        after = _CLAUSE_RE.search(text, pos - offset)
+        segment = text[before[-1].end() if before else 0:after.start() if after else len(text)]
+        if _OR_RE.search(segment):
+            return None
+        if before:
+            if before[-1].group(1).lower() not in ('where', 'on', 'having'):
+                return None
+            if qualifier:
+                return qualifier.lower()
+            return ('scope', _scope(masked, opens, closes, pos))
+        if group < 0:
+            return None
+        pos = group  # a parenthesized condition: check the enclosing one
+
+
+def find_season_filters(sql: str) -> Dict[Any, Set[str]]:
+    """
+    Map qualifier (table alias or name) or ('scope', SELECT block) for
+    unqualified predicates -> set of seasons the `nfl_season` predicates allow.
+    Predicates on the same key are intersected; OR'd predicates are ignored,
+    so the table counts as unfiltered.
+    """
+    text = mask_sql(sql, keep_literals=True)
+    masked = mask_sql(sql)
+    opens, closes = _enclosing_groups(masked)
+    universe = season_universe()
+    filters: Dict[Any, Set[str]] = {}
+
+    def narrow(match, seasons):
+        key = _filter_key(masked, opens, closes, match.start(), match.group(1))
+        if key is None:
+            return
+        current = filters.get(key)
+        filters[key] = set(seasons) if current is None else current & set(seasons)
+
+    for match in _COMPARE_RE.finditer(text):
+        _, op, year = match.groups()
+        year = int(year)
+        checks = {
+            '=': lambda s: s == year, '>=': lambda s: s >= year, '<=': lambda s: s <= year,
+            '>': lambda s: s > year, '<': lambda s: s < year,
+            '<>': lambda s: s != year, '!=': lambda s: s != year,
+        }
+        narrow(match, [s for s in universe if checks[op](int(s))])
+
+    for match in _IN_RE.finditer(text):
+        _, negated, values = match.groups()
+        listed = set(re.findall(r'\d{4}', values))
+        narrow(match, [s for s in universe if (s in listed) != bool(negated)])
+
+    for match in _BETWEEN_RE.finditer(text):
+        _, low, high = match.groups()
+        narrow(match, [s for s in universe if int(low) <= int(s) <= int(high)])
+
+    return filters
+
+
+def _seasons_for_ref(ref, filters, refs_in_scope: int) -> Optional[Set[str]]:
+    for key in (ref['alias'], ref['table']):
+        if key in filters:
+            return filters[key]
+    # An unqualified predicate only pins down the table when it is the only one in its SELECT
+    if refs_in_scope == 1:
+        return filters.get(('scope', ref['scope']))
+    return None
+
+
+def estimate_scan(sql: str, catalog: Optional[Dict[str, TableInfo]] = None) -> Dict[str, Any]:
+    """Estimate the bytes Athena will scan for a SELECT, per table and in total."""
+    catalog = load_catalog() if catalog is None else catalog
+    filters = find_season_filters(sql)
+    universe = season_universe()
+    tables, full_scans, unknown = [], [], []
+    refs = find_table_refs(sql)
+    scopes = Counter(ref['scope'] for ref in refs)
+
+    for ref in refs:
+        info = catalog.get(ref['table'])
+        if info is None or 'sizeKey' not in info.properties:
+            # Unknown table, or one without crawler statistics (e.g. the Parquet copies)
+            unknown.append(ref['table'])
+            continue
+        partitioned = info.is_partitioned_by(PARTITION_COLUMN)
+        seasons = _seasons_for_ref(ref, filters, scopes[ref['scope']]) if partitioned else None
+        fraction = len(seasons) / len(universe) if seasons is not None and universe else 1.0
+        estimated = int(info.size_bytes * fraction)
+        tables.append({
+            'table': info.name,
+            'alias': ref['alias'],
+            'partitioned': partitioned,
+            'seasons': sorted(seasons) if seasons is not None else None,
+            'table_bytes': info.size_bytes,
+            'estimated_bytes': estimated,
+            'estimated_rows': int(info.record_count * fraction),
+        })
+        if partitioned and seasons is None and info.size_bytes > FULL_SCAN_LIMIT_BYTES:
+            full_scans.append(info.name)
+
+    total = sum(t['estimated_bytes'] for t in tables)
+    billed = max(total, MIN_BILLED_BYTES)
+    return {
+        'tables': tables,
+        'unknown_tables': unknown,
+        'full_scans': full_scans,
+        'estimated_bytes': total,
+        'estimated_mb': round(total / (1024 * 1024), 2),
+        'estimated_cost_usd': round(billed / 1024 ** 4 * PRICE_PER_TB_USD, 6),
+    }
+
+
+def recent_seasons(window: int = DEFAULT_SEASON_WINDOW) -> List[str]:
+    return [str(season) for season in range(LAST_SEASON - window + 1, LAST_SEASON + 1)]
+
+
+def confine_to_seasons(sql: str, tables: List[str], seasons: List[str]) -> str:
+    """Wrap every reference to `tables` in a subquery restricted to `seasons`."""
+    predicate = f"{PARTITION_COLUMN} IN ({', '.join(repr(s) for s in seasons)})"
+    targets = {t.lower() for t in tables}
+    rewritten = sql
+    for ref in sorted(find_table_refs(sql), key=lambda r: r['start'], reverse=True):
+        if ref['table'] not in targets:
+            continue
+        original = sql[ref['start']:ref['end']]
+        name = original.split()[0]
+        alias = ref['alias'] or ref['table']
+        replacement = f"(SELECT * FROM {name} WHERE {predicate}) {alias}"
+        rewritten = rewritten[:ref['start']] + replacement + rewritten[ref['end']:]
+    return rewritten
+
+
+def guard_query(sql: str,
+                allow_full_scan: bool = False,
+                policy: Optional[str] = None,
+                catalog: Optional[Dict[str, TableInfo]] = None) -> Tuple[str, Dict[str, Any], Optional[str]]:
+    """
+    Estimate a query and apply the full-scan policy.
+
+    Returns (sql_to_run, estimate, error). error is a fix-it message when the
+    query was rejected; sql_to_run may be rewritten under the 'confine' policy.
+    """
+    policy = policy or SCAN_POLICY
+    estimate = estimate_scan(sql, catalog)
+    full_scans = estimate['full_scans']
+
+    if not full_scans or allow_full_scan or policy == 'allow':
+        return sql, estimate, None
+
+    seasons = recent_seasons()
+    if policy == 'confine':
+        confined_sql = confine_to_seasons(sql, full_scans, seasons)
+        confined = estimate_scan(confined_sql, catalog)
+        confined['confined_to_seasons'] = seasons
+        confined['original_estimated_bytes'] = estimate['estimated_bytes']
+        return confined_sql, confined, None
+
+    hint = (
+        f"Query would scan every season of {', '.join(full_scans)} "
+        f"(~{estimate['estimated_mb']} MB). If the question is about particular seasons, filter on exactly "
+        f"those (e.g. nfl_season = '{seasons[-1]}'). If it needs every season (career totals, all-time "
+        f"records, season-by-season history), resend the same SQL with allow_full_scan=true - do not "
+        f"restrict it to recent seasons, which would give a wrong answer."
+    )
+    return sql, estimate, hint
+
+
+def compare_with_actual(estimate: Dict[str, Any], actual_bytes: Optional[int]) -> Dict[str, Any]:
+    """Attach Athena's DataScannedInBytes to an estimate."""
+    if actual_bytes is None:
+        return estimate
+    estimate['actual_bytes'] = actual_bytes
+    estimate['actual_mb'] = round(actual_bytes / (1024 * 1024), 2)
+    estimate['estimate_ratio'] = round(estimate['estimated_bytes'] / actual_bytes, 3) if actual_bytes else None
+    return estimate
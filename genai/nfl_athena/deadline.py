@@ -0,0 +1,256 @@
+# deadline.py
+"""
+Request deadlines and cancellation for Athena and S3 work.
+
+A `Deadline` is created once per request - from the Lambda's remaining time
+(`Deadline.from_lambda_context`) or from the agent's request budget - and
+handed down to the code that polls Athena or reads S3:
+
+- `deadline.wait(seconds)` replaces `time.sleep` in poll loops; it wakes up
+  early when the deadline passes or the request is cancelled.
+- `deadline.child(60)` gives one query its own timeout inside the request budget.
+- `wait_for_query` polls an Athena execution and issues `stop_query_execution`
+  when the deadline passes or the caller cancels, so abandoned queries stop
+  running (and billing) instead of finishing in the background.
+- `wait_async` / `wait_for_query_async` do the same from a coroutine, sleeping
+  on the event loop instead of holding a thread between polls.
+
+In the agent the active deadline lives in a context variable (`deadline_scope`),
+which asyncio tasks and `asyncio.to_thread` tool calls inherit, so tools can
+find it with `current_deadline()` without changing their signatures. When the
+client disconnects, the scope cancels the deadline and every registered
+`on_cancel` callback (e.g. stopping an in-flight Athena query) runs at once.
+"""
+
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from nfl_athena.tracing import span
+
+# Seconds kept back from the Lambda timeout to stop queries and build the response
+LAMBDA_MARGIN_SECONDS = float(os.environ.get('LAMBDA_DEADLINE_MARGIN_SECONDS', 3))
+
+
+class Deadline:
+    """A point in time after which work should stop, plus an explicit cancel switch."""
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional['Deadline'] = None):
+        if parent is not None and not math.isinf(parent.remaining()):
+            seconds = parent.remaining() if seconds is None else min(seconds, parent.remaining())
+        self.budget = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + max(0.0, seconds)
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: Dict[int, Callable[[str], Any]] = {}
+        self._next_handle = 0
+        self._parent = parent
+        self._parent_handle = parent.on_cancel(self.cancel) if parent is not None else None
+
+    @classmethod
+    def from_lambda_context(cls, context, margin: float = LAMBDA_MARGIN_SECONDS) -> 'Deadline':
+        """Deadline ending `margin` seconds before the Lambda invocation times out."""
+        if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+            return cls()
+        return cls(max(0.0, context.get_remaining_time_in_millis() / 1000 - margin))
+
+    def child(self, seconds: Optional[float] = None) -> 'Deadline':
+        """A shorter deadline that is also cancelled when this one is."""
+        return Deadline(seconds, parent=self)
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def expired(self) -> bool:
+        return self.cancelled or self.remaining() <= 0
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`; returns False if the deadline passed or was cancelled."""
+        self._event.wait(min(seconds, self.remaining()))
+        return not self.expired()
+
+    async def wait_async(self, seconds: float) -> bool:
+        """`wait` for coroutines: sleeps on the event loop instead of blocking a thread."""
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+        handle = self.on_cancel(lambda reason: loop.call_soon_threadsafe(woken.set))
+        try:
+            await asyncio.wait_for(woken.wait(), min(seconds, self.remaining()))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.remove(handle)
+        return not self.expired()
+
+    def cancel(self, reason: str = 'cancelled'):
+        """Cancel the deadline and run the on_cancel callbacks (once)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                print(f"DEBUG: Cancel callback failed: {e}")
+
+    def on_cancel(self, callback: Callable[[str], Any]) -> Optional[int]:
+        """Register callback(reason); runs immediately if already cancelled."""
+        with self._lock:
+            if not self._event.is_set():
+                handle = self._next_handle
+                self._next_handle += 1
+                self._callbacks[handle] = callback
+                return handle
+        callback(self.reason)
+        return None
+
+    def remove(self, handle: Optional[int]):
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def close(self):
+        """Detach a child deadline from its parent once its work is finished."""
+        if self._parent is not None:
+            self._parent.remove(self._parent_handle)
+
+    def describe(self) -> str:
+        if self.cancelled:
+            return f'cancelled: {self.reason}'
+        if self.budget is not None:
+            return f"timed out after {round(self.budget) if self.budget >= 10 else round(self.budget, 1)} seconds"
+        return 'timed out'
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar('nfl_deadline', default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The deadline of the request being served, if any."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline):
+    """
+    Make `deadline` current for the enclosed work. If the enclosing generator is
+    closed (client disconnect) or its task is cancelled, the deadline is
+    cancelled so in-flight tool work stops too.
+    """
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    except (GeneratorExit, asyncio.CancelledError):
+        deadline.cancel('client disconnected')
+        raise
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            pass  # generator finalized from a different context
+
+
+def stop_query(athena_client, query_execution_id: str):
+    try:
+        athena_client.stop_query_execution(QueryExecutionId=query_execution_id)
+        print(f"DEBUG: Stopped Athena query {query_execution_id}")
+    except Exception as e:
+        print(f"DEBUG: Could not stop {query_execution_id}: {e}")
+
+
+def wait_for_query(athena_client,
+                   query_execution_id: str,
+                   deadline: Deadline,
+                   poll_interval: float = 2.0,
+                   stop_on_deadline: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Poll a query until it finishes or the deadline ends.
+
+    Returns (get_query_execution response, error). The response is None when
+    the query was stopped because the deadline passed or was cancelled. With
+    stop_on_deadline=False (long-polling a submitted query) the query keeps
+    running and the last, still running, response is returned without an error.
+    """
+    with span('athena.wait', query_execution_id=query_execution_id) as trace_span:
+        response, error = _poll_query(athena_client, query_execution_id, deadline, poll_interval,
+                                      stop_on_deadline, trace_span)
+        if response is not None:
+            trace_span.set(state=response['QueryExecution']['Status']['State'])
+        if error:
+            trace_span.set(failure=error)
+        return response, error
+
+
+def _poll_query(athena_client, query_execution_id, deadline, poll_interval, stop_on_deadline, trace_span):
+    handle = None
+    if stop_on_deadline:
+        handle = deadline.on_cancel(lambda reason: stop_query(athena_client, query_execution_id))
+    try:
+        polls = 0
+        while True:
+            polls += 1
+            trace_span.set(polls=polls)
+            response = athena_client.get_query_execution(QueryExecutionId=query_execution_id)
+            status = response['QueryExecution']['Status']
+            if status['State'] == 'SUCCEEDED':
+                return response, None
+            if status['State'] in ('FAILED', 'CANCELLED'):
+                if deadline.cancelled:
+                    return None, f'Query {deadline.describe()}'
+                return response, f"Query failed: {status.get('StateChangeReason', 'Unknown error')}"
+            if not deadline.wait(poll_interval):
+                if not stop_on_deadline:
+                    return response, None
+                if not deadline.cancelled:
+                    stop_query(athena_client, query_execution_id)  # cancel() already stopped it otherwise
+                return None, f'Query {deadline.describe()}'
+    finally:
+        deadline.remove(handle)
+
+
+async def wait_for_query_async(athena_client,
+                               query_execution_id: str,
+                               deadline: Deadline,
+                               poll_interval: float = 2.0,
+                               stop_on_deadline: bool = True,
+                               run_sync: Callable[..., Awaitable[Any]] = asyncio.to_thread
+                               ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    `wait_for_query` for coroutines. Only the short boto3 calls run on a thread
+    (`run_sync`); the waits between polls sleep on the event loop.
+    """
+    with span('athena.wait', query_execution_id=query_execution_id, mode='async') as trace_span:
+        polls = 0
+        while True:
+            polls += 1
+            trace_span.set(polls=polls)
+            response = await run_sync(athena_client.get_query_execution, QueryExecutionId=query_execution_id)
+            status = response['QueryExecution']['Status']
+            trace_span.set(state=status['State'])
+            if status['State'] == 'SUCCEEDED':
+                return response, None
+            if status['State'] in ('FAILED', 'CANCELLED'):
+                if deadline.cancelled:
+                    return None, f'Query {deadline.describe()}'
+                return response, f"Query failed: {status.get('StateChangeReason', 'Unknown error')}"
+            if not await deadline.wait_async(poll_interval):
+                if not stop_on_deadline:
+                    return response, None
+                await run_sync(stop_query, athena_client, query_execution_id)  # also after a cancel
+                trace_span.set(failure=f'Query {deadline.describe()}')
+                return None, f'Query {deadline.describe()}'
@@ -0,0 +1,334 @@
+# local_engine.py
+"""
+Embedded DuckDB engine over a local mirror of s3://alt-nfl-database/.
+
+The small tables (team_mapping is 40 rows, clean_schedule ~4k) still pay a
+full Athena round trip of 2+ seconds. Here every table described in
+genai/database is registered as a DuckDB view over the mirrored files, and
+`execute_local` answers a query locally when every table it reads is mirrored
+(or small enough to mirror on demand). Anything else goes to Athena.
+
+Mirror layout: <LOCAL_MIRROR_DIR>/<bucket>/<key>, e.g.
+    ~/.nfl-mirror/alt-nfl-database/player_stats/nfl_season=2024/part-0.csv
+A table counts as mirrored once `sync_table` has written its marker in
+<LOCAL_MIRROR_DIR>/.synced/<table>.json, so a half-copied table is never used.
+
+Modes (LOCAL_ENGINE_MODE):
+    auto     small/mirrored tables run locally, the rest on Athena (default)
+    off      always Athena
+    offline  never call AWS; queries over tables that are not mirrored fail
+
+The views mimic Athena's CSV SerDe: columns are read as text and cast with
+TRY_CAST, so unparseable values become NULL instead of failing the query.
+
+Dialect: every cursor runs with `integer_division = true`, so `7/2` is 3 (as
+in Athena) rather than DuckDB's 3.5; decimal and double division are the
+same in both. Known remaining differences - division by zero returns NULL
+instead of failing, and Presto-only functions (e.g. `date_parse`) fail
+locally and fall back to Athena. tests/test_local_engine.py covers these.
+
+DuckDB is an optional dependency - without it everything goes to Athena. It
+is not in pyproject.toml/uv.lock, so the agent container always uses Athena;
+the local engine is for development (`uv pip install duckdb`) and for
+Lambda packages that bundle it.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from nfl_athena.catalog import TableInfo, load_catalog
+from nfl_athena.cost import find_table_refs
+from nfl_athena.results import Column, ColumnarResult
+
+try:
+    import duckdb
+except ImportError:  # optional: the Lambda/agent still work through Athena
+    duckdb = None
+
+DATABASE = 'nfl_stats_database'
+
+# Configuration (override with environment variables)
+_IN_LAMBDA = bool(os.environ.get('AWS_LAMBDA_FUNCTION_NAME'))
+LOCAL_ENGINE_MODE = os.environ.get('LOCAL_ENGINE_MODE', 'auto')  # auto | off | offline
+LOCAL_MIRROR_DIR = os.environ.get(
+    'LOCAL_MIRROR_DIR', '/tmp/nfl-mirror' if _IN_LAMBDA else os.path.expanduser('~/.nfl-mirror'))
+# Tables up to this size (crawler sizeKey) are mirrored on first use
+LOCAL_MAX_BYTES = int(os.environ.get('LOCAL_MAX_BYTES', 2 * 1024 * 1024))
+LOCAL_SYNC_ON_DEMAND = os.environ.get('LOCAL_SYNC_ON_DEMAND', 'true').lower() == 'true'
+# On-demand mirrors are refreshed after this many seconds (0 = never)
+LOCAL_SYNC_TTL = int(os.environ.get('LOCAL_SYNC_TTL', 3600))
+
+_DUCKDB_TYPES = {
+    'string': 'VARCHAR', 'varchar': 'VARCHAR', 'char': 'VARCHAR',
+    'bigint': 'BIGINT', 'int': 'INTEGER', 'integer': 'INTEGER', 'smallint': 'SMALLINT', 'tinyint': 'TINYINT',
+    'double': 'DOUBLE', 'float': 'FLOAT', 'real': 'FLOAT',
+    'boolean': 'BOOLEAN', 'date': 'DATE', 'timestamp': 'TIMESTAMP',
+}
+
+# DuckDB result type -> Athena type name understood by results.column_kind
+_ATHENA_TYPES = {
+    'TINYINT': 'tinyint', 'SMALLINT': 'smallint', 'INTEGER': 'integer', 'BIGINT': 'bigint',
+    'UTINYINT': 'integer', 'USMALLINT': 'integer', 'UINTEGER': 'bigint',
+    'FLOAT': 'float', 'DOUBLE': 'double', 'BOOLEAN': 'boolean', 'DATE': 'date', 'TIMESTAMP': 'timestamp',
+    'TIMESTAMP WITH TIME ZONE': 'timestamp with time zone',
+}
+
+
+def available() -> bool:
+    return duckdb is not None
+
+
+def local_path(location: str, mirror_dir: Optional[str] = None) -> str:
+    return os.path.join(mirror_dir or LOCAL_MIRROR_DIR, location[len('s3://'):].strip('/'))
+
+
+def _marker_path(table_name: str, mirror_dir: Optional[str] = None) -> str:
+    return os.path.join(mirror_dir or LOCAL_MIRROR_DIR, '.synced', f'{table_name}.json')
+
+
+def mirror_status(table_name: str, mirror_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The sync marker for a table, or None if it was never fully mirrored."""
+    try:
+        with open(_marker_path(table_name, mirror_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+_sync_locks: Dict[str, threading.RLock] = {}
+_sync_locks_guard = threading.Lock()
+
+
+def table_sync_lock(table_name: str) -> threading.RLock:
+    """Serializes syncs of one table (batch queries and the tool pool can ask at once)"""
+    with _sync_locks_guard:
+        return _sync_locks.setdefault(table_name, threading.RLock())
+
+
+def sync_table(table: TableInfo, s3_client, mirror_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Download every object under the table's S3 location into the mirror."""
+    bucket, _, prefix = table.location[len('s3://'):].partition('/')
+    target = local_path(table.location, mirror_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    with table_sync_lock(table.name):
+        # A private staging dir next to the target, so concurrent processes never share one
+        staging = tempfile.mkdtemp(prefix=f'.{os.path.basename(target.rstrip("/"))}.', dir=os.path.dirname(target))
+        try:
+            objects, total_bytes = 0, 0
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    relative = obj['Key'][len(prefix):].lstrip('/')
+                    if not relative or relative.endswith('/') or relative.endswith('_$folder$'):
+                        continue
+                    path = os.path.join(staging, relative)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    s3_client.download_file(bucket, obj['Key'], path)
+                    objects += 1
+                    total_bytes += obj['Size']
+
+            # Swap the finished copy into place, then write the marker
+            shutil.rmtree(target, ignore_errors=True)
+            if objects:
+                os.rename(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return mark_mirrored(table.name, {'objects': objects, 'bytes': total_bytes}, mirror_dir)
+
+
+def mark_mirrored(table_name: str, details: Dict[str, Any], mirror_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Write the sync marker for a table whose files are complete in the mirror."""
+    status = {'table': table_name, **details, 'synced_at': time.time()}
+    marker = _marker_path(table_name, mirror_dir)
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(status, f)
+    return status
+
+
+def _view_sql(table: TableInfo, mirror_dir: Optional[str] = None) -> str:
+    """CREATE VIEW statement reading the mirrored files the way Athena does."""
+    path = local_path(table.location, mirror_dir).replace("'", "''")
+    partitioned = bool(table.partition_keys)
+    hive = f", hive_partitioning = {'true' if partitioned else 'false'}, hive_types_autocast = false"
+
+    if table.classification == 'parquet':
+        source = f"read_parquet('{path}/**/*'{hive}, union_by_name = true)"
+        return f'CREATE OR REPLACE VIEW {DATABASE}."{table.name}" AS SELECT * FROM {source}'
+
+    delimiter = table.properties.get('delimiter', ',').replace("'", "''")
+    header = 'true' if int(table.properties.get('skip.header.line.count', 0)) else 'false'
+    text_columns = ', '.join(f"'{name}': 'VARCHAR'" for name, _ in table.columns)
+    source = (
+        f"read_csv('{path}/**/*', columns = {{{text_columns}}}, header = {header}, "
+        f"delim = '{delimiter}', quote = '', escape = '', auto_detect = false, "
+        f"null_padding = true{hive})"
+    )
+    selects = []
+    for name, athena_type in table.columns:
+        duck_type = _DUCKDB_TYPES.get(athena_type.lower().split('(')[0], 'VARCHAR')
+        selects.append(f'"{name}"' if duck_type == 'VARCHAR' else f'TRY_CAST("{name}" AS {duck_type}) AS "{name}"')
+    selects += [f'"{name}"' for name in table.partition_names]
+    return f'CREATE OR REPLACE VIEW {DATABASE}."{table.name}" AS SELECT {", ".join(selects)} FROM {source}'
+
+
+class LocalEngine:
+    """DuckDB connection with views for the mirrored nfl_stats_database tables."""
+
+    def __init__(self, catalog: Optional[Dict[str, TableInfo]] = None, mirror_dir: Optional[str] = None):
+        if duckdb is None:
+            raise RuntimeError("duckdb is not installed")
+        self.catalog = load_catalog() if catalog is None else catalog
+        self.mirror_dir = mirror_dir or LOCAL_MIRROR_DIR
+        self.connection = duckdb.connect(database=':memory:')
+        self.connection.execute(f'CREATE SCHEMA IF NOT EXISTS {DATABASE}')
+        self.connection.execute(f"SET schema = '{DATABASE}'")
+        self._registered = set()
+        self._lock = threading.Lock()
+
+    def register(self, table_name: str):
+        """(Re)create the view for a mirrored table."""
+        table = self.catalog[table_name]
+        with self._lock:
+            if os.path.isdir(local_path(table.location, self.mirror_dir)):
+                self.connection.execute(_view_sql(table, self.mirror_dir))
+            else:
+                # Mirrored but empty: an empty relation with the right columns
+                columns = ', '.join(f'NULL::VARCHAR AS "{name}"'
+                                    for name, _ in table.columns + table.partition_keys)
+                self.connection.execute(
+                    f'CREATE OR REPLACE VIEW {DATABASE}."{table.name}" AS SELECT {columns} LIMIT 0')
+            self._registered.add(table_name)
+
+    def execute(self, sql: str) -> ColumnarResult:
+        """Run a query and return it in the same typed columnar form as Athena results."""
+        cursor = self.connection.cursor()
+        try:
+            # Cursors don't inherit the connection's settings
+            cursor.execute(f"SET schema = '{DATABASE}'")
+            cursor.execute("SET integer_division = true")  # Athena: 7/2 = 3
+            relation = cursor.sql(sql)
+            if relation is None:
+                return ColumnarResult([])
+            names, types = relation.columns, [str(t) for t in relation.types]
+            rows = relation.fetchall()
+        finally:
+            cursor.close()
+
+        columns = []
+        for index, (name, duck_type) in enumerate(zip(names, types)):
+            column = Column(name, _ATHENA_TYPES.get(duck_type, 'varchar'))
+            values = [row[index] for row in rows]
+            if column.kind == 'string':
+                values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+            column.extend_values(values)
+            columns.append(column)
+        return ColumnarResult(columns)
+
+
+_engine: Optional[LocalEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> LocalEngine:
+    """Process-wide engine (kept warm across Lambda invocations)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalEngine()
+        return _engine
+
+
+def _is_fresh(status: Optional[Dict[str, Any]], offline: bool) -> bool:
+    if status is None:
+        return False
+    if offline or not LOCAL_SYNC_TTL:
+        return True
+    return time.time() - status.get('synced_at', 0) < LOCAL_SYNC_TTL
+
+
+def plan_query(sql: str,
+               mode: Optional[str] = None,
+               catalog: Optional[Dict[str, TableInfo]] = None) -> Dict[str, Any]:
+    """
+    Decide where a query runs.
+
+    Returns {'engine': 'local' | 'athena', 'tables', 'sync', 'reason'} where
+    `sync` lists small tables that must be mirrored before running locally.
+    In offline mode a query that cannot run locally gets engine 'none'.
+    """
+    mode = mode or LOCAL_ENGINE_MODE
+    offline = mode == 'offline'
+    catalog = load_catalog() if catalog is None else catalog
+    tables = sorted({ref['table'] for ref in find_table_refs(sql)})
+    fallback = 'none' if offline else 'athena'
+
+    if mode == 'off':
+        return {'engine': 'athena', 'tables': tables, 'sync': [], 'reason': 'local engine disabled'}
+    if duckdb is None:
+        return {'engine': fallback, 'tables': tables, 'sync': [], 'reason': 'duckdb is not installed'}
+
+    sync = []
+    for name in tables:
+        table = catalog.get(name)
+        if table is None:
+            return {'engine': fallback, 'tables': tables, 'sync': [], 'reason': f'unknown table {name}'}
+        if _is_fresh(mirror_status(name), offline):
+            continue
+        if not offline and LOCAL_SYNC_ON_DEMAND and table.size_bytes and table.size_bytes <= LOCAL_MAX_BYTES:
+            sync.append(name)
+            continue
+        return {'engine': fallback, 'tables': tables, 'sync': [], 'reason': f'{name} is not mirrored locally'}
+    return {'engine': 'local', 'tables': tables, 'sync': sync, 'reason': 'all tables available locally'}
+
+
+def execute_local(sql: str,
+                  mode: Optional[str] = None,
+                  s3_client_factory=None) -> Tuple[Optional[ColumnarResult], Dict[str, Any]]:
+    """
+    Try to answer a query with the local engine.
+
+    Returns (result, route). result is None when the query should go to
+    Athena; route['error'] is set when it failed locally in offline mode.
+    s3_client_factory builds the S3 client for on-demand mirroring (default boto3.client('s3')).
+    """
+    start = time.perf_counter()
+    route = plan_query(sql, mode)
+    if route['engine'] != 'local':
+        if route['engine'] == 'none':
+            route['error'] = f"Offline mode: {route['reason']}"
+        return None, route
+
+    try:
+        engine = get_engine()
+        if route['sync']:
+            if s3_client_factory is None:
+                import boto3
+                s3_client_factory = lambda: boto3.client('s3')
+            s3_client = s3_client_factory()
+            for name in route['sync']:
+                with table_sync_lock(name):
+                    # Another thread may have mirrored it while we waited
+                    if not _is_fresh(mirror_status(name, engine.mirror_dir), False):
+                        sync_table(engine.catalog[name], s3_client, engine.mirror_dir)
+        for name in route['tables']:
+            if name in route['sync'] or name not in engine._registered:
+                engine.register(name)
+        result = engine.execute(sql)
+    except Exception as e:
+        # Dialect differences, sync errors, ... - Athena gets the query instead
+        route['engine'] = 'none' if (mode or LOCAL_ENGINE_MODE) == 'offline' else 'athena'
+        route['reason'] = f'local execution failed: {e}'
+        if route['engine'] == 'none':
+            route['error'] = f"Offline mode: {route['reason']}"
+        print(f"DEBUG: Local engine fallback: {e}")
+        return None, route
+
+    route['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result, route
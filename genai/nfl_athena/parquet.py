@@ -0,0 +1,215 @@
+# parquet.py
+"""
+Parquet copies of the crawler-generated CSV tables, and the query router that uses them.
+
+Every table in genai/database is a CSV table (TextInputFormat, mostly string
+columns), so each query scans and parses raw text. This module generates:
+
+- CTAS statements that write partitioned, Snappy-compressed Parquet copies
+  (`<table>_parquet` under s3://alt-nfl-database/parquet/<table>/)
+- INSERT INTO statements to append a single new `nfl_season` partition
+- `ddl_<table>_parquet.sql` files for genai/database, so the catalog and the
+  analyst prompts know about the Parquet tables
+
+The Parquet tables keep every original column with its original type, so SQL
+written against the CSV tables (e.g. `throw_yards <> 'NA'`) still works after
+routing. Columns that hold numbers in strings also get a typed companion column
+(`stat_value_num`, `throw_yards_num`, ...) computed with TRY_CAST.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from nfl_athena.catalog import DEFAULT_DDL_DIR, TableInfo, load_catalog
+from nfl_athena.cost import find_table_refs
+
+DATABASE = 'nfl_stats_database'
+PARQUET_SUFFIX = '_parquet'
+PARQUET_ROOT = 's3://alt-nfl-database/parquet'
+COMPRESSION = 'SNAPPY'
+
+# Route queries to the Parquet tables (set once the CTAS jobs have run)
+ROUTING_ENABLED = os.environ.get('ATHENA_PARQUET_ROUTING', 'false').lower() in ('1', 'true', 'yes')
+
+# String columns that hold numbers: source column -> (typed column, Athena type)
+TYPED_COLUMNS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    'player_stats': {'stat_value': ('stat_value_num', 'double')},
+    'play_by_play': {
+        'espn_id': ('espn_id_num', 'bigint'),
+        'sequence': ('sequence_num', 'bigint'),
+        'yardage': ('yardage_num', 'bigint'),
+        'quarter': ('quarter_num', 'bigint'),
+        'home_score': ('home_score_num', 'bigint'),
+    },
+    'pbp_stats_passing': {
+        'down': ('down_num', 'bigint'),
+        'air_yards': ('air_yards_num', 'double'),
+        'throw_yards': ('throw_yards_num', 'double'),
+    },
+    'pbp_stats_receiving': {
+        'down': ('down_num', 'bigint'),
+        'air_yards': ('air_yards_num', 'double'),
+        'throw_yards': ('throw_yards_num', 'double'),
+    },
+    'pbp_stats_rushing': {'down': ('down_num', 'bigint')},
+    'drive_report': {
+        'team_id': ('team_id_num', 'bigint'),
+        'end_yard': ('end_yard_num', 'bigint'),
+    },
+}
+
+
+def parquet_name(table: str) -> str:
+    return f"{table}{PARQUET_SUFFIX}"
+
+
+def parquet_location(table: str) -> str:
+    return f"{PARQUET_ROOT}/{table}/"
+
+
+def _quote(column: str) -> str:
+    return f'"{column}"'
+
+
+def parquet_columns(table: TableInfo) -> List[Tuple[str, str, str]]:
+    """(column name, Athena type, SELECT expression) for the Parquet copy, excluding partitions."""
+    columns = []
+    typed = TYPED_COLUMNS.get(table.name, {})
+    for name, col_type in table.columns:
+        columns.append((name, col_type, _quote(name)))
+        if name in typed:
+            typed_name, typed_type = typed[name]
+            columns.append((typed_name, typed_type, f"TRY_CAST({_quote(name)} AS {typed_type}) AS {_quote(typed_name)}"))
+    return columns
+
+
+def _select_list(table: TableInfo) -> str:
+    expressions = [expr for _, _, expr in parquet_columns(table)]
+    expressions += [_quote(name) for name in table.partition_names]
+    return ',\n  '.join(expressions)
+
+
+def ctas_statement(table: TableInfo, database: str = DATABASE) -> str:
+    """CREATE TABLE AS SELECT writing a compressed, partitioned Parquet copy."""
+    properties = [
+        "format = 'PARQUET'",
+        f"write_compression = '{COMPRESSION}'",
+        f"external_location = '{parquet_location(table.name)}'",
+    ]
+    if table.partition_names:
+        partitions = ', '.join(f"'{name}'" for name in table.partition_names)
+        properties.append(f"partitioned_by = ARRAY[{partitions}]")
+    return (
+        f"CREATE TABLE {database}.{parquet_name(table.name)}\n"
+        f"WITH (\n  " + ',\n  '.join(properties) + "\n) AS\n"
+        f"SELECT\n  {_select_list(table)}\n"
+        f"FROM {database}.{table.name}"
+    )
+
+
+def insert_partition_statement(table: TableInfo, season: str, database: str = DATABASE) -> str:
+    """Append one nfl_season partition to an existing Parquet copy."""
+    return (
+        f"INSERT INTO {database}.{parquet_name(table.name)}\n"
+        f"SELECT\n  {_select_list(table)}\n"
+        f"FROM {database}.{table.name}\n"
+        f"WHERE nfl_season = '{season}'"
+    )
+
+
+def parquet_ddl(table: TableInfo) -> str:
+    """DDL file contents for the Parquet copy, in the same layout as the crawler DDLs."""
+    columns = ', \n'.join(f"  `{name}` {col_type}" for name, col_type, _ in parquet_columns(table))
+    lines = [
+        f"--- Table: {parquet_name(table.name)}",
+        f"--- Parquet copy of {table.name} (generated by convert_to_parquet.py - do not edit)",
+        f"--- Same columns as {table.name}; *_num columns are TRY_CAST numeric versions of string columns",
+        "--- --------------------------------------------------------",
+        f"CREATE EXTERNAL TABLE `{parquet_name(table.name)}`(",
+        f"{columns})",
+    ]
+    if table.partition_keys:
+        partitions = ', \n'.join(f"  `{name}` {col_type}" for name, col_type in table.partition_keys)
+        lines += ["PARTITIONED BY ( ", f"{partitions})"]
+    lines += [
+        "STORED AS PARQUET",
+        "LOCATION",
+        f"  '{parquet_location(table.name)}'",
+        "TBLPROPERTIES (",
+        "  'classification'='parquet', ",
+        f"  'parquet.compression'='{COMPRESSION}', ",
+        f"  'source_table'='{table.name}')",
+        "",
+    ]
+    return '\n'.join(lines)
+
+
+def csv_tables(catalog: Optional[Dict[str, TableInfo]] = None) -> List[TableInfo]:
+    catalog = load_catalog() if catalog is None else catalog
+    return [table for table in catalog.values() if table.classification == 'csv']
+
+
+def write_parquet_ddls(ddl_dir: str = DEFAULT_DDL_DIR, catalog: Optional[Dict[str, TableInfo]] = None) -> List[str]:
+    """Write ddl_<table>_parquet.sql next to the CSV DDLs; returns the paths written."""
+    paths = []
+    for table in csv_tables(catalog):
+        path = os.path.join(ddl_dir, f"ddl_{parquet_name(table.name)}.sql")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(parquet_ddl(table))
+        paths.append(path)
+    return paths
+
+
+def parquet_routes(catalog: Optional[Dict[str, TableInfo]] = None) -> Dict[str, str]:
+    """Map CSV table name -> Parquet table name for every Parquet DDL in the catalog."""
+    catalog = load_catalog() if catalog is None else catalog
+    return {
+        table.properties['source_table']: table.name
+        for table in catalog.values()
+        if table.classification == 'parquet' and 'source_table' in table.properties
+    }
+
+
+def route_to_parquet(sql: str,
+                     routes: Optional[Dict[str, str]] = None,
+                     enabled: Optional[bool] = None) -> Tuple[str, List[str]]:
+    """
+    Rewrite table references to their Parquet copies.
+
+    Unaliased references keep the original table name as alias, so qualified
+    column references (player_stats.stat_value) still resolve. Returns
+    (sql, routed source tables); the SQL is unchanged when routing is disabled.
+    """
+    enabled = ROUTING_ENABLED if enabled is None else enabled
+    if not enabled:
+        return sql, []
+    routes = parquet_routes() if routes is None else routes
+
+    rewritten, routed = sql, []
+    for ref in sorted(find_table_refs(sql), key=lambda r: r['start'], reverse=True):
+        target = routes.get(ref['table'])
+        if not target:
+            continue
+        original = sql[ref['start']:ref['end']]
+        name = original.split()[0]
+        new_name = re.sub(r'[`"]?' + re.escape(ref['table']) + r'[`"]?$', target, name, flags=re.IGNORECASE)
+        replacement = new_name + original[len(name):] if ref['alias'] else f"{new_name} {ref['table']}"
+        rewritten = rewritten[:ref['start']] + replacement + rewritten[ref['end']:]
+        routed.append(ref['table'])
+    return rewritten, sorted(set(routed))
+
+
+def unroute_parquet(sql: str, routes: Optional[Dict[str, str]] = None) -> Tuple[str, List[str]]:
+    """
+    Undo route_to_parquet on SQL read back from Athena (e.g. to retry a failed
+    submitted query on the CSV tables). Returns (sql, source tables found).
+    """
+    routes = parquet_routes() if routes is None else routes
+    restored, found = sql, []
+    for source, target in routes.items():
+        pattern = re.compile(r'\b' + re.escape(target) + r'\b', re.IGNORECASE)
+        if pattern.search(restored):
+            restored = pattern.sub(source, restored)
+            found.append(source)
+    return restored, sorted(found)
@@ -0,0 +1,347 @@
+# player_pivot.py
+"""
+Wide, typed player tables pivoted from the player_stats EAV table.
+
+player_stats holds one row per (game, player, stat): `stat_type`,
+`stat_label`, `stat_description` and a string `stat_value` such as '312',
+'25/35' (completions/attempts) or '2-14' (sacks-yards lost). Every player
+question therefore needs CAST/pivot SQL over the whole table. This module
+generates two derived Parquet tables, partitioned by nfl_season:
+
+- player_game_stats   one row per player per game, one typed column per stat
+- player_season_stats one row per player per season (sums, longs, rates)
+
+The pivot is a single conditional-aggregation SELECT that runs unchanged on
+Athena (CTAS / INSERT INTO) and on the embedded DuckDB engine (vectorized,
+over the local mirror). Refreshes replace one nfl_season partition at a time.
+
+`PIVOT_COLUMNS` maps ESPN box-score (stat_type, stat_label) pairs to columns;
+pairs that are not listed are ignored - `coverage_sql()` lists them.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from nfl_athena.catalog import DEFAULT_DDL_DIR
+from nfl_athena.parquet import COMPRESSION, DATABASE
+
+DERIVED_ROOT = 's3://alt-nfl-database/derived'
+GAME_TABLE = 'player_game_stats'
+SEASON_TABLE = 'player_season_stats'
+SOURCE_TABLE = 'player_stats'
+
+
+@dataclass(frozen=True)
+class PivotColumn:
+    """One typed column taken from a (stat_type, stat_label) pair."""
+    name: str
+    stat_type: str
+    stat_label: str
+    athena_type: str = 'bigint'
+    part: int = 0           # 1 or 2: take that side of a 'made/att' or 'sacks-yards' value
+    separator: str = '/'
+    season: str = 'sum'     # how player_season_stats aggregates it: sum | max
+
+
+def _split(name_made, name_att, stat_type, stat_label, separator='/'):
+    return [PivotColumn(name_made, stat_type, stat_label, part=1, separator=separator),
+            PivotColumn(name_att, stat_type, stat_label, part=2, separator=separator)]
+
+
+PIVOT_COLUMNS: List[PivotColumn] = [
+    *_split('passing_completions', 'passing_attempts', 'passing', 'C/ATT'),
+    PivotColumn('passing_yards', 'passing', 'YDS'),
+    PivotColumn('passing_touchdowns', 'passing', 'TD'),
+    PivotColumn('passing_interceptions', 'passing', 'INT'),
+    *_split('sacks_taken', 'sack_yards_lost', 'passing', 'SACKS', separator='-'),
+    PivotColumn('qbr', 'passing', 'QBR', 'double', season='max'),
+    PivotColumn('passer_rating', 'passing', 'RTG', 'double', season='max'),
+    PivotColumn('rushing_attempts', 'rushing', 'CAR'),
+    PivotColumn('rushing_yards', 'rushing', 'YDS'),
+    PivotColumn('rushing_touchdowns', 'rushing', 'TD'),
+    PivotColumn('rushing_long', 'rushing', 'LONG', season='max'),
+    PivotColumn('receptions', 'receiving', 'REC'),
+    PivotColumn('receiving_targets', 'receiving', 'TGTS'),
+    PivotColumn('receiving_yards', 'receiving', 'YDS'),
+    PivotColumn('receiving_touchdowns', 'receiving', 'TD'),
+    PivotColumn('receiving_long', 'receiving', 'LONG', season='max'),
+    PivotColumn('fumbles', 'fumbles', 'FUM'),
+    PivotColumn('fumbles_lost', 'fumbles', 'LOST'),
+    PivotColumn('fumbles_recovered', 'fumbles', 'REC'),
+    PivotColumn('tackles', 'defensive', 'TOT'),
+    PivotColumn('solo_tackles', 'defensive', 'SOLO'),
+    PivotColumn('sacks', 'defensive', 'SACKS', 'double'),
+    PivotColumn('tackles_for_loss', 'defensive', 'TFL'),
+    PivotColumn('passes_defended', 'defensive', 'PD'),
+    PivotColumn('qb_hits', 'defensive', 'QB HTS'),
+    PivotColumn('defensive_touchdowns', 'defensive', 'TD'),
+    PivotColumn('interceptions', 'interceptions', 'INT'),
+    PivotColumn('interception_yards', 'interceptions', 'YDS'),
+    PivotColumn('interception_touchdowns', 'interceptions', 'TD'),
+    PivotColumn('kick_returns', 'kickReturns', 'NO'),
+    PivotColumn('kick_return_yards', 'kickReturns', 'YDS'),
+    PivotColumn('kick_return_touchdowns', 'kickReturns', 'TD'),
+    PivotColumn('punt_returns', 'puntReturns', 'NO'),
+    PivotColumn('punt_return_yards', 'puntReturns', 'YDS'),
+    PivotColumn('punt_return_touchdowns', 'puntReturns', 'TD'),
+    *_split('field_goals_made', 'field_goals_attempted', 'kicking', 'FG'),
+    PivotColumn('field_goal_long', 'kicking', 'LONG', season='max'),
+    *_split('extra_points_made', 'extra_points_attempted', 'kicking', 'XP'),
+    PivotColumn('kicking_points', 'kicking', 'PTS'),
+    PivotColumn('punts', 'punting', 'NO'),
+    PivotColumn('punt_yards', 'punting', 'YDS'),
+    PivotColumn('punts_inside_20', 'punting', 'In 20'),
+    PivotColumn('punt_touchbacks', 'punting', 'TB'),
+]
+
+# Identifying columns of player_game_stats: (name, Athena type, aggregate over the game's rows)
+GAME_KEYS: List[Tuple[str, str, str]] = [
+    ('espn_id', 'bigint', 'espn_id'),
+    ('unique_id', 'string', 'max(unique_id)'),
+    ('athlete_id', 'bigint', 'athlete_id'),
+    ('athlete_name', 'string', 'max(athlete_name)'),
+    ('athlete_first', 'string', 'max(athlete_first)'),
+    ('athlete_last', 'string', 'max(athlete_last)'),
+    ('athlete_jersey', 'string', 'max(athlete_jersey)'),
+    ('team_abbreviation', 'string', 'max(team_abbreviation)'),
+    ('team_id', 'bigint', 'max(team_id)'),
+]
+
+# Identifying columns of player_season_stats (latest game wins when a player changed teams)
+SEASON_KEYS: List[Tuple[str, str, str]] = [
+    ('athlete_id', 'bigint', 'athlete_id'),
+    ('athlete_name', 'string', 'max_by(athlete_name, espn_id)'),
+    ('team_abbreviation', 'string', 'max_by(team_abbreviation, espn_id)'),
+    ('team_id', 'bigint', 'max_by(team_id, espn_id)'),
+    ('games', 'bigint', 'count(*)'),
+]
+
+# Season rates computed from the summed columns: (name, numerator, denominator)
+SEASON_RATES: List[Tuple[str, str, str]] = [
+    ('passing_completion_pct', 'passing_completions', 'passing_attempts'),
+    ('passing_yards_per_attempt', 'passing_yards', 'passing_attempts'),
+    ('rushing_yards_per_carry', 'rushing_yards', 'rushing_attempts'),
+    ('receiving_yards_per_reception', 'receiving_yards', 'receptions'),
+    ('catch_rate', 'receptions', 'receiving_targets'),
+    ('field_goal_pct', 'field_goals_made', 'field_goals_attempted'),
+]
+
+
+def derived_location(table: str) -> str:
+    return f"{DERIVED_ROOT}/{table}/"
+
+
+def _value_expression(column: PivotColumn) -> str:
+    value = 'stat_value'
+    if column.part:
+        value = f"split_part(stat_value, '{column.separator}', {column.part})"
+    return f"TRY_CAST(trim({value}) AS {column.athena_type})"
+
+
+def _pivot_expression(column: PivotColumn) -> str:
+    return (
+        f"max(CASE WHEN lower(stat_type) = '{column.stat_type.lower()}' "
+        f"AND upper(stat_label) = '{column.stat_label.upper()}' "
+        f"THEN {_value_expression(column)} END) AS {column.name}"
+    )
+
+
+def _season_filter(seasons: Optional[List[str]]) -> str:
+    if not seasons:
+        return ''
+    return f"\nWHERE nfl_season IN ({', '.join(repr(str(s)) for s in seasons)})"
+
+
+def game_select(seasons: Optional[List[str]] = None, database: str = DATABASE, partition_column: bool = True) -> str:
+    """Pivot player_stats into one row per player per game (Athena and DuckDB SQL)."""
+    expressions = [f"{expr} AS {name}" if expr != name else name for name, _, expr in GAME_KEYS]
+    expressions += [_pivot_expression(column) for column in PIVOT_COLUMNS]
+    if partition_column:
+        expressions.append('nfl_season')
+    return (
+        "SELECT\n  " + ',\n  '.join(expressions) +
+        f"\nFROM {database}.{SOURCE_TABLE}" + _season_filter(seasons) +
+        "\nGROUP BY espn_id, athlete_id, nfl_season"
+    )
+
+
+def season_select(seasons: Optional[List[str]] = None, database: str = DATABASE, partition_column: bool = True) -> str:
+    """Aggregate player_game_stats into one row per player per season."""
+    expressions = [f"{expr} AS {name}" if expr != name else name for name, _, expr in SEASON_KEYS]
+    expressions += [f"CAST({column.season}({column.name}) AS {column.athena_type}) AS {column.name}"
+                    for column in PIVOT_COLUMNS]
+    expressions += [
+        f"CAST(sum({numerator}) AS double) / nullif(sum({denominator}), 0) AS {name}"
+        for name, numerator, denominator in SEASON_RATES
+    ]
+    if partition_column:
+        expressions.append('nfl_season')
+    return (
+        "SELECT\n  " + ',\n  '.join(expressions) +
+        f"\nFROM {database}.{GAME_TABLE}" + _season_filter(seasons) +
+        "\nGROUP BY athlete_id, nfl_season"
+    )
+
+
+def table_columns(table: str) -> List[Tuple[str, str]]:
+    """(name, Athena type) of a derived table, excluding the nfl_season partition."""
+    if table == GAME_TABLE:
+        columns = [(name, col_type) for name, col_type, _ in GAME_KEYS]
+        return columns + [(column.name, column.athena_type) for column in PIVOT_COLUMNS]
+    columns = [(name, col_type) for name, col_type, _ in SEASON_KEYS]
+    columns += [(column.name, column.athena_type) for column in PIVOT_COLUMNS]
+    return columns + [(name, 'double') for name, _, _ in SEASON_RATES]
+
+
+def _select_for(table: str, seasons: Optional[List[str]] = None, database: str = DATABASE,
+                partition_column: bool = True) -> str:
+    select = game_select if table == GAME_TABLE else season_select
+    return select(seasons, database, partition_column)
+
+
+def ctas_statement(table: str, database: str = DATABASE) -> str:
+    """Initial build of a derived table with Athena CTAS."""
+    return (
+        f"CREATE TABLE {database}.{table}\n"
+        f"WITH (\n"
+        f"  format = 'PARQUET',\n"
+        f"  write_compression = '{COMPRESSION}',\n"
+        f"  external_location = '{derived_location(table)}',\n"
+        f"  partitioned_by = ARRAY['nfl_season']\n"
+        f") AS\n{_select_for(table, database=database)}"
+    )
+
+
+def refresh_statements(table: str, season: str, database: str = DATABASE) -> List[str]:
+    """
+    Statements that rebuild one nfl_season partition. Delete the partition's
+    S3 objects (`partition_prefix`) before running them - Athena cannot.
+    """
+    return [
+        f"ALTER TABLE {database}.{table} DROP IF EXISTS PARTITION (nfl_season = '{season}')",
+        f"INSERT INTO {database}.{table}\n{_select_for(table, [season], database)}",
+    ]
+
+
+def partition_prefix(table: str, season: str) -> Tuple[str, str]:
+    """(bucket, key prefix) holding one partition of a derived table."""
+    bucket, _, prefix = derived_location(table)[len('s3://'):].partition('/')
+    return bucket, f"{prefix}nfl_season={season}/"
+
+
+def coverage_sql(database: str = DATABASE) -> str:
+    """List the (stat_type, stat_label) pairs in player_stats and whether they are pivoted."""
+    mapped = ', '.join(sorted({f"'{c.stat_type.lower()}|{c.stat_label.upper()}'" for c in PIVOT_COLUMNS}))
+    return (
+        "SELECT stat_type, stat_label, max(stat_description) AS stat_description, count(*) AS row_count,\n"
+        f"  lower(stat_type) || '|' || upper(stat_label) IN ({mapped}) AS pivoted\n"
+        f"FROM {database}.{SOURCE_TABLE}\n"
+        "GROUP BY 1, 2\nORDER BY pivoted, row_count DESC"
+    )
+
+
+_SAMPLE_QUERIES = {
+    GAME_TABLE: [
+        "--- Patrick Mahomes passing line in every 2024 game",
+        "select unique_id, passing_completions, passing_attempts, passing_yards, passing_touchdowns, passing_interceptions",
+        "from nfl_stats_database.player_game_stats",
+        "where lower(athlete_name) = 'patrick mahomes' and nfl_season = '2024'",
+        "order by unique_id",
+        "",
+        "--- 150+ yard rushing games in 2023",
+        "select athlete_name, team_abbreviation, unique_id, rushing_yards",
+        "from nfl_stats_database.player_game_stats",
+        "where nfl_season = '2023' and rushing_yards >= 150",
+        "order by rushing_yards desc",
+    ],
+    SEASON_TABLE: [
+        "--- How many touchdowns has Tom Brady had by nfl season",
+        "select nfl_season, team_abbreviation, passing_touchdowns",
+        "from nfl_stats_database.player_season_stats",
+        "where lower(athlete_name) = 'tom brady'",
+        "order by nfl_season",
+        "",
+        "--- Top 5 passers by yardage in 2015",
+        "select athlete_name, team_abbreviation, passing_yards, passing_touchdowns, passing_completion_pct",
+        "from nfl_stats_database.player_season_stats",
+        "where nfl_season = '2015'",
+        "order by passing_yards desc",
+        "limit 5",
+    ],
+}
+
+
+def derived_ddl(table: str) -> str:
+    """DDL file contents for a derived table, in the same layout as the crawler DDLs."""
+    columns = ', \n'.join(f"  `{name}` {col_type}" for name, col_type in table_columns(table))
+    grain = 'one row per player per game' if table == GAME_TABLE else 'one row per player per season'
+    lines = [
+        f"--- Table: {table}",
+        f"--- {SOURCE_TABLE} pivoted to {grain} (generated by materialize_player_stats.py - do not edit)",
+        "--- Numeric columns are already typed: no CAST needed. NULL means the player had no such stat",
+        "--- --------------------------------------------------------",
+        f"CREATE EXTERNAL TABLE `{table}`(",
+        f"{columns})",
+        "PARTITIONED BY ( ",
+        "  `nfl_season` string)",
+        "STORED AS PARQUET",
+        "LOCATION",
+        f"  '{derived_location(table)}'",
+        "TBLPROPERTIES (",
+        "  'classification'='parquet', ",
+        f"  'parquet.compression'='{COMPRESSION}', ",
+        f"  'derived_from'='{SOURCE_TABLE}')",
+        "",
+        f"--- Sample queries for {table}",
+        "--- --------------------------------------------------------",
+        "",
+        *_SAMPLE_QUERIES[table],
+        "",
+    ]
+    return '\n'.join(lines)
+
+
+def write_derived_ddls(ddl_dir: str = DEFAULT_DDL_DIR) -> List[str]:
+    paths = []
+    for table in (GAME_TABLE, SEASON_TABLE):
+        path = os.path.join(ddl_dir, f"ddl_{table}.sql")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(derived_ddl(table))
+        paths.append(path)
+    return paths
+
+
+def materialize_local(engine, seasons: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Build the derived tables with the embedded DuckDB engine into the local mirror.
+
+    `engine` is a local_engine.LocalEngine with player_stats mirrored. Only the
+    given seasons are rewritten (all seasons when None). Returns rows written per table.
+    """
+    from nfl_athena.local_engine import local_path, mark_mirrored
+
+    engine.register(SOURCE_TABLE)
+    if seasons is None:
+        seasons = [row[0] for row in engine.connection.execute(
+            f"SELECT DISTINCT nfl_season FROM {DATABASE}.{SOURCE_TABLE} ORDER BY 1").fetchall()]
+
+    written = {}
+    for table in (GAME_TABLE, SEASON_TABLE):
+        target = local_path(derived_location(table), engine.mirror_dir)
+        rows = 0
+        for season in seasons:
+            partition = os.path.join(target, f"nfl_season={season}")
+            os.makedirs(partition, exist_ok=True)
+            for name in os.listdir(partition):
+                os.remove(os.path.join(partition, name))
+            select = _select_for(table, [season], partition_column=False)  # the directory carries nfl_season
+            path = os.path.join(partition, 'data.parquet').replace("'", "''")
+            engine.connection.execute(
+                f"COPY ({select}) TO '{path}' (FORMAT PARQUET, COMPRESSION {COMPRESSION})")
+            rows += engine.connection.execute(f"SELECT count(*) FROM read_parquet('{path}')").fetchone()[0]
+        mark_mirrored(table, {'objects': len(seasons), 'rows': rows, 'source': 'materialize_local'},
+                      engine.mirror_dir)
+        engine.register(table)  # the season table reads the game table just written
+        written[table] = rows
+    return written
@@ -0,0 +1,145 @@
+# projection.py
+"""
+Partition projection for the nfl_season-partitioned tables.
+
+The crawler (UPDATED_BY_CRAWLER='NFL-DB-Crawler') registers each season as a
+Glue partition, so every query does a metastore partition lookup and a new
+season is invisible until the crawler runs again. With partition projection
+Athena computes the partition locations from table properties instead:
+
+    projection.enabled            = true
+    projection.nfl_season.type    = date  (format yyyy, range <first>,NOW, 1 YEARS)
+    storage.location.template     = s3://.../<table>/nfl_season=${nfl_season}/
+
+Using a `date` projection with an open `NOW` upper bound means the next
+season becomes queryable as soon as its files land in S3.
+
+The validator compares the projected locations with a listing of the actual
+partition prefixes (from S3 or a local mirror) so a wrong template - which
+would silently hide data - is caught before the properties are applied.
+"""
+
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from nfl_athena.catalog import TableInfo, load_catalog
+from nfl_athena.cost import FIRST_SEASON, LAST_SEASON, PARTITION_COLUMN
+
+DATABASE = 'nfl_stats_database'
+
+# Folder layout written by the crawler's upstream job / CTAS: <location>/nfl_season=2024/
+HIVE_TEMPLATE = PARTITION_COLUMN + '=${' + PARTITION_COLUMN + '}'
+
+
+def projected_tables(catalog: Optional[Dict[str, TableInfo]] = None) -> List[TableInfo]:
+    catalog = load_catalog() if catalog is None else catalog
+    return [table for table in catalog.values() if table.is_partitioned_by(PARTITION_COLUMN)]
+
+
+def location_template(table: TableInfo, layout: str = HIVE_TEMPLATE) -> str:
+    return f"{table.location.rstrip('/')}/{layout}/"
+
+
+def projection_properties(table: TableInfo,
+                          first_season: int = FIRST_SEASON,
+                          layout: str = HIVE_TEMPLATE) -> Dict[str, str]:
+    """Table properties enabling nfl_season partition projection."""
+    prefix = f'projection.{PARTITION_COLUMN}'
+    return {
+        'projection.enabled': 'true',
+        f'{prefix}.type': 'date',
+        f'{prefix}.format': 'yyyy',
+        f'{prefix}.range': f'{first_season},NOW',
+        f'{prefix}.interval': '1',
+        f'{prefix}.interval.unit': 'YEARS',
+        'storage.location.template': location_template(table, layout),
+    }
+
+
+def alter_table_statement(table: TableInfo, database: str = DATABASE, **kwargs) -> str:
+    properties = projection_properties(table, **kwargs)
+    body = ',\n'.join(f"  '{key}'='{value}'" for key, value in properties.items())
+    return f"ALTER TABLE {database}.{table.name} SET TBLPROPERTIES (\n{body})"
+
+
+def projection_script(catalog: Optional[Dict[str, TableInfo]] = None, **kwargs) -> str:
+    """SQL script with one ALTER TABLE per nfl_season-partitioned table."""
+    lines = [
+        "--- Partition projection for nfl_season-partitioned tables",
+        "--- Generated by partition_projection.py - do not edit",
+        "--- Validate first: uv run partition_projection.py validate",
+        "--- NOTE: stop NFL-DB-Crawler from updating these tables (or set its schema change",
+        "---       policy to log only) so it does not overwrite the projection properties",
+        "--- --------------------------------------------------------",
+        "",
+    ]
+    for table in projected_tables(catalog):
+        lines += [f"{alter_table_statement(table, **kwargs)};", ""]
+    return '\n'.join(lines)
+
+
+def projected_location(table: TableInfo, season: str, layout: str = HIVE_TEMPLATE) -> str:
+    return location_template(table, layout).replace('${' + PARTITION_COLUMN + '}', season)
+
+
+def s3_lister(s3_client) -> Callable[[str], List[str]]:
+    """List the immediate sub-prefixes of an s3:// location."""
+    def list_prefixes(location: str) -> List[str]:
+        bucket, _, prefix = location[len('s3://'):].partition('/')
+        prefixes = []
+        paginator = s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+            for common in page.get('CommonPrefixes', []):
+                prefixes.append(f"s3://{bucket}/{common['Prefix']}")
+        return prefixes
+    return list_prefixes
+
+
+def local_lister(mirror_root: str) -> Callable[[str], List[str]]:
+    """List sub-directories of a local mirror laid out as <mirror_root>/<bucket>/<key>."""
+    def list_prefixes(location: str) -> List[str]:
+        path = os.path.join(mirror_root, location[len('s3://'):])
+        if not os.path.isdir(path):
+            return []
+        return [
+            f"{location.rstrip('/')}/{name}/"
+            for name in sorted(os.listdir(path))
+            if os.path.isdir(os.path.join(path, name))
+        ]
+    return list_prefixes
+
+
+def validate_table(table: TableInfo,
+                   list_prefixes: Callable[[str], List[str]],
+                   first_season: int = FIRST_SEASON,
+                   last_season: int = LAST_SEASON,
+                   layout: str = HIVE_TEMPLATE) -> Dict[str, Any]:
+    """
+    Compare projected partition locations with the actual listing.
+
+    - unmatched_prefixes: folders that exist but no projected season maps to
+      them (their data would be invisible under projection) -> error
+    - missing_seasons: projected seasons with no folder (empty, usually fine)
+    """
+    actual = {prefix.rstrip('/') + '/' for prefix in list_prefixes(table.location)}
+    projected = {
+        str(season): projected_location(table, str(season), layout)
+        for season in range(first_season, last_season + 1)
+    }
+    projected_set = set(projected.values())
+    unmatched = sorted(prefix for prefix in actual if prefix not in projected_set)
+    missing = sorted(season for season, location in projected.items() if location not in actual)
+    return {
+        'table': table.name,
+        'template': location_template(table, layout),
+        'found_partitions': len(actual & projected_set),
+        'unmatched_prefixes': unmatched,
+        'missing_seasons': missing,
+        'ok': bool(actual) and not unmatched,
+    }
+
+
+def validate_all(list_prefixes: Callable[[str], List[str]],
+                 catalog: Optional[Dict[str, TableInfo]] = None,
+                 **kwargs) -> List[Dict[str, Any]]:
+    return [validate_table(table, list_prefixes, **kwargs) for table in projected_tables(catalog)]
@@ -0,0 +1,405 @@
+# results.py
+"""
+Typed columnar decoding of Athena result sets.
+
+Athena returns every cell as a string (`VarCharValue`, or no key at all for
+NULL). The column types are available in `ResultSetMetadata.ColumnInfo`, so we
+decode each column once into a typed buffer instead of carrying strings around:
+
+- integers      -> int64   (array 'q')
+- floats        -> float64 (array 'd'); NaN/Infinity come out as None in
+                   JSON-facing views (bare NaN is not valid JSON)
+- decimals      -> decimal.Decimal (exact); JSON-facing views return the
+                   digits as a string so no precision is lost
+- booleans      -> bool    (bytearray)
+- dates         -> datetime64[s]  stored as int64 seconds since epoch
+- timestamps    -> datetime64[ms] stored as int64 milliseconds since epoch
+                   (UTC for `timestamp with time zone`, whose zone suffix -
+                   'UTC', an IANA name or an offset - is parsed)
+- anything else -> Python list of str
+
+Every column also keeps a null mask (bytearray, 1 = null). The buffers only use
+the standard library, so this module works inside the Lambda without numpy.
+When numpy/pandas are available, `to_numpy()` and `to_pandas()` wrap the same
+memory with `np.frombuffer` (no copy) and pandas' masked extension arrays.
+
+Trade-off: parsing every cell up front makes the decode step itself ~4x
+slower than keeping strings (benchmarks/bench_result_decoding: 2.3 ms vs
+0.6 ms for 1000 rows) - small next to an Athena round trip, and repaid by
+downstream sorting, summaries and the DataFrame handoff.
+"""
+
+import csv
+import io
+import math
+from array import array
+from itertools import repeat
+from operator import is_
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Athena type name -> column kind
+INTEGER_TYPES = {'tinyint', 'smallint', 'integer', 'int', 'bigint'}
+FLOAT_TYPES = {'double', 'float', 'real'}
+DECIMAL_TYPES = {'decimal'}
+BOOLEAN_TYPES = {'boolean'}
+DATE_TYPES = {'date'}
+TIMESTAMP_TYPES = {'timestamp', 'timestamp with time zone'}
+
+INT64 = 'int64'
+FLOAT64 = 'float64'
+DECIMAL = 'decimal'
+BOOL = 'bool'
+DATE = 'date'
+TIMESTAMP = 'timestamp'
+STRING = 'string'
+
+# Sentinel written into int64 buffers for NULL dates/timestamps (numpy's NaT)
+NAT = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_ONE_MS = timedelta(milliseconds=1)
+
+
+def column_kind(athena_type: str) -> str:
+    """Map an Athena column type (e.g. 'varchar', 'decimal(10,2)') to a column kind."""
+    base = (athena_type or '').lower().split('(')[0].strip()
+    if base in INTEGER_TYPES:
+        return INT64
+    if base in FLOAT_TYPES:
+        return FLOAT64
+    if base in DECIMAL_TYPES:
+        return DECIMAL
+    if base in BOOLEAN_TYPES:
+        return BOOL
+    if base in DATE_TYPES:
+        return DATE
+    if base in TIMESTAMP_TYPES:
+        return TIMESTAMP
+    return STRING
+
+
+def _parse_zoned(text: str) -> datetime:
+    """Athena's `timestamp with time zone` text: '2024-09-08 13:00:00.000 UTC' (or a zone name/offset)"""
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        stamp, _, zone = text.rpartition(' ')
+        if not stamp:
+            raise
+    if zone[:1] in '+-':
+        return datetime.fromisoformat(stamp + zone)
+    try:
+        return datetime.fromisoformat(stamp).replace(tzinfo=ZoneInfo(zone))
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown time zone in {text!r}") from e
+
+
+def _parse_decimal(text: str) -> Decimal:
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"not a decimal: {text!r}") from None
+
+
+def _parse_timestamp_ms(text: str) -> int:
+    dt = _parse_zoned(text)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // _ONE_MS
+
+
+def _parse_date_seconds(text: str) -> int:
+    return (date.fromisoformat(text).toordinal() - _EPOCH_ORDINAL) * 86400
+
+
+_BOOL_VALUES = {'true': 1, 'false': 0, 'TRUE': 1, 'FALSE': 0}
+
+
+def _parse_bool(text: str) -> int:
+    try:
+        return _BOOL_VALUES[text]
+    except KeyError:
+        raise ValueError(f"not a boolean: {text!r}") from None
+
+
+
+class Column:
+    """A single decoded column: typed buffer plus null mask."""
+
+    def __init__(self, name: str, athena_type: str):
+        self.name = name
+        self.athena_type = athena_type
+        self.kind = column_kind(athena_type)
+        self.mask = bytearray()
+        self.parse_errors = 0
+
+        if self.kind == INT64:
+            self.values = array('q')
+            self._null, self._parse = 0, int
+        elif self.kind == FLOAT64:
+            self.values = array('d')
+            self._null, self._parse = float('nan'), float
+        elif self.kind == DECIMAL:
+            self.values = []
+            self._null, self._parse = None, _parse_decimal
+        elif self.kind == BOOL:
+            self.values = bytearray()
+            self._null, self._parse = 0, _parse_bool
+        elif self.kind == DATE:
+            self.values = array('q')
+            self._null, self._parse = NAT, _parse_date_seconds
+        elif self.kind == TIMESTAMP:
+            self.values = array('q')
+            self._null, self._parse = NAT, _parse_timestamp_ms
+        else:
+            self.values = []
+            self._null, self._parse = None, None
+
+    def append(self, text: Optional[str]):
+        """Append one raw Athena cell value (None means NULL)."""
+        self.extend([text])
+
+    def extend(self, texts: List[Optional[str]]):
+        """Append a batch of raw Athena cell values (None means NULL)."""
+        null_count = texts.count(None)
+        nulls = bytearray(map(is_, texts, repeat(None))) if null_count else bytearray(len(texts))
+        parse = self._parse
+        if parse is None:
+            self.values.extend(texts)
+            self.mask.extend(nulls)
+            return
+        try:
+            if null_count:
+                null = self._null
+                parsed = [null if text is None else parse(text) for text in texts]
+            else:
+                parsed = list(map(parse, texts))
+            self.values.extend(parsed)
+            self.mask.extend(nulls)
+        except (ValueError, OverflowError):
+            self._extend_slow(texts)
+
+    def extend_values(self, values: Iterable[Any]):
+        """Append already-typed Python values (e.g. from a local engine); None means NULL."""
+        for value in values:
+            if value is None:
+                self.values.append(self._null)
+                self.mask.append(1)
+                continue
+            if self.kind == DATE:
+                value = (value.toordinal() - _EPOCH_ORDINAL) * 86400
+            elif self.kind == TIMESTAMP:
+                if value.tzinfo is not None:
+                    value = value.astimezone(timezone.utc)  # same UTC instant as parsed Athena text
+                value = (value.replace(tzinfo=None) - _EPOCH) // _ONE_MS
+            elif self.kind == BOOL:
+                value = int(bool(value))
+            elif self.kind == FLOAT64:
+                value = float(value)
+            elif self.kind == DECIMAL:
+                value = Decimal(str(value))
+            self.values.append(value)
+            self.mask.append(0)
+
+    def _extend_slow(self, texts: List[Optional[str]]):
+        # Unparseable cells become NULL rather than failing the whole result
+        for text in texts:
+            if text is None:
+                self.values.append(self._null)
+                self.mask.append(1)
+                continue
+            try:
+                self.values.append(self._parse(text))
+                self.mask.append(0)
+            except (ValueError, OverflowError):
+                self.parse_errors += 1
+                self.values.append(self._null)
+                self.mask.append(1)
+
+    def __len__(self):
+        return len(self.mask)
+
+    def value(self, i: int) -> Any:
+        """Return row i as a JSON-friendly Python value (numbers stay numbers)."""
+        if self.mask[i]:
+            return None
+        raw = self.values[i]
+        if self.kind == FLOAT64:
+            return raw if math.isfinite(raw) else None
+        if self.kind == DECIMAL:
+            return str(raw)
+        if self.kind == BOOL:
+            return bool(raw)
+        if self.kind == DATE:
+            return date.fromordinal(_EPOCH_ORDINAL + raw // 86400).isoformat()
+        if self.kind == TIMESTAMP:
+            text = (_EPOCH + raw * _ONE_MS).isoformat(sep=' ', timespec='milliseconds')
+            return f"{text} UTC" if self.athena_type.lower().endswith('with time zone') else text
+        return raw
+
+    def to_list(self, limit: Optional[int] = None) -> List[Any]:
+        n = len(self) if limit is None else min(limit, len(self))
+        if self.kind in (INT64, STRING) and not any(self.mask[:n]):
+            return list(self.values[:n])
+        if self.kind == FLOAT64 and not any(self.mask[:n]):
+            values = self.values[:n]
+            if all(map(math.isfinite, values)):
+                return list(values)
+        return [self.value(i) for i in range(n)]
+
+    def to_numpy(self):
+        """Return a numpy array sharing memory with the column buffer where possible."""
+        import numpy as np
+
+        if self.kind == INT64:
+            return np.frombuffer(self.values, dtype=np.int64)
+        if self.kind == FLOAT64:
+            return np.frombuffer(self.values, dtype=np.float64)
+        if self.kind == BOOL:
+            return np.frombuffer(self.values, dtype=np.bool_)
+        if self.kind == DATE:
+            return np.frombuffer(self.values, dtype=np.int64).view('datetime64[s]')
+        if self.kind == TIMESTAMP:
+            return np.frombuffer(self.values, dtype=np.int64).view('datetime64[ms]')
+        return np.array(self.values, dtype=object)
+
+    def null_mask(self):
+        import numpy as np
+
+        return np.frombuffer(self.mask, dtype=np.bool_)
+
+    def to_pandas(self):
+        """Return a pandas array backed by the column buffer (masked for nullable kinds)."""
+        import pandas as pd
+
+        values = self.to_numpy()
+        if self.kind == INT64:
+            return pd.arrays.IntegerArray(values, self.null_mask())
+        if self.kind == FLOAT64:
+            return pd.arrays.FloatingArray(values, self.null_mask())
+        if self.kind == BOOL:
+            return pd.arrays.BooleanArray(values, self.null_mask())
+        return values
+
+
+class ColumnarResult:
+    """Decoded Athena result: ordered typed columns with JSON/numpy/pandas views."""
+
+    def __init__(self, columns: List[Column]):
+        self.columns = columns
+
+    @property
+    def column_names(self) -> List[str]:
+        return [col.name for col in self.columns]
+
+    @property
+    def column_types(self) -> Dict[str, str]:
+        return {col.name: col.kind for col in self.columns}
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def __len__(self):
+        return self.row_count
+
+    def column(self, name: str) -> Column:
+        for col in self.columns:
+            if col.name == name:
+                return col
+        raise KeyError(name)
+
+    def to_columns(self, limit: Optional[int] = None) -> Dict[str, List[Any]]:
+        """Column name -> list of typed values."""
+        return {col.name: col.to_list(limit) for col in self.columns}
+
+    def to_rows(self, limit: Optional[int] = None) -> List[List[Any]]:
+        """Row-major list of typed values."""
+        return [list(row) for row in zip(*(col.to_list(limit) for col in self.columns))]
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List of {column: typed value} dicts (numeric types preserved for JSON)."""
+        names = self.column_names
+        return [dict(zip(names, row)) for row in zip(*(col.to_list(limit) for col in self.columns))]
+
+    def to_csv(self, limit: Optional[int] = None) -> str:
+        """Header line plus one line per row; NULL is an empty field."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(self.column_names)
+        writer.writerows(self.to_rows(limit))
+        return buffer.getvalue()
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Column name -> numpy array (zero-copy for numeric/bool/date/timestamp)."""
+        return {col.name: col.to_numpy() for col in self.columns}
+
+    def to_pandas(self):
+        """Build a DataFrame whose numeric columns share memory with the decoded buffers."""
+        import pandas as pd
+
+        return pd.DataFrame({col.name: col.to_pandas() for col in self.columns}, copy=False)
+
+    def parse_errors(self) -> Dict[str, int]:
+        return {col.name: col.parse_errors for col in self.columns if col.parse_errors}
+
+
+class ColumnarDecoder:
+    """
+    Incrementally decode one or more `get_query_results` pages.
+
+    Only the first page of a SELECT result carries the header row, so
+    `skip_header` is applied once.
+    """
+
+    def __init__(self, skip_header: bool = True):
+        self.skip_header = skip_header
+        self.columns: Optional[List[Column]] = None
+
+    def feed(self, result_set: Dict[str, Any]):
+        rows = result_set.get('Rows', [])
+        if self.columns is None:
+            column_info = result_set.get('ResultSetMetadata', {}).get('ColumnInfo', [])
+            if column_info:
+                self.columns = [Column(info.get('Name') or info.get('Label', ''), info.get('Type', 'varchar'))
+                                for info in column_info]
+            elif rows:
+                # No metadata: fall back to string columns named from the header row
+                self.columns = [Column(cell.get('VarCharValue', ''), 'varchar') for cell in rows[0]['Data']]
+            else:
+                return
+            if self.skip_header and rows:
+                rows = rows[1:]
+
+        if not rows:
+            return
+        # Transpose to column-major once, then parse each column in bulk
+        width = len(self.columns)
+        raw_rows = [[cell.get('VarCharValue') for cell in row.get('Data', [])] for row in rows]
+        for raw in raw_rows:
+            if len(raw) != width:
+                raw[:] = (raw + [None] * width)[:width]
+        for column, texts in zip(self.columns, zip(*raw_rows)):
+            column.extend(texts)
+
+    def finish(self) -> ColumnarResult:
+        return ColumnarResult(self.columns or [])
+
+
+def decode_result_set(result_set: Dict[str, Any], skip_header: bool = True) -> ColumnarResult:
+    """Decode a single `ResultSet` (one `get_query_results` page)."""
+    decoder = ColumnarDecoder(skip_header=skip_header)
+    decoder.feed(result_set)
+    return decoder.finish()
+
+
+def decode_result_pages(pages: Iterable[Dict[str, Any]]) -> ColumnarResult:
+    """Decode a sequence of `get_query_results` responses (e.g. from a paginator)."""
+    decoder = ColumnarDecoder(skip_header=True)
+    for page in pages:
+        decoder.feed(page['ResultSet'] if 'ResultSet' in page else page)
+    return decoder.finish()
@@ -0,0 +1,149 @@
+# sql_validation.py
+"""
+Read-only SQL validation shared by tools/query_athena.py and the nfl-data-service Lambda.
+
+The old check rejected any query whose uppercased text contained DROP, CREATE,
+UPDATE, ... anywhere - including string literals, comments and identifiers such
+as `created_at` or `play_text LIKE '%drop%'`. Each false rejection cost the
+agent an extra LLM round trip.
+
+Here the statement is tokenized first, so only bare keywords count:
+
+- string literals, quoted identifiers and comments are ignored
+- the statement must start with SELECT, WITH, VALUES or EXPLAIN [ANALYZE] (...)
+- write/DDL keywords (DROP, INSERT, CREATE, ...) are rejected as whole tokens only
+- more than one statement is rejected; a single trailing ';' is fine
+
+Verdicts are memoized by the SHA-256 of the statement text, because the agent
+retries and the batch operation re-validate the same SQL (`stats` counts hits
+and misses).
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+# Keywords that may open a read-only statement
+READ_KEYWORDS = {'SELECT', 'WITH', 'VALUES'}
+# Bare keywords that never belong in a read-only query
+FORBIDDEN_KEYWORDS = [
+    'DROP', 'DELETE', 'INSERT', 'UPDATE', 'CREATE', 'ALTER', 'TRUNCATE', 'MERGE',
+    'GRANT', 'REVOKE', 'UNLOAD', 'MSCK', 'CALL', 'PREPARE', 'DEALLOCATE', 'EXECUTE',
+]
+
+CACHE_SIZE = 2048
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^']|'')*')
+  | (?P<quoted>"(?:[^"]|"")*"|`[^`]*`)
+  | (?P<number>\d+(?:\.\d*)?(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<semicolon>;)
+  | (?P<symbol>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+class Token(NamedTuple):
+    kind: str    # word | string | quoted | number | semicolon | symbol
+    text: str
+    position: int
+
+
+class SQLSyntaxError(ValueError):
+    """The statement could not be tokenized (unterminated literal or comment)."""
+
+
+def tokenize(sql: str) -> List[Token]:
+    """Split SQL into tokens, dropping whitespace and comments."""
+    tokens = []
+    position, n = 0, len(sql)
+    while position < n:
+        match = _TOKEN_RE.match(sql, position)
+        kind, text = match.lastgroup, match.group()
+        if kind == 'symbol':
+            if text == "'":
+                raise SQLSyntaxError(f'Unterminated string literal at position {position}')
+            if text in '"`':
+                raise SQLSyntaxError(f'Unterminated quoted identifier at position {position}')
+            if sql.startswith('/*', position):
+                raise SQLSyntaxError(f'Unterminated comment at position {position}')
+        if kind not in ('space', 'comment'):
+            tokens.append(Token(kind, text.upper() if kind == 'word' else text, position))
+        position = match.end()
+    return tokens
+
+
+def _skip_parenthesized(tokens: List[Token], index: int) -> int:
+    """Index just past the parenthesized group starting at tokens[index]."""
+    depth = 0
+    for i in range(index, len(tokens)):
+        if tokens[i].text == '(':
+            depth += 1
+        elif tokens[i].text == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(tokens)
+
+
+def _check(sql: str) -> Optional[str]:
+    try:
+        tokens = tokenize(sql)
+    except SQLSyntaxError as e:
+        return str(e)
+
+    # One statement only: a ';' may only be followed by more ';'
+    for i, token in enumerate(tokens):
+        if token.kind == 'semicolon' and any(t.kind != 'semicolon' for t in tokens[i + 1:]):
+            return 'Only one SQL statement is allowed per query'
+    tokens = [t for t in tokens if t.kind != 'semicolon']
+    if not tokens:
+        return 'SQL query is required'
+
+    # EXPLAIN [ANALYZE] [VERBOSE] [(options)] <query>
+    start = 0
+    if tokens[0].text == 'EXPLAIN':
+        start = 1
+        while start < len(tokens) and tokens[start].text in ('ANALYZE', 'VERBOSE'):
+            start += 1
+        if start < len(tokens) and tokens[start].text == '(':
+            start = _skip_parenthesized(tokens, start)
+
+    # Leading parentheses are fine: (SELECT ...) UNION (SELECT ...)
+    while start < len(tokens) and tokens[start].text == '(':
+        start += 1
+    if start >= len(tokens) or tokens[start].kind != 'word' or tokens[start].text not in READ_KEYWORDS:
+        return 'Only SELECT queries are allowed for security reasons'
+
+    for token in tokens:
+        if token.kind == 'word' and token.text in FORBIDDEN_KEYWORDS:
+            return f'Query contains prohibited keyword: {token.text}'
+    return None
+
+
+_verdicts: 'OrderedDict[str, Optional[str]]' = OrderedDict()
+_verdicts_lock = threading.Lock()
+stats = {'hits': 0, 'misses': 0}
+
+
+def validate_sql(sql: str) -> Optional[str]:
+    """Return why a statement must not run, or None if it is a single read-only query."""
+    if not sql or not sql.strip():
+        return 'SQL query is required'
+    key = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+    with _verdicts_lock:
+        if key in _verdicts:
+            _verdicts.move_to_end(key)
+            stats['hits'] += 1
+            return _verdicts[key]
+    verdict = _check(sql)
+    with _verdicts_lock:
+        stats['misses'] += 1
+        _verdicts[key] = verdict
+        if len(_verdicts) > CACHE_SIZE:
+            _verdicts.popitem(last=False)
+    return verdict
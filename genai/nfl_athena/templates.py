@@ -0,0 +1,283 @@
+# templates.py
+"""
+Curated, parameterized statements for the most common analyst question shapes.
+
+Most analyst traffic is a handful of shapes - a player's season totals, a
+team's game log, head-to-head results, weekly leaders. Instead of the model
+looking up the schema and writing SQL each time, it names a template and
+passes typed parameters:
+
+    {"operation": "run_template", "template": "team_game_log",
+     "parameters": {"team": "KC", "season": 2024}}
+
+On Athena each template is registered once as a prepared statement
+(`ensure_prepared`, i.e. `PREPARE nfl_team_game_log FROM ...`) and run as
+`EXECUTE nfl_team_game_log` with `ExecutionParameters`, so the statement text -
+and with it the plan and the result-reuse key - is identical across calls.
+The local engine and tools/query_athena.py run `render(...)`, the same SQL with
+the validated values inlined as literals.
+
+Placeholders are written `:name` in the SQL; a parameter may appear more than once.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from nfl_athena.cost import FIRST_SEASON, LAST_SEASON
+
+STATEMENT_PREFIX = 'nfl_'
+WORK_GROUP = 'primary'
+
+_PLACEHOLDER_RE = re.compile(r':([a-z_]+)\b')
+
+
+@dataclass(frozen=True)
+class TemplateParam:
+    """
+    A typed template parameter: 'string', 'integer' or 'season'.
+
+    Seasons are validated as integers but passed as strings, matching the
+    nfl_season partition column (CAST them where a bigint `season` is compared).
+    """
+    name: str
+    type: str
+    description: str
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    pattern: Optional[str] = None
+    choices: Tuple[str, ...] = ()
+    default: Any = None
+
+
+@dataclass(frozen=True)
+class Template:
+    name: str
+    description: str
+    sql: str
+    params: List[TemplateParam] = field(default_factory=list)
+
+    @property
+    def statement_name(self) -> str:
+        return f"{STATEMENT_PREFIX}{self.name}"
+
+    @property
+    def placeholders(self) -> List[str]:
+        """Parameter names in the order their placeholders appear in the SQL."""
+        return _PLACEHOLDER_RE.findall(self.sql)
+
+    @property
+    def prepared_sql(self) -> str:
+        """The SQL with every placeholder replaced by Athena's positional '?'."""
+        return _PLACEHOLDER_RE.sub('?', self.sql)
+
+
+def _season(description='NFL season year, e.g. 2024', **kwargs) -> TemplateParam:
+    return TemplateParam(kwargs.pop('name', 'season'), 'season', description,
+                         minimum=FIRST_SEASON, maximum=LAST_SEASON, **kwargs)
+
+
+def _team(name='team', description='Team abbreviation as used in clean_schedule, e.g. KC, NO, BAL') -> TemplateParam:
+    return TemplateParam(name, 'string', description, pattern=r'^[A-Z]{2,3}$')
+
+
+TEMPLATES: Dict[str, Template] = {t.name: t for t in [
+    Template(
+        'player_season_totals',
+        "One player's totals for every stat type/label in a season, with games played",
+        """SELECT athlete_name, team_abbreviation, stat_type, stat_label,
+  max(stat_description) AS stat_description,
+  count(DISTINCT espn_id) AS games,
+  sum(TRY_CAST(stat_value AS double)) AS total
+FROM nfl_stats_database.player_stats
+WHERE lower(athlete_name) = lower(:player_name)
+  AND nfl_season = :season
+GROUP BY 1, 2, 3, 4
+ORDER BY stat_type, stat_label""",
+        [TemplateParam('player_name', 'string', "Player's full name, e.g. Patrick Mahomes",
+                       pattern=r"^[A-Za-z .'\-]{2,60}$"),
+         _season()],
+    ),
+    Template(
+        'team_game_log',
+        "A team's games in a season: week, opponent, home/away, score and result",
+        """SELECT season_week, date, matchup,
+  CASE WHEN home_team = :team THEN 'home' ELSE 'away' END AS home_away,
+  CASE WHEN home_team = :team THEN away_team ELSE home_team END AS opponent,
+  CASE WHEN home_team = :team THEN home_score ELSE away_score END AS points_for,
+  CASE WHEN home_team = :team THEN away_score ELSE home_score END AS points_against,
+  CASE WHEN winning_team = :team THEN 'W' WHEN home_score = away_score THEN 'T' ELSE 'L' END AS result
+FROM nfl_stats_database.clean_schedule
+WHERE season = CAST(:season AS bigint)
+  AND (home_team = :team OR away_team = :team)
+ORDER BY season_type, season_week""",
+        [_team(), _season()],
+    ),
+    Template(
+        'head_to_head',
+        "Every game between two teams over a range of seasons, with the winner",
+        """SELECT season, season_week, date, home_team, home_score, away_team, away_score, winning_team
+FROM nfl_stats_database.clean_schedule
+WHERE ((home_team = :team_a AND away_team = :team_b) OR (home_team = :team_b AND away_team = :team_a))
+  AND season BETWEEN CAST(:first_season AS bigint) AND CAST(:last_season AS bigint)
+ORDER BY season, season_type, season_week""",
+        [_team('team_a', 'First team abbreviation, e.g. KC'),
+         _team('team_b', 'Second team abbreviation, e.g. BUF'),
+         _season('First season to include', name='first_season', default=str(FIRST_SEASON)),
+         _season('Last season to include', name='last_season', default=str(LAST_SEASON))],
+    ),
+    Template(
+        'weekly_leaders',
+        "Top 10 players for one stat in one regular-season week",
+        """SELECT p.athlete_name, p.team_abbreviation, s.matchup,
+  sum(TRY_CAST(p.stat_value AS double)) AS value
+FROM nfl_stats_database.player_stats p
+JOIN nfl_stats_database.clean_schedule s ON s.espn_id = p.espn_id
+WHERE p.nfl_season = :season
+  AND s.season = CAST(:season AS bigint)
+  AND s.season_type = 2
+  AND s.season_week = :week
+  AND p.stat_type = :stat_type
+  AND p.stat_label = :stat_label
+GROUP BY 1, 2, 3
+ORDER BY value DESC
+LIMIT 10""",
+        [_season(),
+         TemplateParam('week', 'integer', 'Regular-season week (1-18)', minimum=1, maximum=18),
+         TemplateParam('stat_type', 'string', 'Stat group',
+                       choices=('passing', 'rushing', 'receiving', 'defensive', 'interceptions',
+                                'kicking', 'punting', 'kickReturns', 'puntReturns', 'fumbles')),
+         TemplateParam('stat_label', 'string', 'Stat label within the group, e.g. YDS, TD, REC, SACKS',
+                       pattern=r'^[A-Za-z0-9/ ]{1,10}$')],
+    ),
+]}
+
+
+def describe_templates() -> List[Dict[str, Any]]:
+    """Template names, descriptions and parameter schemas (for tool descriptions)."""
+    described = []
+    for template in TEMPLATES.values():
+        params = {}
+        for param in template.params:
+            spec = {'type': 'string' if param.type == 'string' else 'integer', 'description': param.description}
+            if param.choices:
+                spec['enum'] = list(param.choices)
+            if param.minimum is not None:
+                spec['minimum'] = param.minimum
+            if param.maximum is not None:
+                spec['maximum'] = param.maximum
+            if param.default is not None:
+                spec['default'] = int(param.default) if param.type == 'season' else param.default
+            params[param.name] = spec
+        described.append({'name': template.name, 'description': template.description, 'parameters': params})
+    return described
+
+
+def _coerce(param: TemplateParam, value: Any) -> Tuple[Any, Optional[str]]:
+    if param.type in ('integer', 'season'):
+        if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).strip().lstrip('-').isdigit():
+            return None, f"{param.name} must be an integer"
+        value = int(value)
+        if param.minimum is not None and value < param.minimum:
+            return None, f"{param.name} must be >= {param.minimum}"
+        if param.maximum is not None and value > param.maximum:
+            return None, f"{param.name} must be <= {param.maximum}"
+        return (str(value) if param.type == 'season' else value), None
+
+    if not isinstance(value, str):
+        return None, f"{param.name} must be a string"
+    value = value.strip()
+    if param.choices and value not in param.choices:
+        return None, f"{param.name} must be one of: {', '.join(param.choices)}"
+    if param.pattern and not re.match(param.pattern, value):
+        return None, f"{param.name} has an invalid value: {value!r}"
+    return value, None
+
+
+def validate_parameters(template: Template, parameters: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Check and convert the caller's parameters; returns (values, error)."""
+    parameters = parameters or {}
+    if not isinstance(parameters, dict):
+        return {}, 'parameters must be an object'
+    known = {param.name for param in template.params}
+    unknown = sorted(set(parameters) - known)
+    if unknown:
+        return {}, f"Unknown parameters for {template.name}: {', '.join(unknown)}"
+
+    values = {}
+    for param in template.params:
+        if parameters.get(param.name) is None:
+            if param.default is None:
+                return {}, f"Missing required parameter: {param.name}"
+            values[param.name] = param.default
+            continue
+        value, error = _coerce(param, parameters[param.name])
+        if error:
+            return {}, error
+        values[param.name] = value
+    return values, None
+
+
+def _literal(value: Any) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def execution_parameters(template: Template, values: Dict[str, Any]) -> List[str]:
+    """Literal values for Athena's ExecutionParameters, one per '?' in order."""
+    return [_literal(values[name]) for name in template.placeholders]
+
+
+def render(template: Template, values: Dict[str, Any]) -> str:
+    """The template SQL with validated values inlined (local engine / local tool)."""
+    return _PLACEHOLDER_RE.sub(lambda m: _literal(values[m.group(1)]), template.sql)
+
+
+def resolve(name: str, parameters: Optional[Dict[str, Any]]) -> Tuple[Optional[Template], Dict[str, Any], Optional[str]]:
+    """Look up a template and validate its parameters; returns (template, values, error)."""
+    template = TEMPLATES.get(name or '')
+    if template is None:
+        return None, {}, f"Unknown template: {name}. Available templates: {', '.join(TEMPLATES)}"
+    values, error = validate_parameters(template, parameters)
+    return template, values, error
+
+
+_prepared: Dict[str, str] = {}  # statement name -> SQL known to be registered
+_prepared_lock = threading.Lock()
+
+
+def ensure_prepared(athena_client, template: Template, work_group: str = WORK_GROUP) -> bool:
+    """
+    Make sure the template is registered as a prepared statement with the current SQL.
+
+    Checked once per process and template; returns True if it was created or updated.
+    """
+    sql = template.prepared_sql
+    with _prepared_lock:
+        if _prepared.get(template.statement_name) == sql:
+            return False
+
+    try:
+        existing = athena_client.get_prepared_statement(StatementName=template.statement_name, WorkGroup=work_group)
+        current = existing['PreparedStatement'].get('QueryStatement')
+    except athena_client.exceptions.ResourceNotFoundException:
+        current = None
+
+    changed = current != sql
+    if current is None:
+        athena_client.create_prepared_statement(StatementName=template.statement_name, WorkGroup=work_group,
+                                                QueryStatement=sql, Description=template.description)
+    elif changed:
+        athena_client.update_prepared_statement(StatementName=template.statement_name, WorkGroup=work_group,
+                                                QueryStatement=sql, Description=template.description)
+    with _prepared_lock:
+        _prepared[template.statement_name] = sql
+    return changed
+
+
+def prepare_statements_sql() -> str:
+    """`PREPARE ... FROM` statements for every template (for running by hand in the console)."""
+    return '\n\n'.join(f"-- {t.description}\nPREPARE {t.statement_name} FROM\n{t.prepared_sql};"
+                       for t in TEMPLATES.values())
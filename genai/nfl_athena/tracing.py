@@ -0,0 +1,174 @@
+# tracing.py
+"""
+Lightweight per-request span tracing.
+
+A request opens a trace with `trace_scope`; code anywhere below it opens
+nested spans with `span(...)`, which time the block and carry attributes:
+
+    with trace_scope('agent_invocation', model=model) as trace:
+        with span('mcp.lease') as s:
+            ...
+            s.set(reused=True)
+    print(json.dumps(trace.record()))
+
+Like the request deadline, the current span lives in a context variable, so
+asyncio tasks and `asyncio.to_thread` tool calls nest under the span that was
+active when they started. Threads started with `threading.Thread` (background
+refreshes, prewarming) and code running outside a trace - the Lambdas, the CLIs -
+get a shared no-op span, so an untraced `span()` call costs one context
+variable lookup.
+"""
+
+import os
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+TRACE_ENABLED = os.environ.get('AGENT_TRACE', 'true').lower() not in ('0', 'false', 'no')
+
+_current: ContextVar[Optional['Span']] = ContextVar('nfl_trace_span', default=None)
+
+
+class _NoopSpan:
+    """Stand-in when no trace is active; every method does nothing."""
+    enabled = False
+
+    def set(self, **attributes) -> '_NoopSpan':
+        return self
+
+    def finish(self, error: Optional[BaseException] = None):
+        pass
+
+    def record(self) -> None:
+        return None
+
+    def summary(self) -> None:
+        return None
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __bool__(self) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed, named block with attributes and child spans."""
+    enabled = True
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None, parent: Optional['Span'] = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.parent = parent
+        self.children: List['Span'] = []
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._token = None
+
+    def set(self, **attributes) -> 'Span':
+        self.attributes.update(attributes)
+        return self
+
+    def begin(self) -> 'Span':
+        """Start timing without making this the current span (e.g. from a callback)"""
+        self.start = time.perf_counter()
+        if self.parent is not None:
+            self.parent.children.append(self)  # list.append is atomic; tool threads may add concurrently
+        return self
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.end = time.perf_counter()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def __enter__(self) -> 'Span':
+        self.begin()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc if exc_type is not None and not issubclass(exc_type, GeneratorExit) else None)
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Exited in another context (e.g. an async generator resumed by a different task)
+            _current.set(self.parent)
+        return False
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 1),
+            'duration_ms': round(self.duration_ms, 1),
+        }
+        if self.attributes:
+            data['attributes'] = self.attributes
+        if self.error:
+            data['error'] = self.error
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in list(self.children)]
+        return data
+
+    def walk(self):
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+
+class Trace(Span):
+    """The root span of one request."""
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        super().__init__(name, attributes)
+        self.trace_id = uuid.uuid4().hex[:16]
+
+    def record(self) -> Dict[str, Any]:
+        """The whole span tree, for one JSON log line per request"""
+        return {'trace_id': self.trace_id, **self.to_dict(self.start)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Total time, time to first token and per-stage totals (for the metrics event)"""
+        stages: Dict[str, Dict[str, float]] = {}
+        ttft_ms = None
+        for s in self.walk():
+            if s is self:
+                continue
+            stage = stages.setdefault(s.name, {'count': 0, 'ms': 0.0})
+            stage['count'] += 1
+            stage['ms'] = round(stage['ms'] + s.duration_ms, 1)
+            if ttft_ms is None and 'ttft_ms' in s.attributes:
+                ttft_ms = s.attributes['ttft_ms']
+        return {'trace_id': self.trace_id, 'total_ms': round(self.duration_ms, 1), 'ttft_ms': ttft_ms,
+                'stages': stages}
+
+
+def trace_scope(name: str, enabled: bool = TRACE_ENABLED, **attributes):
+    """Root span for a request (a no-op span when tracing is disabled)"""
+    if not enabled:
+        return NOOP_SPAN
+    return Trace(name, attributes)
+
+
+def span(name: str, **attributes):
+    """Child of the current span, or the no-op span outside a trace"""
+    parent = _current.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(name, attributes, parent)
+
+
+def current_span():
+    return _current.get() or NOOP_SPAN
@@ -0,0 +1,4 @@
+# __init__.py
+# MCP gateway plumbing shared by agent.py, the MCP CLI and the gateway test
+# scripts: credentials/tokens (auth.py) and warm, leased MCP clients with cached
+# tool listings (connections.py). Modules are imported directly.
@@ -0,0 +1,217 @@
+# auth.py
+"""
+Cached credentials for the NFL MCP gateway.
+
+Every analyst request used to read the `nfl_mcp_auth` secret from Secrets
+Manager and POST a client_credentials grant to the Cognito token endpoint
+before it could open the gateway - two network round trips on the critical
+path. `AuthProvider` keeps both:
+
+- the secret (gateway URL + Cognito client) for `MCP_SECRET_TTL_SECONDS`
+- the access token until `MCP_TOKEN_EXPIRY_MARGIN_SECONDS` before its `expires_in`
+
+Once an entry is within `MCP_REFRESH_AHEAD_SECONDS` of expiring, callers still
+get the cached value while a background thread fetches the next one. Only an
+empty or expired entry blocks, and then concurrent callers share a single
+in-flight fetch instead of each calling AWS.
+
+    auth = get_auth_provider()
+    transport = streamablehttp_client(auth.gateway_url(), headers=auth.auth_headers())
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from nfl_athena.tracing import span
+
+SECRET_ID = os.environ.get('NFL_MCP_SECRET_ID', 'nfl_mcp_auth')
+REGION = os.environ.get('AWS_REGION', 'us-east-1')
+
+# Configuration (override with environment variables)
+SECRET_TTL_SECONDS = float(os.environ.get('MCP_SECRET_TTL_SECONDS', 3600))
+TOKEN_EXPIRY_MARGIN_SECONDS = float(os.environ.get('MCP_TOKEN_EXPIRY_MARGIN_SECONDS', 60))
+REFRESH_AHEAD_SECONDS = float(os.environ.get('MCP_REFRESH_AHEAD_SECONDS', 300))
+
+
+@dataclass(frozen=True)
+class GatewayConfig:
+    """The parts of the nfl_mcp_auth secret the clients need."""
+    gateway_url: str
+    gateway_id: Optional[str]
+    client_id: str
+    client_secret: str
+    token_endpoint: str
+
+    @classmethod
+    def from_secret(cls, secret_data: Dict[str, Any]) -> 'GatewayConfig':
+        client_info = secret_data['client_info']
+        return cls(
+            gateway_url=secret_data['gateway_url'],
+            gateway_id=secret_data.get('gateway_id'),
+            client_id=client_info['client_id'],
+            client_secret=client_info['client_secret'],
+            token_endpoint=client_info['token_endpoint'],
+        )
+
+
+class CachedValue:
+    """
+    A value with an expiry, refreshed ahead of time in the background.
+
+    `load()` returns (value, ttl_seconds). Concurrent callers that find the
+    cache empty or expired wait on the same in-flight load.
+    """
+
+    def __init__(self, name: str, load: Callable[[], Tuple[Any, float]], refresh_ahead: float = REFRESH_AHEAD_SECONDS):
+        self.name = name
+        self._load = load
+        self.refresh_ahead = refresh_ahead
+        self._value = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._inflight: Optional[Future] = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+
+    def get(self) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            if self._value is not None and now < self._expires_at:
+                self.hits += 1
+                if now >= self._refresh_at and self._inflight is None:
+                    self._inflight = Future()
+                    threading.Thread(target=self._run, args=(self._inflight,), daemon=True,
+                                     name=f'refresh-{self.name}').start()
+                return self._value
+            future = self._inflight
+            leader = future is None
+            if leader:
+                future = self._inflight = Future()
+        if leader:
+            self._run(future)
+        return future.result()
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
+
+    def remaining(self) -> float:
+        """Seconds until the cached value expires (0 if there is none)."""
+        return max(0.0, self._expires_at - time.monotonic()) if self._value is not None else 0.0
+
+    def _run(self, future: Future):
+        try:
+            value, ttl = self._load()
+        except Exception as e:
+            print(f"❌ Could not refresh {self.name}: {e}")
+            with self._lock:
+                self._inflight = None
+            future.set_exception(e)
+            return
+        loaded_at = time.monotonic()
+        with self._lock:
+            self.loads += 1
+            self._value = value
+            self._expires_at = loaded_at + ttl
+            self._refresh_at = loaded_at + max(0.0, ttl - self.refresh_ahead)
+            self._inflight = None
+        future.set_result(value)
+
+
+class AuthProvider:
+    """Gateway configuration and OAuth access token for the NFL MCP gateway, cached per process."""
+
+    def __init__(self,
+                 secret_id: str = SECRET_ID,
+                 region: str = REGION,
+                 secrets_client_factory: Optional[Callable[[], Any]] = None,
+                 post: Optional[Callable[..., Any]] = None):
+        self.secret_id = secret_id
+        self.region = region
+        self._secrets_client_factory = secrets_client_factory
+        self._post = post
+        self._secret = CachedValue('mcp-secret', self._load_secret)
+        self._token = CachedValue('mcp-token', self._load_token)
+
+    def _load_secret(self) -> Tuple[GatewayConfig, float]:
+        with span('mcp.get_secret', secret_id=self.secret_id):
+            if self._secrets_client_factory is None:
+                import boto3
+                secrets_client = boto3.client('secretsmanager', region_name=self.region)
+            else:
+                secrets_client = self._secrets_client_factory()
+            sec_valu = secrets_client.get_secret_value(SecretId=self.secret_id)
+            return GatewayConfig.from_secret(json.loads(sec_valu['SecretString'])), SECRET_TTL_SECONDS
+
+    def _load_token(self) -> Tuple[str, float]:
+        config = self.config()
+        post = self._post
+        if post is None:
+            import requests
+            post = requests.post
+        with span('mcp.token_post'):
+            response = post(
+                config.token_endpoint,
+                data={'grant_type': 'client_credentials', 'client_id': config.client_id,
+                      'client_secret': config.client_secret},
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                timeout=10,
+            )
+            response.raise_for_status()
+        body = response.json()
+        expires_in = float(body.get('expires_in', 3600))
+        return body['access_token'], max(0.0, expires_in - TOKEN_EXPIRY_MARGIN_SECONDS)
+
+    def config(self) -> GatewayConfig:
+        return self._secret.get()
+
+    def gateway_url(self) -> str:
+        return self.config().gateway_url
+
+    def access_token(self) -> str:
+        return self._token.get()
+
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token()}"}
+
+    def prefetch(self):
+        """Warm the secret and token in the background (e.g. at container start)."""
+        def warm():
+            try:
+                self.access_token()
+            except Exception:
+                pass  # already logged; the first request retries
+        threading.Thread(target=warm, daemon=True, name='mcp-auth-prefetch').start()
+
+    def invalidate_token(self):
+        """Drop the cached token, e.g. after the gateway answered 401."""
+        self._token.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'secret_loads': self._secret.loads,
+            'secret_hits': self._secret.hits,
+            'token_loads': self._token.loads,
+            'token_hits': self._token.hits,
+            'token_remaining_seconds': round(self._token.remaining()),
+        }
+
+
+_provider: Optional[AuthProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_auth_provider() -> AuthProvider:
+    """Process-wide provider (kept warm across AgentCore invocations)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = AuthProvider()
+        return _provider
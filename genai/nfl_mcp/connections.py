@@ -0,0 +1,284 @@
+# connections.py
+"""
+Process-level MCP connections to the NFL gateway, kept warm across invocations.
+
+Each analyst request used to build a streamable HTTP transport and an
+MCPClient, run the MCP handshake and page through `list_tools_sync` before the
+model could start. `MCPConnectionManager` keeps one started client per gateway
+URL and hands it out with `lease()`:
+
+    with get_connection_manager().lease() as connection:
+        agent = create_strands_agent(..., tools=connection.tools)
+
+- Concurrent invocations share the client (MCP requests are multiplexed over
+  one session); a lease only pins the connection so it is not stopped while in use.
+- A background thread re-lists the tools every `MCP_HEALTH_CHECK_SECONDS`,
+  which doubles as the health check. A failed check, a connection error inside
+  a lease (e.g. "Response ended prematurely") or a new access token retires the
+  connection; the next lease reconnects and retired clients are stopped once
+  their last lease ends.
+- After a reconnect the cached tool definitions (younger than
+  `MCP_TOOL_LIST_TTL_SECONDS`) are bound to the new client instead of listed again.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from nfl_athena.tracing import span
+from nfl_mcp.auth import AuthProvider, get_auth_provider
+
+# Configuration (override with environment variables)
+TOOL_LIST_TTL_SECONDS = float(os.environ.get('MCP_TOOL_LIST_TTL_SECONDS', 300))
+HEALTH_CHECK_SECONDS = float(os.environ.get('MCP_HEALTH_CHECK_SECONDS', 60))
+
+# Exception text that means the session is gone and the client must be rebuilt
+CONNECTION_ERRORS = (
+    'Response ended prematurely', 'ClosedResourceError', 'BrokenResourceError', 'Connection closed',
+    'Connection reset', 'RemoteProtocolError', 'session is not running', 'Unauthorized',
+)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    text = f"{type(error).__name__}: {error}"
+    return any(marker in text for marker in CONNECTION_ERRORS)
+
+
+def list_all_tools(client) -> List[Any]:
+    """List tools w/ support for pagination"""
+    tools = []
+    pagination_token = None
+    with span('mcp.list_tools') as trace_span:
+        while True:
+            page = client.list_tools_sync(pagination_token=pagination_token)
+            tools.extend(page)
+            pagination_token = page.pagination_token
+            if pagination_token is None:
+                trace_span.set(tools=len(tools))
+                return tools
+
+
+def _default_client_factory(gateway_url: str, access_token: str):
+    from mcp.client.streamable_http import streamablehttp_client
+    from strands.tools.mcp.mcp_client import MCPClient
+
+    return MCPClient(lambda: streamablehttp_client(gateway_url, headers={"Authorization": f"Bearer {access_token}"}))
+
+
+def _rebind_tools(tools: List[Any], client) -> List[Any]:
+    """Bind cached tool definitions to a new client (no list_tools round trip)."""
+    from strands.tools.mcp.mcp_agent_tool import MCPAgentTool
+
+    return [MCPAgentTool(tool.mcp_tool, client) for tool in tools]
+
+
+class MCPConnection:
+    """A started MCPClient, its tools and the leases currently using it."""
+
+    def __init__(self, gateway_url: str, client, access_token: str, tools: List[Any]):
+        self.gateway_url = gateway_url
+        self.client = client
+        self.access_token = access_token
+        self.tools = tools
+        self.tools_listed_at = time.monotonic()
+        self.checked_at = self.tools_listed_at
+        self.created_at = self.tools_listed_at
+        self.leases = 0
+        self.retired = False
+
+    @property
+    def tool_names(self) -> List[str]:
+        return [tool.tool_name for tool in self.tools]
+
+
+class MCPConnectionManager:
+    """Warm MCP clients per gateway URL with cached tool listings."""
+
+    def __init__(self,
+                 auth: Optional[AuthProvider] = None,
+                 client_factory: Callable[[str, str], Any] = _default_client_factory,
+                 rebind_tools: Callable[[List[Any], Any], List[Any]] = _rebind_tools,
+                 tool_list_ttl: float = TOOL_LIST_TTL_SECONDS,
+                 health_check_interval: float = HEALTH_CHECK_SECONDS):
+        self.auth = auth or get_auth_provider()
+        self._client_factory = client_factory
+        self._rebind_tools = rebind_tools
+        self.tool_list_ttl = tool_list_ttl
+        self.health_check_interval = health_check_interval
+        self._connections: Dict[str, MCPConnection] = {}
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._tool_cache: Dict[str, Tuple[List[Any], float]] = {}  # URL -> (tools, listed at)
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self.stats = {'connects': 0, 'reconnects': 0, 'reused': 0, 'tool_lists': 0, 'tool_rebinds': 0,
+                      'health_failures': 0}
+
+    # --- leasing ---------------------------------------------------------------
+
+    @contextmanager
+    def lease(self, gateway_url: Optional[str] = None):
+        """Borrow the warm connection for a gateway (connecting first if needed)."""
+        connection = self.acquire(gateway_url)
+        try:
+            yield connection
+        except BaseException as e:
+            self.report_error(connection, e)
+            raise
+        finally:
+            self.release(connection)
+
+    def report_error(self, connection: MCPConnection, error: BaseException) -> bool:
+        """Retire the connection if the error means its session is gone; returns True if retired."""
+        if not is_connection_error(error):
+            return False
+        print(f"🔧 MCP connection lost ({error}) - reconnecting on next use")
+        if 'Unauthorized' in str(error):
+            self.auth.invalidate_token()
+        self._retire(connection)
+        return True
+
+    def acquire(self, gateway_url: Optional[str] = None) -> MCPConnection:
+        with span('mcp.lease') as trace_span:
+            gateway_url = gateway_url or self.auth.gateway_url()
+            access_token = self.auth.access_token()
+            with self._url_lock(gateway_url):  # one connect per URL; other callers wait for it
+                with self._lock:
+                    connection = self._connections.get(gateway_url)
+                    if connection and not connection.retired and connection.access_token == access_token:
+                        connection.leases += 1
+                        self.stats['reused'] += 1
+                        trace_span.set(reused=True, tools=len(connection.tools))
+                        return connection
+                if connection is not None:
+                    self._retire(connection)  # broken or its token was replaced
+                connection = self._connect(gateway_url, access_token)
+                with self._lock:
+                    self._connections[gateway_url] = connection
+                    connection.leases += 1
+            trace_span.set(reused=False, tools=len(connection.tools))
+        self._ensure_monitor()
+        return connection
+
+    def release(self, connection: MCPConnection):
+        with self._lock:
+            connection.leases -= 1
+            stop = connection.retired and connection.leases <= 0
+        if stop:
+            self._stop(connection)
+
+    def prewarm(self, gateway_url: Optional[str] = None):
+        """Connect and list tools in the background (e.g. at container start)."""
+        def warm():
+            try:
+                self.release(self.acquire(gateway_url))
+            except Exception as e:
+                print(f"❌ MCP prewarm failed: {e}")
+        threading.Thread(target=warm, daemon=True, name='mcp-prewarm').start()
+
+    def close(self):
+        self._stopped.set()
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            self._retire(connection)
+
+    # --- internals -------------------------------------------------------------
+
+    def _url_lock(self, gateway_url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(gateway_url, threading.Lock())
+
+    def _connect(self, gateway_url: str, access_token: str) -> MCPConnection:
+        start = time.perf_counter()
+        client = self._client_factory(gateway_url, access_token)
+        with span('mcp.connect'):
+            client.start()
+        cached = self._tool_cache.get(gateway_url)
+        self.stats['reconnects' if cached else 'connects'] += 1
+
+        if cached and time.monotonic() - cached[1] < self.tool_list_ttl:
+            try:
+                connection = MCPConnection(gateway_url, client, access_token, self._rebind_tools(cached[0], client))
+                connection.tools_listed_at = cached[1]
+                self.stats['tool_rebinds'] += 1
+                print(f"🔧 MCP reconnected in {(time.perf_counter() - start) * 1000:.0f} ms (cached tools)")
+                return connection
+            except Exception as e:
+                print(f"🔧 Could not reuse cached MCP tools ({e}) - listing again")
+
+        try:
+            tools = list_all_tools(client)
+        except Exception:
+            self._stop_client(client)
+            raise
+        self.stats['tool_lists'] += 1
+        connection = MCPConnection(gateway_url, client, access_token, tools)
+        self._tool_cache[gateway_url] = (tools, connection.tools_listed_at)
+        print(f"🔧 MCP connected in {(time.perf_counter() - start) * 1000:.0f} ms: {connection.tool_names}")
+        return connection
+
+    def _retire(self, connection: MCPConnection):
+        with self._lock:
+            connection.retired = True
+            if self._connections.get(connection.gateway_url) is connection:
+                del self._connections[connection.gateway_url]
+            stop = connection.leases <= 0
+        if stop:
+            self._stop(connection)
+
+    def _stop(self, connection: MCPConnection):
+        self._stop_client(connection.client)
+
+    @staticmethod
+    def _stop_client(client):
+        try:
+            client.stop(None, None, None)
+        except Exception as e:
+            print(f"DEBUG: Error stopping MCP client: {e}")
+
+    def _ensure_monitor(self):
+        with self._lock:
+            if self._monitor is not None or not self.health_check_interval:
+                return
+            self._monitor = threading.Thread(target=self._monitor_loop, daemon=True, name='mcp-health')
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        while not self._stopped.wait(self.health_check_interval):
+            with self._lock:
+                connections = list(self._connections.values())
+            for connection in connections:
+                self.check(connection)
+
+    def check(self, connection: MCPConnection) -> bool:
+        """Health check: re-list the tools; a failure retires the connection."""
+        try:
+            tools = list_all_tools(connection.client)
+        except Exception as e:
+            self.stats['health_failures'] += 1
+            print(f"🔧 MCP health check failed for {connection.gateway_url}: {e}")
+            self._retire(connection)
+            return False
+        with self._lock:
+            connection.tools = tools
+            connection.tools_listed_at = connection.checked_at = time.monotonic()
+            self._tool_cache[connection.gateway_url] = (tools, connection.tools_listed_at)
+            self.stats['tool_lists'] += 1
+        return True
+
+
+_manager: Optional[MCPConnectionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> MCPConnectionManager:
+    """Process-wide manager (kept warm across AgentCore invocations)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MCPConnectionManager()
+        return _manager
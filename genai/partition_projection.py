@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Generate and validate partition projection for the nfl_season-partitioned tables.
+
+Usage (from the genai directory):
+    uv run partition_projection.py generate                 # write database/partition_projection.sql
+    AWS_PROFILE=nfl uv run partition_projection.py validate  # check templates against S3
+    uv run partition_projection.py validate --mirror /data/s3-mirror
+
+The local mirror is laid out as <mirror>/<bucket>/<key>, e.g.
+<mirror>/alt-nfl-database/player_stats/nfl_season=2024/.
+Apply the generated ALTER TABLE statements only after validation passes.
+"""
+
+import argparse
+import os
+import sys
+
+from nfl_athena.catalog import DEFAULT_DDL_DIR
+from nfl_athena.cost import FIRST_SEASON
+from nfl_athena.projection import HIVE_TEMPLATE, local_lister, projection_script, s3_lister, validate_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['generate', 'validate'])
+    parser.add_argument('--first-season', type=int, default=FIRST_SEASON)
+    parser.add_argument('--layout', default=HIVE_TEMPLATE,
+                        help="Partition folder layout (default: nfl_season=${nfl_season})")
+    parser.add_argument('--mirror', help='Validate against a local mirror instead of S3')
+    parser.add_argument('--output', default=os.path.join(DEFAULT_DDL_DIR, 'partition_projection.sql'))
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        script = projection_script(first_season=args.first_season, layout=args.layout)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(script)
+        print(f"✅ Wrote {args.output}")
+        return
+
+    if args.mirror:
+        list_prefixes = local_lister(args.mirror)
+    else:
+        import boto3
+        list_prefixes = s3_lister(boto3.client('s3', region_name='us-east-1'))
+
+    reports = validate_all(list_prefixes, first_season=args.first_season, layout=args.layout)
+    failed = False
+    for report in reports:
+        icon = "✅" if report['ok'] else "❌"
+        print(f"{icon} {report['table']}: {report['found_partitions']} partitions match {report['template']}")
+        if report['unmatched_prefixes']:
+            failed = True
+            print(f"   Folders not covered by the template: {', '.join(report['unmatched_prefixes'][:5])}"
+                  + (" ..." if len(report['unmatched_prefixes']) > 5 else ""))
+        if not report['found_partitions']:
+            failed = True
+            print("   No partitions found at the projected locations")
+        if report['missing_seasons']:
+            print(f"   Seasons with no data (queries return nothing for these): {', '.join(report['missing_seasons'])}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Register the query templates (nfl_athena/templates.py) as Athena prepared statements.
+
+Usage (from the genai directory):
+    uv run prepared_statements.py list
+    uv run prepared_statements.py sql                      # PREPARE statements for the console
+    AWS_PROFILE=nfl uv run prepared_statements.py register # create or update them in the primary work group
+
+The nfl-data-service Lambda also registers a template on first use, so this
+is only needed to push a changed template before the next deployment.
+"""
+
+import argparse
+
+import boto3
+
+from nfl_athena.templates import TEMPLATES, describe_templates, ensure_prepared, prepare_statements_sql
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['list', 'sql', 'register'])
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for template in describe_templates():
+            print(f"{template['name']}: {template['description']}")
+            for name, spec in template['parameters'].items():
+                print(f"    {name} ({spec['type']}): {spec['description']}")
+        return
+
+    if args.command == 'sql':
+        print(prepare_statements_sql())
+        return
+
+    athena_client = boto3.client('athena', region_name='us-east-1')
+    for template in TEMPLATES.values():
+        changed = ensure_prepared(athena_client, template)
+        print(f"✅ {template.statement_name}: {'registered' if changed else 'up to date'}")
+
+
+if __name__ == "__main__":
+    main()
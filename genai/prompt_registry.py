@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+System prompts for every (personality, model), assembled once per process.
+
+get_system_prompt used to read rules.md and the personality prompt from disk
+for every agent it created. `PromptRegistry` reads the prompt files once,
+raises `PromptError` if one is missing or empty (instead of sending "Prompt
+file ... not found" to the model as the prompt), and assembles the final
+prompt - personality prompt with '[current model name]' filled in, then the
+rules - for each built-in personality and known model up front.
+
+With PROMPT_HOT_RELOAD=1 (local development) the files' mtimes are checked at
+most every PROMPT_RELOAD_CHECK_SECONDS and everything is rebuilt when one
+changes; a broken edit keeps the previous prompts.
+
+Usage (from the genai directory):
+    uv run prompt_registry.py      # size / token report per personality and model
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts')
+RULES_PROMPT = 'rules'
+MODEL_PLACEHOLDER = '[current model name]'
+
+# Built-in personalities and the prompt file each one uses
+PERSONALITY_PROMPTS = {
+    'nfl_analyst': 'nfl_analyst',
+    'nfl_native_analyst': 'nfl_native_analyst',
+    'nfl_game_recap': 'nfl_tools',
+}
+
+# Models offered by the UI; others are assembled on first use
+MODELS = [
+    'us.amazon.nova-micro-v1:0',
+    'us.amazon.nova-pro-v1:0',
+    'us.amazon.nova-premier-v1:0',
+    'us.anthropic.claude-3-5-haiku-20241022-v1:0',
+    'us.anthropic.claude-sonnet-4-20250514-v1:0',
+]
+
+HOT_RELOAD = os.environ.get('PROMPT_HOT_RELOAD', '').lower() in ('1', 'true', 'yes')
+RELOAD_CHECK_SECONDS = float(os.environ.get('PROMPT_RELOAD_CHECK_SECONDS', 1))
+
+# Rough English-text ratio; good enough to compare prompts, not for billing
+CHARS_PER_TOKEN = 4
+
+
+class PromptError(RuntimeError):
+    """A prompt file is missing, unreadable or empty."""
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def assemble(base_prompt: str, rules: str, model: str) -> str:
+    """Personality prompt with the model name filled in, followed by the rules"""
+    return f"{base_prompt.replace(MODEL_PLACEHOLDER, model)}\n\n{rules}"
+
+
+class PromptRegistry:
+    """Prompt files and assembled system prompts, loaded once (or on change with hot reload)."""
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR, hot_reload: bool = HOT_RELOAD):
+        self.prompts_dir = prompts_dir
+        self.hot_reload = hot_reload
+        self._lock = threading.Lock()
+        self._files: Dict[str, str] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._prompts: Dict[Tuple[str, str], str] = {}
+        self._checked_at = 0.0
+        self.loads = 0
+        self.load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.prompts_dir, f"{name}.md")
+
+    def _read_all(self) -> Tuple[Dict[str, str], Dict[str, float]]:
+        files, mtimes = {}, {}
+        for name in [RULES_PROMPT, *sorted(set(PERSONALITY_PROMPTS.values()))]:
+            path = self._path(name)
+            try:
+                mtimes[name] = os.path.getmtime(path)
+                with open(path, 'r', encoding='utf-8') as f:
+                    files[name] = f.read().strip()
+            except OSError as e:
+                raise PromptError(f"Cannot load prompt file '{name}.md' from {self.prompts_dir}: {e}") from e
+            if not files[name]:
+                raise PromptError(f"Prompt file '{name}.md' is empty")
+        return files, mtimes
+
+    def load(self):
+        """(Re)read every prompt file and assemble all built-in (personality, model) prompts"""
+        files, mtimes = self._read_all()
+        prompts = {(personality, model): assemble(files[name], files[RULES_PROMPT], model)
+                   for personality, name in PERSONALITY_PROMPTS.items() for model in MODELS}
+        with self._lock:
+            self._files, self._mtimes, self._prompts = files, mtimes, prompts
+            self._checked_at = time.monotonic()
+            self.loads += 1
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        self._checked_at = now
+        try:
+            changed = any(os.path.getmtime(self._path(name)) != mtime for name, mtime in self._mtimes.items())
+        except OSError:
+            changed = True
+        if not changed:
+            return
+        try:
+            self.load()
+            print(f"🔧 Reloaded prompts from {self.prompts_dir}")
+        except PromptError as e:
+            print(f"❌ Prompt reload failed, keeping previous prompts: {e}")
+
+    def prompt_text(self, name: str) -> str:
+        """Raw content of a prompt file (without .md)"""
+        if self.hot_reload:
+            self._reload_if_changed()
+        if name not in self._files:
+            raise PromptError(f"Unknown prompt file '{name}.md'")
+        return self._files[name]
+
+    def system_prompt(self, personality: str, model: str) -> str:
+        """Assembled system prompt; a personality that is not built in is used as a custom prompt"""
+        if self.hot_reload:
+            self._reload_if_changed()
+        key = (personality, model)
+        prompt = self._prompts.get(key)
+        if prompt is not None:
+            return prompt
+        if personality not in PERSONALITY_PROMPTS:
+            return assemble(personality, self._files[RULES_PROMPT], model)
+        prompt = assemble(self._files[PERSONALITY_PROMPTS[personality]], self._files[RULES_PROMPT], model)
+        with self._lock:
+            self._prompts[key] = prompt
+        return prompt
+
+    def report(self, models: Optional[List[str]] = None) -> List[Dict[str, object]]:
+        """Size and estimated tokens of each assembled prompt"""
+        rows = []
+        for personality, name in PERSONALITY_PROMPTS.items():
+            for model in models or MODELS:
+                prompt = self.system_prompt(personality, model)
+                rows.append({
+                    'personality': personality,
+                    'model': model,
+                    'file': f"{name}.md",
+                    'chars': len(prompt),
+                    'bytes': len(prompt.encode('utf-8')),
+                    'est_tokens': estimate_tokens(prompt),
+                })
+        return rows
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide registry; the first call loads (and validates) every prompt file."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
+
+
+def main():
+    registry = get_prompt_registry()
+    rules = registry.prompt_text(RULES_PROMPT)
+    print(f"rules.md: {len(rules)} chars, ~{estimate_tokens(rules)} tokens (appended to every prompt)\n")
+    print(f"{'personality':<20} {'model':<45} {'chars':>7} {'bytes':>7} {'~tokens':>8}")
+    for row in registry.report():
+        print(f"{row['personality']:<20} {row['model']:<45} {row['chars']:>7} {row['bytes']:>7} {row['est_tokens']:>8}")
+
+
+if __name__ == "__main__":
+    main()
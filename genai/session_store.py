@@ -0,0 +1,438 @@
+"""
+Write-behind, compressed S3 session persistence.
+
+strands' S3SessionManager writes every message (and rewrites agent.json after
+it) with a synchronous PUT inside the streaming turn, and create_strands_agent
+builds a new one per request, which re-reads the whole history - one GET per
+message - before the first model call. `WriteBehindS3SessionManager` keeps the
+same S3 layout
+
+    s3://<bucket>/<username>/<model>/session_<id>/session.json
+                                     .../agents/agent_<id>/agent.json
+                                     .../agents/agent_<id>/messages/message_<n>.json
+
+but:
+
+- writes go to memory and a background `SessionWriter` PUTs them in batches
+  every `SESSION_FLUSH_INTERVAL_SECONDS`; repeated writes of one object (agent.json
+  after every message) collapse into one PUT. agent.py calls `flush_session`
+  before the "done" event, so a finished turn is on S3 before the client
+  sends the next one.
+- with `SESSION_COMPRESS=1`, message objects over `SESSION_COMPRESS_MIN_BYTES`
+  are stored gzip-compressed (ContentEncoding gzip, same key). strands'
+  S3SessionManager can't read those, so it is off by default and the
+  `SESSION_WRITE_BEHIND=0` rollback uses `GzipS3SessionManager`; reads here
+  accept both, so existing sessions load
+- recently active sessions stay in a process-wide LRU (`SESSION_CACHE_MAX_SESSIONS`,
+  `SESSION_CACHE_TTL_SECONDS`), so the next turn in the same container reads
+  only agent.json from S3: if its `updated_at` differs from the cached copy,
+  another container continued the session and the cache is dropped
+  (`SESSION_CACHE_VALIDATE=0` skips the check). A cold session's messages are
+  fetched concurrently
+
+A write still pending when the container dies is lost (at most one flush
+interval of a turn that was not finished); `SESSION_WRITE_BEHIND=0` goes back
+to S3SessionManager (as `GzipS3SessionManager`).
+"""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+from nfl_athena.tracing import current_span, span
+from strands.session.repository_session_manager import RepositorySessionManager
+from strands.session.s3_session_manager import S3SessionManager
+from strands.session.session_repository import SessionRepository
+from strands.types.exceptions import SessionException
+from strands.types.session import Session, SessionAgent, SessionMessage
+
+# Configuration (override with environment variables)
+WRITE_BEHIND_ENABLED = os.environ.get('SESSION_WRITE_BEHIND', 'true').lower() not in ('0', 'false', 'no')
+FLUSH_INTERVAL_SECONDS = float(os.environ.get('SESSION_FLUSH_INTERVAL_SECONDS', 0.5))
+FLUSH_TIMEOUT_SECONDS = float(os.environ.get('SESSION_FLUSH_TIMEOUT_SECONDS', 10))
+COMPRESS_ENABLED = os.environ.get('SESSION_COMPRESS', 'false').lower() in ('1', 'true', 'yes')
+COMPRESS_MIN_BYTES = int(os.environ.get('SESSION_COMPRESS_MIN_BYTES', 512))
+CACHE_MAX_SESSIONS = int(os.environ.get('SESSION_CACHE_MAX_SESSIONS', 128))
+CACHE_TTL_SECONDS = float(os.environ.get('SESSION_CACHE_TTL_SECONDS', 1800))
+CACHE_VALIDATE = os.environ.get('SESSION_CACHE_VALIDATE', 'true').lower() not in ('0', 'false', 'no')
+IO_WORKERS = int(os.environ.get('SESSION_IO_WORKERS', 8))
+MAX_ATTEMPTS = 3
+
+# Same names as strands.session.s3_session_manager
+SESSION_PREFIX = 'session_'
+AGENT_PREFIX = 'agent_'
+MESSAGE_PREFIX = 'message_'
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def encode(key: str, data: Dict[str, Any]) -> Tuple[bytes, Optional[str], int]:
+    """S3 body, ContentEncoding and uncompressed size for an object (messages are compressed with SESSION_COMPRESS)"""
+    body = json.dumps(data, default=str).encode('utf-8')
+    if COMPRESS_ENABLED and f"/messages/{MESSAGE_PREFIX}" in key and len(body) >= COMPRESS_MIN_BYTES:
+        return gzip.compress(body, compresslevel=6), 'gzip', len(body)
+    return body, None, len(body)
+
+
+def decode(body: bytes) -> Dict[str, Any]:
+    """Object body written by either session manager (plain or gzip JSON)"""
+    if body[:2] == _GZIP_MAGIC:
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+class SessionWriter:
+    """Background batches of pending PUTs, shared by every session in the process."""
+
+    def __init__(self, interval: float = FLUSH_INTERVAL_SECONDS, workers: int = IO_WORKERS):
+        self.interval = interval
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='nfl-session-io')
+        # (bucket, key) -> (client, data, session key, attempts); a newer write replaces a pending one
+        self._pending: 'OrderedDict[Tuple[str, str], Tuple[Any, Dict[str, Any], str, int]]' = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._flush_requested = False
+        self.stats = {'writes': 0, 'puts': 0, 'coalesced': 0, 'batches': 0, 'failed': 0,
+                      'bytes_raw': 0, 'bytes_stored': 0, 'write_ms': 0.0}
+
+    def put(self, client, bucket: str, key: str, data: Dict[str, Any], session_key: str):
+        with self._cond:
+            if (bucket, key) in self._pending:
+                self.stats['coalesced'] += 1
+            self._pending[(bucket, key)] = (client, data, session_key, 0)
+            self.stats['writes'] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='nfl-session-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pending(self, session_key: Optional[str] = None) -> int:
+        with self._cond:
+            return self._count(session_key)
+
+    def flush(self, session_key: Optional[str] = None, timeout: float = FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Write everything pending (for one session, or all) now; False if it did not finish in time"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._count(session_key):
+                self._flush_requested = True  # the writer stops waiting out the interval
+                self._cond.notify_all()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _count(self, session_key: Optional[str]) -> int:
+        if session_key is None:
+            return len(self._pending) + sum(self._in_flight.values())
+        return (sum(1 for entry in self._pending.values() if entry[2] == session_key)
+                + self._in_flight.get(session_key, 0))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Let the rest of the turn's writes arrive (and repeated ones collapse) unless flushed
+                deadline = time.monotonic() + self.interval
+                while not self._flush_requested and time.monotonic() < deadline:
+                    self._cond.wait(deadline - time.monotonic())
+                self._flush_requested = False
+                batch = list(self._pending.items())
+                self._pending.clear()
+                for _, (_, _, session_key, _) in batch:
+                    self._in_flight[session_key] = self._in_flight.get(session_key, 0) + 1
+            self._write_batch(batch)
+            with self._cond:
+                self._cond.notify_all()
+
+    def _write_batch(self, batch):
+        start = time.perf_counter()
+        futures = [(item, self._pool.submit(self._put_object, *item)) for item in batch]
+        for ((bucket, key), (client, data, session_key, attempts)), future in futures:
+            error = future.exception()
+            with self._cond:
+                self._in_flight[session_key] -= 1
+                if not self._in_flight[session_key]:
+                    del self._in_flight[session_key]
+                if error is None:
+                    continue
+                if attempts + 1 < MAX_ATTEMPTS and (bucket, key) not in self._pending:
+                    self._pending[(bucket, key)] = (client, data, session_key, attempts + 1)
+                else:
+                    self.stats['failed'] += 1
+                    print(f"❌ Session write failed for s3://{bucket}/{key}: {error}")
+        with self._cond:
+            self.stats['batches'] += 1
+            self.stats['write_ms'] = round(self.stats['write_ms'] + (time.perf_counter() - start) * 1000, 1)
+
+    def _put_object(self, bucket_key, entry):
+        bucket, key = bucket_key
+        client, data, _, _ = entry
+        body, content_encoding, raw_bytes = encode(key, data)
+        extra = {'ContentEncoding': content_encoding} if content_encoding else {}
+        client.put_object(Bucket=bucket, Key=key, Body=body, ContentType='application/json', **extra)
+        with self._cond:
+            self.stats['puts'] += 1
+            self.stats['bytes_raw'] += raw_bytes
+            self.stats['bytes_stored'] += len(body)
+
+
+class CachedSession:
+    """One session's objects as last written (or read)"""
+
+    def __init__(self):
+        self.session: Optional[Dict[str, Any]] = None
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.messages: Dict[str, Dict[int, Dict[str, Any]]] = {}  # agent ID -> message ID -> message
+        self.loaded_agents = set()  # agents whose message list is complete in memory
+        self.used_at = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class SessionCache:
+    """Process-wide LRU of recently active sessions."""
+
+    def __init__(self, max_sessions: int = CACHE_MAX_SESSIONS, ttl: float = CACHE_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: 'OrderedDict[str, CachedSession]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'warm': 0, 'cold': 0, 'stale': 0, 'evictions': 0}
+
+    def get(self, session_key: str, writer: SessionWriter) -> CachedSession:
+        with self._lock:
+            cached = self._sessions.get(session_key)
+            if cached is not None and time.monotonic() - cached.used_at > self.ttl and not writer.pending(session_key):
+                cached = None  # another container may have continued the session since
+            if cached is None:
+                cached = self._sessions[session_key] = CachedSession()
+                self.stats['cold'] += 1
+            else:
+                self.stats['warm'] += 1
+            self._sessions.move_to_end(session_key)
+            cached.used_at = time.monotonic()
+            for key in list(self._sessions)[:max(0, len(self._sessions) - self.max_sessions)]:
+                if not writer.pending(key):  # never drop a session with unwritten objects
+                    del self._sessions[key]
+                    self.stats['evictions'] += 1
+            return cached
+
+    def reset(self, session_key: str) -> CachedSession:
+        """Forget a session that changed on S3 since it was cached"""
+        with self._lock:
+            cached = self._sessions[session_key] = CachedSession()
+            self.stats['stale'] += 1
+            return cached
+
+
+_writer = SessionWriter()
+_cache = SessionCache()
+atexit.register(lambda: _writer.flush(timeout=FLUSH_TIMEOUT_SECONDS))
+
+
+def session_key(bucket: str, prefix: str, session_id: str) -> str:
+    return f"{bucket}/{prefix}/{SESSION_PREFIX}{session_id}"
+
+
+def flush_session(bucket: str, prefix: str, session_id: str, timeout: float = FLUSH_TIMEOUT_SECONDS) -> bool:
+    """Write a session's pending objects now (agent.py calls this before the "done" event)"""
+    start = time.perf_counter()
+    with span('session.flush') as trace_span:
+        done = _writer.flush(session_key(bucket, prefix, session_id), timeout)
+        trace_span.set(flushed=done, writer=dict(_writer.stats))
+    print(f"{'✅' if done else '❌'} Session flushed in {(time.perf_counter() - start) * 1000:.0f} ms"
+          f"{'' if done else ' (timed out; still writing in the background)'}")
+    return done
+
+
+class WriteBehindS3SessionManager(RepositorySessionManager, SessionRepository):
+    """S3 session manager with buffered, compressed writes and a warm in-memory cache"""
+
+    def __init__(self, session_id: str, bucket: str, prefix: str, client, **kwargs):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client
+        self._key = session_key(bucket, prefix, session_id)
+        self._cached = _cache.get(self._key, _writer)
+        if CACHE_VALIDATE and not self._is_current(session_id):
+            print(f"🔧 Session {session_id} changed on S3 since it was cached - reloading")
+            self._cached = _cache.reset(self._key)
+        super().__init__(session_id=session_id, session_repository=self, **kwargs)
+
+    def _is_current(self, session_id: str) -> bool:
+        """
+        Whether the cached agents still match S3 (one agent.json GET each). With
+        writes pending, ours are the newest and S3 is behind, so the cache stands.
+        """
+        with self._cached.lock:
+            agents = {agent_id: data.get('updated_at') for agent_id, data in self._cached.agents.items()}
+        if not agents or _writer.pending(self._key):
+            return True
+        for agent_id, updated_at in agents.items():
+            remote = self._read(f"{self._agent_path(session_id, agent_id)}agent.json")
+            if remote is None or remote.get('updated_at') != updated_at:
+                return False
+        return True
+
+    # S3 layout (same as strands' S3SessionManager)
+
+    def _session_path(self, session_id: str) -> str:
+        return f"{self.prefix}/{SESSION_PREFIX}{session_id}/"
+
+    def _agent_path(self, session_id: str, agent_id: str) -> str:
+        return f"{self._session_path(session_id)}agents/{AGENT_PREFIX}{agent_id}/"
+
+    def _message_key(self, session_id: str, agent_id: str, message_id: int) -> str:
+        return f"{self._agent_path(session_id, agent_id)}messages/{MESSAGE_PREFIX}{message_id}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            raise
+        return decode(response['Body'].read())
+
+    def _write(self, key: str, data: Dict[str, Any]):
+        _writer.put(self.client, self.bucket, key, data, self._key)
+
+    # SessionRepository
+
+    def create_session(self, session: Session, **kwargs) -> Session:
+        data = session.to_dict()
+        with self._cached.lock:
+            self._cached.session = data
+        self._write(f"{self._session_path(session.session_id)}session.json", data)
+        return session
+
+    def read_session(self, session_id: str, **kwargs) -> Optional[Session]:
+        with self._cached.lock:
+            if self._cached.session is None:
+                self._cached.session = self._read(f"{self._session_path(session_id)}session.json")
+            data = self._cached.session
+        return Session.from_dict(data) if data is not None else None
+
+    def delete_session(self, session_id: str, **kwargs) -> None:
+        prefix = self._session_path(session_id)
+        _writer.flush(self._key)
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if keys:
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': keys})
+        with self._cached.lock:
+            self._cached.session = None
+            self._cached.agents.clear()
+            self._cached.messages.clear()
+            self._cached.loaded_agents.clear()
+
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs) -> None:
+        data = session_agent.to_dict()
+        with self._cached.lock:
+            self._cached.agents[session_agent.agent_id] = data
+            self._cached.messages.setdefault(session_agent.agent_id, {})
+            self._cached.loaded_agents.add(session_agent.agent_id)  # a new agent has no messages on S3
+        self._write(f"{self._agent_path(session_id, session_agent.agent_id)}agent.json", data)
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs) -> Optional[SessionAgent]:
+        with self._cached.lock:
+            if agent_id not in self._cached.agents:
+                data = self._read(f"{self._agent_path(session_id, agent_id)}agent.json")
+                if data is None:
+                    return None
+                self._cached.agents[agent_id] = data
+            return SessionAgent.from_dict(self._cached.agents[agent_id])
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs) -> None:
+        previous = self.read_agent(session_id, session_agent.agent_id)
+        if previous is None:
+            raise ValueError(f"Agent {session_agent.agent_id} in session {session_id} does not exist")
+        session_agent.created_at = previous.created_at
+        session_agent.updated_at = _now()
+        data = session_agent.to_dict()
+        with self._cached.lock:
+            self._cached.agents[session_agent.agent_id] = data
+        self._write(f"{self._agent_path(session_id, session_agent.agent_id)}agent.json", data)
+
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs) -> None:
+        data = session_message.to_dict()
+        with self._cached.lock:
+            self._cached.messages.setdefault(agent_id, {})[session_message.message_id] = data
+        self._write(self._message_key(session_id, agent_id, session_message.message_id), data)
+
+    def read_message(self, session_id: str, agent_id: str, message_id: int, **kwargs) -> Optional[SessionMessage]:
+        with self._cached.lock:
+            data = self._cached.messages.get(agent_id, {}).get(message_id)
+        if data is None:
+            data = self._read(self._message_key(session_id, agent_id, message_id))
+        return SessionMessage.from_dict(data) if data is not None else None
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs) -> None:
+        previous = self.read_message(session_id, agent_id, session_message.message_id)
+        if previous is None:
+            raise ValueError(f"Message {session_message.message_id} does not exist")
+        session_message.created_at = previous.created_at
+        session_message.updated_at = _now()
+        self.create_message(session_id, agent_id, session_message)
+
+    def list_messages(self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0,
+                      **kwargs) -> List[SessionMessage]:
+        with self._cached.lock:
+            if agent_id not in self._cached.loaded_agents:
+                self._load_messages(session_id, agent_id)
+            messages = self._cached.messages.get(agent_id, {})
+            ordered = [messages[message_id] for message_id in sorted(messages)]
+        end = None if limit is None else offset + limit
+        return [SessionMessage.from_dict(data) for data in ordered[offset:end]]
+
+    def _load_messages(self, session_id: str, agent_id: str):
+        """Cold start: list the agent's messages and fetch them concurrently (caller holds the lock)"""
+        start = time.perf_counter()
+        prefix = f"{self._agent_path(session_id, agent_id)}messages/"
+        keys = []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            keys += [obj['Key'] for obj in page.get('Contents', [])
+                     if obj['Key'].endswith('.json') and MESSAGE_PREFIX in obj['Key']]
+        loaded = self._cached.messages.setdefault(agent_id, {})
+        for data in _writer._pool.map(self._read, keys):
+            if data is not None:
+                loaded.setdefault(data['message_id'], data)  # pending local writes are newer
+        self._cached.loaded_agents.add(agent_id)
+        current_span().set(session_messages_loaded=len(keys),
+                           session_load_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+class GzipS3SessionManager(S3SessionManager):
+    """strands' S3SessionManager that also reads the gzip message bodies written with SESSION_COMPRESS=1"""
+
+    def _read_s3_object(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return decode(response['Body'].read())
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                return None
+            raise SessionException(f"S3 error reading {key}: {e}") from e
+        except json.JSONDecodeError as e:
+            raise SessionException(f"Invalid JSON in S3 object {key}: {e}") from e
+
+
+def stats() -> Dict[str, Any]:
+    return {'writer': dict(_writer.stats), 'cache': dict(_cache.stats)}
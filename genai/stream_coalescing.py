@@ -0,0 +1,214 @@
+"""
+Coalesce the model's text deltas into fewer SSE token events.
+
+agent_invocation used to yield one {"type": "token"} event per text delta.
+Each event is its own SSE frame through AgentCore, the bedrock-agent-stream
+Lambda and the browser, so with fast models (Nova Micro streams a few
+characters per delta) the per-event overhead dominates. `coalesce_text`
+buffers deltas and flushes when:
+
+- it is the first delta of the response (time to first token is unchanged)
+- the buffer reaches `max_chars`
+- the oldest buffered delta is `max_delay_ms` old (flushed even if no new delta arrives)
+- the buffer ends a sentence or line (`sentence_flush`)
+
+Consumers concatenate token text, so coalescing is invisible to them. The
+defaults come from STREAM_COALESCE_* environment variables and a request can
+override them:
+
+    {"prompt": "...", "stream": {"coalesce": true, "max_chars": 64, "max_delay_ms": 30, "sentence_flush": true}}
+
+`stream_tokens` turns an agent's stream into these token events and closes
+the agent's stream when the deadline passes or the client goes away.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Dict, Optional
+
+from nfl_athena.tracing import span
+
+# Defaults (override with environment variables or per request)
+COALESCE_ENABLED = os.environ.get('STREAM_COALESCE', 'true').lower() not in ('0', 'false', 'no')
+COALESCE_MAX_CHARS = int(os.environ.get('STREAM_COALESCE_MAX_CHARS', 64))
+COALESCE_MAX_DELAY_MS = float(os.environ.get('STREAM_COALESCE_MAX_DELAY_MS', 30))
+COALESCE_SENTENCE_FLUSH = os.environ.get('STREAM_COALESCE_SENTENCE_FLUSH', 'true').lower() not in ('0', 'false', 'no')
+
+# Limits for per-request overrides
+MAX_CHARS_LIMIT = 4096
+MAX_DELAY_MS_LIMIT = 1000
+
+# A delta ending a sentence or line, or containing a boundary ("TDs.\nNext")
+_SENTENCE_BOUNDARY_RE = re.compile(r'[.!?:]\s|\n|[.!?:]$')
+
+
+@dataclass(frozen=True)
+class CoalesceConfig:
+    enabled: bool = COALESCE_ENABLED
+    max_chars: int = COALESCE_MAX_CHARS
+    max_delay_ms: float = COALESCE_MAX_DELAY_MS
+    sentence_flush: bool = COALESCE_SENTENCE_FLUSH
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'CoalesceConfig':
+        """Defaults overridden by the request's optional "stream" object (invalid values are ignored)"""
+        config = cls()
+        options = payload.get('stream')
+        if not isinstance(options, dict):
+            return config
+        if isinstance(options.get('coalesce'), bool):
+            config = replace(config, enabled=options['coalesce'])
+        if isinstance(options.get('sentence_flush'), bool):
+            config = replace(config, sentence_flush=options['sentence_flush'])
+        max_chars = options.get('max_chars')
+        if isinstance(max_chars, int) and not isinstance(max_chars, bool):
+            config = replace(config, max_chars=min(max(max_chars, 1), MAX_CHARS_LIMIT))
+        max_delay_ms = options.get('max_delay_ms')
+        if isinstance(max_delay_ms, (int, float)) and not isinstance(max_delay_ms, bool):
+            config = replace(config, max_delay_ms=min(max(float(max_delay_ms), 0.0), MAX_DELAY_MS_LIMIT))
+        return config
+
+
+class StreamStats:
+    """Deltas in, events out and their approximate SSE size"""
+
+    def __init__(self):
+        self.deltas = 0
+        self.events = 0
+        self.chars = 0
+        self.sse_bytes = 0
+
+    def record(self, text: str):
+        self.events += 1
+        self.chars += len(text)
+        self.sse_bytes += sse_size({"type": "token", "text": text})
+
+    def as_dict(self) -> Dict[str, int]:
+        return {'deltas': self.deltas, 'events': self.events, 'chars': self.chars, 'sse_bytes': self.sse_bytes}
+
+
+def sse_size(event: Dict[str, Any]) -> int:
+    """Bytes of one event framed as `data: <json>\\n\\n`"""
+    return len(b'data: \n\n') + len(json.dumps(event).encode('utf-8'))
+
+
+def _ends_sentence(text: str) -> bool:
+    return _SENTENCE_BOUNDARY_RE.search(text.rstrip(' ')) is not None
+
+
+async def coalesce_text(deltas: AsyncIterator[str], config: CoalesceConfig,
+                        stats: Optional[StreamStats] = None) -> AsyncIterator[str]:
+    """Yield the deltas regrouped according to config (unchanged when coalescing is off)"""
+    stats = stats or StreamStats()
+    if not config.enabled:
+        async for text in deltas:
+            stats.deltas += 1
+            stats.record(text)
+            yield text
+        return
+
+    # One producer task reads the deltas, so the agent's generator keeps a single context
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for text in deltas:
+                await queue.put((text, None))
+        except Exception as e:
+            await queue.put((None, e))
+            return
+        await queue.put((None, None))
+
+    producer = asyncio.ensure_future(produce())
+    max_delay = config.max_delay_ms / 1000
+    parts, size = [], 0
+    first = True
+    buffered_at = 0.0
+    try:
+        while True:
+            if parts:
+                # Wait for the next delta only until the buffered text is due
+                try:
+                    text, error = await asyncio.wait_for(queue.get(), max(0.0, buffered_at + max_delay - time.monotonic()))
+                except asyncio.TimeoutError:
+                    text = ''.join(parts)
+                    parts, size = [], 0
+                    stats.record(text)
+                    yield text
+                    continue
+            else:
+                text, error = await queue.get()
+            if error is not None:
+                raise error
+            if text is None:
+                break
+            stats.deltas += 1
+            if first:
+                first = False
+                stats.record(text)
+                yield text
+                continue
+            if not parts:
+                buffered_at = time.monotonic()
+            parts.append(text)
+            size += len(text)
+            if size >= config.max_chars or (config.sentence_flush and _ends_sentence(text)):
+                text = ''.join(parts)
+                parts, size = [], 0
+                stats.record(text)
+                yield text
+    finally:
+        if not producer.done():
+            # Let the producer unwind (and close the deltas it is reading) before returning,
+            # so the caller can close `deltas` afterwards without it still running
+            producer.cancel()
+            await asyncio.wait([producer])
+
+    if parts:
+        text = ''.join(parts)
+        stats.record(text)
+        yield text
+
+
+async def stream_tokens(agent, user_message, deadline, coalesce: Optional[CoalesceConfig] = None
+                        ) -> AsyncIterator[Dict[str, Any]]:
+    """Yield (coalesced) token events until the agent finishes or the request deadline passes"""
+    stats = StreamStats()
+    stream_span = span('agent.stream')
+
+    async def text_deltas():
+        start = time.perf_counter()
+        first = True
+        events = agent.stream_async(user_message)
+        try:
+            async for event in events:
+                txt = event.get("data")
+                if isinstance(txt, str) and txt:
+                    if first:
+                        first = False
+                        stream_span.set(ttft_ms=round((time.perf_counter() - start) * 1000, 1))  # Bedrock time to first token
+                    yield txt
+                if deadline.expired():
+                    return
+        finally:
+            # Past the deadline (or on disconnect) stop the event loop and its model/tool work now, not at GC
+            await events.aclose()
+
+    deltas = text_deltas()
+    tokens = coalesce_text(deltas, coalesce or CoalesceConfig(), stats)
+    try:
+        with stream_span:
+            async for text in tokens:
+                yield {"type": "token", "text": text}
+            stream_span.set(**stats.as_dict())
+    finally:
+        # Coalescer first: its producer task may still be inside deltas.__anext__
+        await tokens.aclose()
+        await deltas.aclose()
+    if deadline.expired():
+        deadline.cancel('time budget exceeded')
+        yield {"type": "error", "message": f"Request {deadline.describe()}"}
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Mirror nfl_stats_database tables from S3 for the embedded DuckDB engine.
+
+Usage (from the genai directory):
+    AWS_PROFILE=nfl uv run sync_local_mirror.py                     # small tables only
+    AWS_PROFILE=nfl uv run sync_local_mirror.py --table player_stats
+    AWS_PROFILE=nfl uv run sync_local_mirror.py --all               # everything (~600 MB)
+    uv run sync_local_mirror.py --status
+
+The mirror lives in LOCAL_MIRROR_DIR (default ~/.nfl-mirror). Once a table is
+mirrored, query_athena answers queries over it locally; set
+LOCAL_ENGINE_MODE=offline to run without AWS at all. Requires `uv pip install duckdb`.
+"""
+
+import argparse
+import time
+
+from nfl_athena.catalog import load_catalog
+from nfl_athena.local_engine import LOCAL_MAX_BYTES, LOCAL_MIRROR_DIR, mirror_status, sync_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--table', action='append', help='Table to mirror (repeatable)')
+    parser.add_argument('--all', action='store_true', help='Mirror every table in genai/database')
+    parser.add_argument('--status', action='store_true', help='Show what is mirrored and exit')
+    args = parser.parse_args()
+
+    catalog = load_catalog()
+
+    if args.status:
+        print(f"Mirror: {LOCAL_MIRROR_DIR}")
+        for name in sorted(catalog):
+            status = mirror_status(name)
+            if status:
+                synced = time.strftime('%Y-%m-%d %H:%M', time.localtime(status['synced_at']))
+                print(f"✅ {name}: {status.get('objects', '?')} objects, {status.get('bytes', 0) / 1024 / 1024:.1f} MB (synced {synced})")
+            else:
+                print(f"   {name}: not mirrored")
+        return
+
+    if args.table:
+        names = args.table
+    elif args.all:
+        names = sorted(catalog)
+    else:
+        names = sorted(name for name, table in catalog.items() if 0 < table.size_bytes <= LOCAL_MAX_BYTES)
+
+    import boto3
+    s3_client = boto3.client('s3', region_name='us-east-1')
+    for name in names:
+        if name not in catalog:
+            print(f"❌ {name}: not found in genai/database")
+            continue
+        start = time.time()
+        status = sync_table(catalog[name], s3_client)
+        print(f"✅ {name}: {status['objects']} objects, {status['bytes'] / 1024 / 1024:.1f} MB "
+              f"in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
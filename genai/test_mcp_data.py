@@ -1,6 +1,5 @@
-import boto3
 import json
-import requests
+from nfl_mcp.auth import get_auth_provider
 from strands.tools.mcp.mcp_client import MCPClient
 from mcp.client.streamable_http import streamablehttp_client
 import uuid
@@ -8,24 +7,10 @@ import uuid
 def test_mcp_data():
     """Test just the MCP data service function directly"""
     
-    # Get MCP credentials
-    secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-    sec_valu = secrets_client.get_secret_value(SecretId='nfl_mcp_auth')
-    secret_data = json.loads(sec_valu['SecretString'])
-    
-    client_info = secret_data['client_info']
-    CLIENT_ID = client_info['client_id']
-    CLIENT_SECRET = client_info['client_secret']
-    TOKEN_URL = client_info['token_endpoint']
-    gateway_url = secret_data['gateway_url']
-    
-    # Get access token
-    response = requests.post(
-        TOKEN_URL,
-        data=f"grant_type=client_credentials&client_id={CLIENT_ID}&client_secret={CLIENT_SECRET}",
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
-    )
-    access_token = response.json()['access_token']
+    # Get MCP credentials (cached secret + access token)
+    auth = get_auth_provider()
+    gateway_url = auth.gateway_url()
+    access_token = auth.access_token()
     
     # Create MCP client
     transport = streamablehttp_client(gateway_url, headers={"Authorization": f"Bearer {access_token}"})
@@ -1,32 +1,17 @@
-import boto3
 import json
-import requests
+from nfl_mcp.auth import get_auth_provider
 from strands.tools.mcp.mcp_client import MCPClient
 from mcp.client.streamable_http import streamablehttp_client
 
 def test_mcp_knowledge():
     """Test just the MCP knowledge base function directly"""
     
-    # Get MCP credentials
-    secrets_client = boto3.client('secretsmanager', region_name='us-east-1')
-    sec_valu = secrets_client.get_secret_value(SecretId='nfl_mcp_auth')
-    secret_data = json.loads(sec_valu['SecretString'])
-    
-    client_info = secret_data['client_info']
-    CLIENT_ID = client_info['client_id']
-    CLIENT_SECRET = client_info['client_secret']
-    TOKEN_URL = client_info['token_endpoint']
-    gateway_url = secret_data['gateway_url']
+    # Get MCP credentials (cached secret + access token)
+    auth = get_auth_provider()
+    gateway_url = auth.gateway_url()
+    access_token = auth.access_token()
     
     print(f"Gateway URL: {gateway_url}")
-    
-    # Get access token
-    response = requests.post(
-        TOKEN_URL,
-        data=f"grant_type=client_credentials&client_id={CLIENT_ID}&client_secret={CLIENT_SECRET}",
-        headers={'Content-Type': 'application/x-www-form-urlencoded'}
-    )
-    access_token = response.json()['access_token']
     print(f"Got access token: {access_token[:20]}...")
     
     # Create MCP client
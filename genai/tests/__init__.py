@@ -0,0 +1,3 @@
+# __init__.py
+# Offline tests. Run from the genai directory, e.g.:
+#   uv run --with pytest python -m pytest tests
@@ -0,0 +1,70 @@
+"""Concurrent batches: a failed statement's retry is polled with the rest of the batch (offline)."""
+
+import itertools
+
+from nfl_athena.batch import iter_batch
+
+
+class FakeAthena:
+    """Each execution finishes after `polls` batch_get rounds; SQL containing 'parquet' fails"""
+
+    def __init__(self, polls):
+        self.polls = polls
+        self.executions = {}
+        self.ids = itertools.count()
+        self.started = []
+        self.rounds = []
+
+    def start_query_execution(self, QueryString, **kwargs):
+        query_execution_id = f'q{next(self.ids)}'
+        self.executions[query_execution_id] = [QueryString, self.polls.get(QueryString, 1)]
+        self.started.append(QueryString)
+        return {'QueryExecutionId': query_execution_id}
+
+    def batch_get_query_execution(self, QueryExecutionIds):
+        self.rounds.append(list(QueryExecutionIds))
+        executions = []
+        for query_execution_id in QueryExecutionIds:
+            execution = self.executions[query_execution_id]
+            execution[1] -= 1
+            if execution[1] > 0:
+                state = 'RUNNING'
+            else:
+                state = 'FAILED' if 'parquet' in execution[0] else 'SUCCEEDED'
+            executions.append({'QueryExecutionId': query_execution_id,
+                               'Status': {'State': state, 'StateChangeReason': 'TYPE_MISMATCH'}})
+        return {'QueryExecutions': executions}
+
+
+def run(athena, statements, retry=None):
+    return [(index, execution['QueryExecutionId'], execution['Status']['State'])
+            for index, execution, _ in iter_batch(athena, statements, poll_interval=0, max_poll_interval=0,
+                                                  retry=retry)]
+
+
+def test_retry_is_polled_with_the_rest_of_the_batch():
+    athena = FakeAthena({'slow': 4})
+    retried = []
+
+    def retry(index, execution):
+        retried.append(index)
+        return 'select from csv'
+
+    results = run(athena, ['select from parquet', 'slow'], retry)
+    assert retried == [0]
+    assert results == [(0, 'q2', 'SUCCEEDED'), (1, 'q1', 'SUCCEEDED')]
+    assert athena.started == ['select from parquet', 'slow', 'select from csv']
+    assert ['q1', 'q2'] in athena.rounds  # the retry did not wait for the slow statement, nor block it
+
+
+def test_failure_without_retry_sql_is_yielded():
+    athena = FakeAthena({})
+    results = run(athena, ['select from parquet'], retry=lambda index, execution: None)
+    assert results == [(0, 'q0', 'FAILED')]
+
+
+def test_retry_runs_once():
+    athena = FakeAthena({})
+    results = run(athena, ['select from parquet'], retry=lambda index, execution: 'select from parquet again')
+    assert results == [(0, 'q1', 'FAILED')]
+    assert len(athena.started) == 2
@@ -0,0 +1,84 @@
+"""Local engine: Athena dialect alignment and concurrent mirroring (offline)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+duckdb = pytest.importorskip('duckdb')
+
+from nfl_athena.catalog import TableInfo
+from nfl_athena.local_engine import LocalEngine, mirror_status, sync_table
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return LocalEngine(catalog={}, mirror_dir=str(tmp_path))
+
+
+def scalar(engine, sql):
+    return engine.execute(sql).columns[0].to_list()[0]
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT 7 / 2", 3),                           # integer division, as in Athena
+    ("SELECT -7 / 2", -3),                         # truncates toward zero
+    ("SELECT CAST(7 AS double) / 2", 3.5),
+    ("SELECT 7 / 2.0", 3.5),
+    ("SELECT avg(x) / 2 FROM (VALUES (7), (8)) t(x)", 3.75),
+])
+def test_division_matches_athena(engine, sql, expected):
+    assert scalar(engine, sql) == expected
+
+
+def test_division_by_zero_is_null_locally(engine):
+    # Known difference: Athena fails with "Division by zero"
+    assert scalar(engine, "SELECT 7 / 0") is None
+
+
+def test_presto_only_function_fails_locally(engine):
+    # Known difference: execute_local falls back to Athena on errors like this
+    with pytest.raises(Exception):
+        engine.execute("SELECT date_parse('2024-09-08', '%Y-%m-%d')")
+
+
+class SlowS3:
+    """list_objects_v2 paginator + download_file over a fixed set of keys"""
+
+    def __init__(self, keys):
+        self.keys = keys
+
+    def get_paginator(self, name):
+        return self
+
+    def paginate(self, Bucket, Prefix):
+        yield {'Contents': [{'Key': Prefix + key, 'Size': 1} for key in self.keys]}
+
+    def download_file(self, bucket, key, path):
+        time.sleep(0.01)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(key)
+
+
+def test_concurrent_syncs_of_one_table(tmp_path):
+    table = TableInfo('team_mapping', [('team', 'string')], location='s3://bucket/team_mapping/')
+    keys = [f'part-{i}.csv' for i in range(5)]
+    errors = []
+
+    def sync():
+        try:
+            sync_table(table, SlowS3(keys), str(tmp_path))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=sync) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sorted(os.listdir(tmp_path / 'bucket' / 'team_mapping')) == keys
+    assert os.listdir(tmp_path / 'bucket') == ['team_mapping']  # no staging dirs left behind
+    assert mirror_status('team_mapping', str(tmp_path))['objects'] == 5
@@ -0,0 +1,41 @@
+"""Typed result decoding: timestamps with a zone or offset land on the same UTC instant."""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from nfl_athena.results import Column
+
+KICKOFF_UTC = '2024-09-08 17:00:00.000'
+
+
+@pytest.mark.parametrize('value', [
+    datetime(2024, 9, 8, 13, 0, tzinfo=timezone(timedelta(hours=-4))),   # 1 pm EDT
+    datetime(2024, 9, 8, 13, 0, tzinfo=ZoneInfo('America/New_York')),
+    datetime(2024, 9, 8, 19, 0, tzinfo=timezone(timedelta(hours=2))),
+    datetime(2024, 9, 8, 17, 0, tzinfo=timezone.utc),
+])
+def test_aware_values_are_converted_to_utc(value):
+    column = Column('kickoff', 'timestamp with time zone')
+    column.extend_values([value])
+    assert column.value(0) == f'{KICKOFF_UTC} UTC'
+
+
+def test_naive_values_are_kept():
+    column = Column('kickoff', 'timestamp')
+    column.extend_values([datetime(2024, 9, 8, 17, 0), None])
+    assert column.to_list() == [KICKOFF_UTC, None]
+
+
+@pytest.mark.parametrize('text', [
+    '2024-09-08 13:00:00.000 America/New_York',
+    '2024-09-08 13:00:00.000 -04:00',
+    '2024-09-08 17:00:00.000 UTC',
+])
+def test_values_and_text_agree(text):
+    parsed = Column('kickoff', 'timestamp with time zone')
+    parsed.extend([text])
+    typed = Column('kickoff', 'timestamp with time zone')
+    typed.extend_values([datetime(2024, 9, 8, 13, 0, tzinfo=timezone(timedelta(hours=-4)))])
+    assert parsed.value(0) == typed.value(0)
@@ -0,0 +1,90 @@
+"""Session store: objects written behind stay readable by strands' S3SessionManager (the rollback path)."""
+
+import io
+import uuid
+
+import pytest
+
+pytest.importorskip('strands')
+
+from botocore.exceptions import ClientError
+from strands.session.s3_session_manager import S3SessionManager
+from strands.types.exceptions import SessionException
+from strands.types.session import SessionAgent, SessionMessage
+
+import session_store
+from session_store import GzipS3SessionManager, WriteBehindS3SessionManager, flush_session
+
+BUCKET = 'sessions'
+PREFIX = 'alice/nova-micro'
+
+
+class FakeS3:
+    """The S3 calls both session managers make, on a dict"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = (Body, kwargs.get('ContentEncoding'))
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+        return {'Body': io.BytesIO(self.objects[(Bucket, Key)][0])}
+
+    def list_objects_v2(self, Bucket, Prefix, **kwargs):
+        keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        return {'Contents': [{'Key': key} for key in keys]} if keys else {}
+
+    def get_paginator(self, operation):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                yield s3.list_objects_v2(**kwargs)
+        return Paginator()
+
+
+class FakeBotoSession:
+    def __init__(self, client):
+        self._client = client
+
+    def client(self, **kwargs):
+        return self._client
+
+
+def write_behind(s3, session_id, texts):
+    manager = WriteBehindS3SessionManager(session_id=session_id, bucket=BUCKET, prefix=PREFIX, client=s3)
+    manager.create_agent(session_id, SessionAgent(agent_id='default', state={}, conversation_manager_state={}))
+    for index, text in enumerate(texts):
+        message = {'role': 'user' if index % 2 == 0 else 'assistant', 'content': [{'text': text}]}
+        manager.create_message(session_id, 'default', SessionMessage(message=message, message_id=index))
+    assert flush_session(BUCKET, PREFIX, session_id)
+
+
+def read_back(manager_class, s3, session_id):
+    manager = manager_class(session_id=session_id, bucket=BUCKET, prefix=PREFIX, boto_session=FakeBotoSession(s3))
+    return [message.message['content'][0]['text'] for message in manager.list_messages(session_id, 'default')]
+
+
+TEXTS = ['How many TDs did Mahomes throw in 2024?', 'Patrick Mahomes threw 26 touchdown passes. ' * 40]
+
+
+def test_stock_manager_reads_write_behind_sessions():
+    s3 = FakeS3()
+    session_id = uuid.uuid4().hex
+    write_behind(s3, session_id, TEXTS)
+    assert all(encoding is None for _, encoding in s3.objects.values())
+    assert read_back(S3SessionManager, s3, session_id) == TEXTS
+
+
+def test_rollback_manager_reads_compressed_sessions(monkeypatch):
+    monkeypatch.setattr(session_store, 'COMPRESS_ENABLED', True)
+    s3 = FakeS3()
+    session_id = uuid.uuid4().hex
+    write_behind(s3, session_id, TEXTS)
+    assert 'gzip' in {encoding for _, encoding in s3.objects.values()}
+    with pytest.raises((SessionException, UnicodeDecodeError)):  # what the stock manager does with gzip
+        read_back(S3SessionManager, s3, session_id)
+    assert read_back(GzipS3SessionManager, s3, session_id) == TEXTS
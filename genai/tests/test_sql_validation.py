@@ -0,0 +1,110 @@
+"""validate_sql: the read-only check in front of query_athena and the nfl-data-service Lambda."""
+
+import uuid
+
+import pytest
+
+from nfl_athena import sql_validation
+from nfl_athena.sql_validation import FORBIDDEN_KEYWORDS, validate_sql
+
+ONLY_SELECT = 'Only SELECT queries are allowed for security reasons'
+ONE_STATEMENT = 'Only one SQL statement is allowed per query'
+
+ALLOWED = [
+    # keywords inside string literals
+    "SELECT * FROM play_by_play WHERE play_text LIKE '%drop%'",
+    "SELECT 'DELETE FROM player_stats' AS note",
+    "SELECT * FROM t WHERE desc = 'it''s a DROP kick'",
+    # keywords inside comments
+    "SELECT 1 -- DROP TABLE player_stats",
+    "/* DELETE FROM player_stats */ SELECT 1",
+    "SELECT 1 /* ; INSERT INTO t VALUES (1) */",
+    "SELECT 1 -- ; DROP TABLE t",
+    # quoted identifiers and identifiers containing keywords
+    'SELECT "drop", `update` FROM t',
+    "SELECT created_at, updated_at, dropped_passes, insert_ts FROM t",
+    # statement shapes
+    "select * from clean_schedule",
+    "WITH cte AS (SELECT 1 AS x) SELECT x FROM cte",
+    "VALUES (1, 2)",
+    "SELECT 1;",
+    "SELECT 1;;",
+    "SELECT 1; -- trailing comment",
+    "EXPLAIN SELECT * FROM player_stats",
+    "EXPLAIN ANALYZE SELECT * FROM player_stats",
+    "EXPLAIN ANALYZE VERBOSE SELECT 1",
+    "EXPLAIN (FORMAT JSON) SELECT 1",
+    "(SELECT 1) UNION (SELECT 2)",
+    "((SELECT 1))",
+    "SELECT * FROM t WHERE x IN (SELECT 1) UNION ALL SELECT 1 FROM u; ",
+]
+
+REJECTED = [
+    ("", 'SQL query is required'),
+    ("   ", 'SQL query is required'),
+    (";", 'SQL query is required'),
+    # more than one statement, including after a comment
+    ("SELECT 1; DROP TABLE t", ONE_STATEMENT),
+    ("SELECT 1; -- comment\nDROP TABLE t", ONE_STATEMENT),
+    ("SELECT 1; /* comment */ DELETE FROM t", ONE_STATEMENT),
+    ("SELECT 1 -- comment\n; SELECT 2", ONE_STATEMENT),
+    # not a read
+    ("DROP TABLE player_stats", ONLY_SELECT),
+    ("SHOW TABLES", ONLY_SELECT),
+    ("-- SELECT\nDELETE FROM t", ONLY_SELECT),
+    ("EXPLAIN ANALYZE DELETE FROM t", ONLY_SELECT),
+    ("EXPLAIN (TYPE IO) INSERT INTO t VALUES (1)", ONLY_SELECT),
+    ("(DELETE FROM t)", ONLY_SELECT),
+    ("'SELECT' FROM t", ONLY_SELECT),
+    # write keywords anywhere in a read
+    ("WITH x AS (SELECT 1) INSERT INTO t SELECT * FROM x", 'Query contains prohibited keyword: INSERT'),
+    # unterminated literals and comments
+    ("SELECT 'abc", 'Unterminated string literal at position 7'),
+    ("SELECT * FROM t WHERE a = 'it''s", 'Unterminated string literal at position 30'),  # 'it' closes
+    ('SELECT "abc', 'Unterminated quoted identifier at position 7'),
+    ("SELECT `abc", 'Unterminated quoted identifier at position 7'),
+    ("SELECT 1 /* DROP", 'Unterminated comment at position 9'),
+]
+
+
+@pytest.mark.parametrize('sql', ALLOWED)
+def test_allowed(sql):
+    assert validate_sql(sql) is None
+
+
+@pytest.mark.parametrize('sql, error', REJECTED)
+def test_rejected(sql, error):
+    assert validate_sql(sql) == error
+
+
+@pytest.mark.parametrize('keyword', FORBIDDEN_KEYWORDS)
+@pytest.mark.parametrize('template', [
+    "SELECT * FROM t WHERE x = 1 {kw}",
+    "SELECT {kw} FROM t",
+    "select a from t where {kw} = 1",
+])
+def test_forbidden_keyword_as_bare_token(keyword, template):
+    sql = template.format(kw=keyword if template[0] == 'S' else keyword.lower())
+    assert validate_sql(sql) == f'Query contains prohibited keyword: {keyword}'
+
+
+@pytest.mark.parametrize('keyword', FORBIDDEN_KEYWORDS)
+def test_forbidden_keyword_inside_names_and_literals(keyword):
+    sql = f"SELECT {keyword.lower()}_count, '{keyword}' AS label, \"{keyword}\" FROM t -- {keyword}"
+    assert validate_sql(sql) is None
+
+
+@pytest.mark.parametrize('keyword', FORBIDDEN_KEYWORDS)
+def test_forbidden_keyword_as_statement(keyword):
+    assert validate_sql(f"{keyword} something") == ONLY_SELECT
+
+
+def test_verdict_is_memoized():
+    sql = f"SELECT 1; DROP TABLE memo_{uuid.uuid4().hex}"
+    misses = sql_validation.stats['misses']
+    assert validate_sql(sql) == ONE_STATEMENT
+    assert sql_validation.stats['misses'] == misses + 1
+    hits = sql_validation.stats['hits']
+    assert validate_sql(sql) == ONE_STATEMENT
+    assert sql_validation.stats['hits'] == hits + 1
+    assert sql_validation.stats['misses'] == misses + 1
@@ -0,0 +1,73 @@
+"""Token streaming: coalescing and closing the stream early (client disconnect)."""
+
+import asyncio
+
+import pytest
+
+from nfl_athena.deadline import Deadline
+from stream_coalescing import CoalesceConfig, coalesce_text, stream_tokens
+
+
+class FakeAgent:
+    """stream_async yields one text delta per event and records when it is closed"""
+
+    def __init__(self, deltas, delay=0.001):
+        self.deltas = deltas
+        self.delay = delay
+        self.closed = False
+
+    async def stream_async(self, user_message):
+        try:
+            for text in self.deltas:
+                await asyncio.sleep(self.delay)
+                yield {"data": text}
+        finally:
+            self.closed = True
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+async def deltas_of(texts):
+    for text in texts:
+        yield text
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+def test_stream_returns_all_text(enabled):
+    agent = FakeAgent(['The ', 'Chiefs ', 'won.', ' Next'])
+    events = asyncio.run(collect(stream_tokens(agent, 'q', Deadline(60), CoalesceConfig(enabled=enabled))))
+    assert ''.join(event['text'] for event in events) == 'The Chiefs won. Next'
+    assert agent.closed
+
+
+def test_coalescing_groups_deltas():
+    config = CoalesceConfig(enabled=True, max_chars=8, max_delay_ms=1000, sentence_flush=False)
+    chunks = asyncio.run(collect(coalesce_text(deltas_of(['a', 'bb', 'ccc', 'dddd', 'e']), config)))
+    assert chunks == ['a', 'bbcccdddd', 'e']
+
+
+@pytest.mark.parametrize('enabled', [True, False])
+def test_close_after_breaking_out_early(enabled):
+    agent = FakeAgent(['token '] * 1000)
+
+    async def disconnect():
+        stream = stream_tokens(agent, 'q', Deadline(60), CoalesceConfig(enabled=enabled, max_delay_ms=0))
+        async for event in stream:
+            assert event['type'] == 'token'
+            break
+        await stream.aclose()  # what the server does when the UI goes away
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(disconnect()) == set()  # the coalescing producer is gone too
+    assert agent.closed
+
+
+def test_deadline_stops_the_stream():
+    agent = FakeAgent(['token '] * 1000, delay=0.01)
+    deadline = Deadline(0.05)
+    events = asyncio.run(collect(stream_tokens(agent, 'q', deadline, CoalesceConfig(enabled=True))))
+    assert events[-1]['type'] == 'error'
+    assert agent.closed
+    assert deadline.cancelled
@@ -0,0 +1,151 @@
+"""
+Session-scoped memoization of tool results.
+
+In one recap or analysis session the model often repeats a call it already
+made - the same get_schedules filter, the same get_context game, the same KB
+search - and each repeat pays the full S3/Athena/Bedrock latency again.
+`ToolMemo` keeps successful results per session, keyed by tool name and the
+canonical JSON of the input (sorted keys, None values dropped), so a repeat is
+answered from memory. agent_config.ToolMemoHooks applies it to every tool of
+an agent, local and MCP alike.
+
+- per session: LRU of `TOOL_MEMO_MAX_ENTRIES` results, each kept `TOOL_MEMO_TTL_SECONDS`
+- per process: LRU of `TOOL_MEMO_MAX_SESSIONS` sessions
+- results larger than `TOOL_MEMO_MAX_RESULT_BYTES` and error results are not kept -
+  including failures reported inside a successful ToolResult (MCP targets
+  answer `{"error": ...}`, local tools "Error: ..."), so a retry runs again
+- tools in `TOOL_MEMO_OPT_OUT` (matched against the end of the tool name, so
+  MCP target prefixes don't matter) and calls with an operation in
+  `OPT_OUT_OPERATIONS` always run - they write or poll something that changes
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Configuration (override with environment variables)
+MEMO_ENABLED = os.environ.get('TOOL_MEMO', 'true').lower() not in ('0', 'false', 'no')
+MAX_ENTRIES = int(os.environ.get('TOOL_MEMO_MAX_ENTRIES', 64))
+MAX_SESSIONS = int(os.environ.get('TOOL_MEMO_MAX_SESSIONS', 256))
+TTL_SECONDS = float(os.environ.get('TOOL_MEMO_TTL_SECONDS', 900))
+MAX_RESULT_BYTES = int(os.environ.get('TOOL_MEMO_MAX_RESULT_BYTES', 256 * 1024))
+OPT_OUT_TOOLS = tuple(name.strip() for name in
+                      os.environ.get('TOOL_MEMO_OPT_OUT', 'nfl_query_learning_service').split(',') if name.strip())
+
+# Operations whose result changes between identical calls (writes, async query polling)
+OPT_OUT_OPERATIONS = {'write_learning', 'submit_query', 'get_query_result'}
+
+
+def canonical_input(tool_input: Any) -> str:
+    """Stable JSON for a tool input: sorted keys, None values dropped"""
+    def clean(value):
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple)):
+            return [clean(v) for v in value]
+        return value
+    return json.dumps(clean(tool_input), sort_keys=True, separators=(',', ':'), default=str)
+
+
+def memo_key(tool_name: str, tool_input: Any) -> str:
+    return hashlib.sha256(f"{tool_name}\n{canonical_input(tool_input)}".encode('utf-8')).hexdigest()
+
+
+def is_memoizable(tool_name: str, tool_input: Any, opt_out=OPT_OUT_TOOLS) -> bool:
+    if any(tool_name == name or tool_name.endswith(name) for name in opt_out):
+        return False
+    if isinstance(tool_input, dict) and tool_input.get('operation') in OPT_OUT_OPERATIONS:
+        return False
+    return True
+
+
+def is_error_result(result: Dict[str, Any]) -> bool:
+    """A failed call: error status, or an error payload inside a 'success' result"""
+    if result.get('status') != 'success':
+        return True
+    for item in result.get('content', []):
+        payload = item.get('json')
+        if 'text' in item:
+            text = item['text'].strip()
+            if text.startswith('Error:'):
+                return True
+            if text.startswith('{'):
+                try:
+                    payload = json.loads(text)
+                except ValueError:
+                    continue
+        if isinstance(payload, dict) and 'error' in payload:
+            return True
+    return False
+
+
+class SessionMemo:
+    """LRU of one session's tool results"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, str, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.hits_by_tool: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.hits_by_tool[entry[1]] = self.hits_by_tool.get(entry[1], 0) + 1
+            return entry[2]
+
+    def put(self, key: str, tool_name: str, result: Dict[str, Any]) -> bool:
+        if is_error_result(result):
+            return False
+        if len(json.dumps(result.get('content', []), default=str)) > MAX_RESULT_BYTES:
+            return False
+        with self._lock:
+            self._entries[key] = (time.monotonic(), tool_name, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'hits_by_tool': dict(self.hits_by_tool)}
+
+
+class ToolMemo:
+    """Per-process LRU of session memos"""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: 'OrderedDict[str, SessionMemo]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def session(self, session_key: Optional[str]) -> SessionMemo:
+        """The memo for a session; without a session key a private memo (one agent's lifetime)"""
+        if not session_key:
+            return SessionMemo()
+        with self._lock:
+            memo = self._sessions.get(session_key)
+            if memo is None:
+                memo = self._sessions[session_key] = SessionMemo()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_key)
+            return memo
+
+
+tool_memo = ToolMemo()
@@ -0,0 +1,222 @@
+"""
+Concurrent execution of the tool calls in one model turn.
+
+The recap workflow asks for get_context, get_game_inputs and get_game_outputs
+of the same game in one turn; they are independent, but each blocks on boto3.
+`ToolExecutor` runs them side by side:
+
+- sync (local) tools run on a bounded thread pool of `TOOL_EXECUTOR_MAX_WORKERS`
+  threads, with the caller's contextvars (request deadline, trace span)
+- each tool name has its own concurrency limit (`TOOL_CONCURRENCY`, e.g.
+  "query_athena=2,nfl_kb_search=4"; others get `TOOL_DEFAULT_CONCURRENCY`)
+
+Strands already starts a turn's tool uses concurrently and returns their
+results in tool-use order; this only bounds how many run at once.
+
+agent_config.ToolSchedulingHooks applies it to every tool call of an agent.
+
+It is also the agent's async tool runtime: a module in tools/ may provide a
+native coroutine `<tool>_async(**input)` (query_athena polls Athena with
+`wait_for_query_async`), which LocalTool awaits on the event loop; other tools
+go to the pool. Blocking per-invocation setup and teardown (`run_blocking`:
+MCP connect, S3 session reads, session flush) has its own pool of
+`AGENT_IO_MAX_WORKERS` threads - by default one per admitted invocation
+(`AGENT_MAX_CONCURRENT`) - so it never queues behind tool calls, nor tool
+calls behind it. `loop_monitor` reports
+when the event loop was blocked for more than `LOOP_LAG_WARN_MS`.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Configuration (override with environment variables)
+MAX_WORKERS = int(os.environ.get('TOOL_EXECUTOR_MAX_WORKERS', 8))
+IO_MAX_WORKERS = int(os.environ.get('AGENT_IO_MAX_WORKERS', os.environ.get('AGENT_MAX_CONCURRENT', 16)))
+DEFAULT_CONCURRENCY = int(os.environ.get('TOOL_DEFAULT_CONCURRENCY', 4))
+LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get('LOOP_LAG_INTERVAL_SECONDS', 0.1))
+LOOP_LAG_WARN_MS = float(os.environ.get('LOOP_LAG_WARN_MS', 100))
+
+# Athena has a per-account concurrency quota shared with the Lambdas
+TOOL_CONCURRENCY = {'query_athena': 2}
+
+
+def _parse_limits(value: str) -> Dict[str, int]:
+    limits = {}
+    for item in value.split(','):
+        name, _, limit = item.partition('=')
+        if name.strip() and limit.strip().isdigit():
+            limits[name.strip()] = max(1, int(limit))
+    return limits
+
+
+TOOL_CONCURRENCY.update(_parse_limits(os.environ.get('TOOL_CONCURRENCY', '')))
+
+
+def tool_result(tool_use: Dict[str, Any], output: Any) -> Dict[str, Any]:
+    """ToolResult for a tool function's return value (dicts are assumed to be ToolResults)"""
+    if isinstance(output, dict) and 'content' in output:
+        return {**output, 'toolUseId': tool_use['toolUseId']}
+    text = output if isinstance(output, str) else str(output)
+    return {
+        'toolUseId': tool_use['toolUseId'],
+        'status': 'error' if text.startswith('Error') else 'success',
+        'content': [{'text': text}],
+    }
+
+
+async def call_local_tool_async(func: Callable[..., Awaitable[Any]], tool_use: Dict[str, Any]) -> Dict[str, Any]:
+    """Await a module's native async variant (`<tool>_async(**input)`) on the event loop"""
+    try:
+        return tool_result(tool_use, await func(**(tool_use.get('input') or {})))
+    except Exception as e:
+        return tool_result(tool_use, f"Error: {e}")
+
+
+def call_local_tool(func: Callable[..., Any], tool_use: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Call a module tool with either calling convention used in tools/:
+    `func(tool, **kwargs)` returning a ToolResult, or keyword arguments
+    (query_athena, nfl_game_service) returning text.
+    """
+    try:
+        first = next(iter(inspect.signature(func).parameters), None)
+        if first == 'tool':
+            return tool_result(tool_use, func(tool_use))
+        return tool_result(tool_use, func(**(tool_use.get('input') or {})))
+    except Exception as e:
+        return tool_result(tool_use, f"Error: {e}")
+
+
+class ToolExecutor:
+    """Bounded thread pool plus per-tool concurrency limits, shared by all agents in the process."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, limits: Optional[Dict[str, int]] = None,
+                 default_limit: int = DEFAULT_CONCURRENCY):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='nfl-tool')
+        self.max_workers = max_workers
+        self.limits = dict(TOOL_CONCURRENCY if limits is None else limits)
+        self.default_limit = default_limit
+        # asyncio semaphores belong to one event loop (the CLI runs a new loop per question)
+        self._semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'running': 0, 'peak_running': 0, 'limit_wait_ms': 0.0}
+
+    def limit(self, tool_name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(tool_name)
+            if semaphore is None:
+                semaphore = semaphores[tool_name] = asyncio.Semaphore(self.limits.get(tool_name, self.default_limit))
+            return semaphore
+
+    async def run_sync(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run blocking work on the tool pool with the caller's context (deadline, trace span)"""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool, functools.partial(context.run, func, *args, **kwargs))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, tool_name: str):
+        """Hold one of the tool's concurrency slots"""
+        waited = time.perf_counter()
+        async with self.limit(tool_name):
+            with self._lock:
+                self.stats['calls'] += 1
+                self.stats['running'] += 1
+                self.stats['peak_running'] = max(self.stats['peak_running'], self.stats['running'])
+                self.stats['limit_wait_ms'] = round(self.stats['limit_wait_ms'] + (time.perf_counter() - waited) * 1000, 1)
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self.stats['running'] -= 1
+
+    async def run(self, tool_name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await one tool call under its tool's concurrency limit"""
+        async with self.slot(tool_name):
+            return await call()
+
+
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Process-wide executor (one thread pool for every session)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ToolExecutor()
+        return _executor
+
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Process-wide pool for invocation setup/teardown, separate from the tool pool"""
+    global _io_pool
+    with _executor_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_MAX_WORKERS, thread_name_prefix='nfl-io')
+        return _io_pool
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking setup/teardown (MCP connect, S3 session IO) off the event loop, with the caller's context"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_io_pool(), functools.partial(context.run, func, *args, **kwargs))
+
+
+class LoopLagMonitor:
+    """
+    Measures how late a periodic timer fires on the event loop. A lag above
+    `LOOP_LAG_WARN_MS` means something blocked the loop - and every other
+    session served by the same worker - for that long.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS, warn_ms: float = LOOP_LAG_WARN_MS):
+        self.interval = interval
+        self.warn_ms = warn_ms
+        self._tasks: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]' = weakref.WeakKeyDictionary()
+        self._blocked: 'deque[Tuple[float, float]]' = deque(maxlen=256)  # (monotonic time, lag ms)
+        self.stats = {'checks': 0, 'blocked': 0, 'max_lag_ms': 0.0}
+
+    def ensure_running(self):
+        """Start monitoring the running loop (once per loop)"""
+        loop = asyncio.get_running_loop()
+        if self.interval > 0 and loop not in self._tasks:
+            self._tasks[loop] = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.monotonic() - expected) * 1000)
+            self.stats['checks'] += 1
+            self.stats['max_lag_ms'] = round(max(self.stats['max_lag_ms'], lag_ms), 1)
+            if lag_ms >= self.warn_ms:
+                self.stats['blocked'] += 1
+                self._blocked.append((time.monotonic(), lag_ms))
+                print(f"DEBUG: Event loop blocked for {lag_ms:.0f} ms")
+
+    def blocked_since(self, since: float) -> Dict[str, Any]:
+        """Blocked intervals seen after `since` (time.monotonic()), e.g. during one request"""
+        lags = [lag for at, lag in list(self._blocked) if at >= since]
+        return {'blocked': len(lags), 'max_lag_ms': round(max(lags), 1) if lags else 0.0}
+
+
+loop_monitor = LoopLagMonitor()
@@ -3,6 +3,7 @@
 import boto3
 import json
 from typing import Any
+from nfl_athena.deadline import current_deadline
 
 TOOL_SPEC = {
     "name": "get_game_inputs",
@@ -82,8 +83,12 @@ def get_game_inputs(tool, **kwargs: Any):
         
         result_text = f"Input files for game {unique_game_id}:\n\n"
         
-        # Process each file
+        # Process each file (stop early if the request is cancelled or out of time)
+        deadline = current_deadline()
         for obj in response['Contents']:
+            if deadline and deadline.expired():
+                result_text += f"[Stopped reading files: request {deadline.describe()}]\n"
+                break
             file_key = obj['Key']
             file_name = file_key.split('/')[-1]  # Get just the filename
             
@@ -1,7 +1,14 @@
 import boto3
 import time
-import pandas as pd
 from typing import Dict, Any, List
+from nfl_athena.results import decode_result_set
+from nfl_athena.cost import guard_query, compare_with_actual
+from nfl_athena.local_engine import execute_local
+from nfl_athena.batch import iter_batch, MAX_CONCURRENCY, MAX_STATEMENTS
+from nfl_athena.deadline import Deadline, current_deadline, wait_for_query, wait_for_query_async
+from nfl_athena.sql_validation import validate_sql
+from nfl_athena.templates import TEMPLATES, resolve, render
+from tool_runtime import get_tool_executor
 
 TOOL_SPEC = {
     "name": "query_athena",
@@ -14,127 +21,276 @@ TOOL_SPEC = {
                     "type": "string",
                     "description": "The SQL query to execute (SELECT statements only)"
                 },
+                "sql_queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several independent SELECT statements to run concurrently instead of sql_query (e.g. player A vs player B)"
+                },
                 "database": {
                     "type": "string", 
                     "description": "The Athena database name",
                     "default": "nfl_stats_database"
+                },
+                "allow_full_scan": {
+                    "type": "boolean",
+                    "description": "Set to true only when the query must scan every nfl_season partition of a large table",
+                    "default": False
+                },
+                "template": {
+                    "type": "string",
+                    "enum": list(TEMPLATES),
+                    "description": "Run a curated query instead of writing SQL: " + "; ".join(
+                        f"{t.name} ({', '.join(p.name for p in t.params)}): {t.description}" for t in TEMPLATES.values())
+                },
+                "parameters": {
+                    "type": "object",
+                    "description": "Parameters for template, e.g. {\"team\": \"KC\", \"season\": 2024}"
                 }
             },
-            "required": ["sql_query"]
+            "required": []
         }
     }
 }
 
-def query_athena(sql_query: str, database: str = "nfl_stats_database") -> str:
+def validate_query(sql_query: str) -> str:
+    """Return an error message for a query that must not run, or an empty string"""
+    if not sql_query:
+        return "Error: SQL query cannot be empty"
+    
+    # Safety checks - a single read-only statement (shared with the nfl-data-service Lambda)
+    validation_error = validate_sql(sql_query)
+    if validation_error:
+        return f"Error: {validation_error}"
+    return ""
+
+def query_athena(sql_query: str = "", database: str = "nfl_stats_database", allow_full_scan: bool = False,
+                 sql_queries: List[str] = None, template: str = None, parameters: Dict[str, Any] = None) -> str:
     """
     Execute a SQL query against AWS Athena and return results.
     
     Args:
         sql_query: The SQL query to execute
         database: The Athena database name (default: nfl_stats_database)
+        allow_full_scan: Skip the full-scan guard for large partitioned tables
+        sql_queries: Independent queries to run concurrently instead of sql_query
+        template: Name of a curated query (nfl_athena.templates) to run instead of sql_query
+        parameters: Typed parameters for the template
         
     Returns:
         String with query results or error information
     """
-    
-    # Initialize AWS session with nfl profile
-    session = boto3.Session(profile_name='nfl')
-    athena_client = session.client('athena')
-    
-    # Configuration
-    s3_output_bucket = "alt-nfl-bucket"
-    s3_output_prefix = "athena_queries/"
+    if sql_queries:
+        return query_athena_batch(sql_queries, database, allow_full_scan)
     
     try:
-        # Basic query validation
-        sql_query = sql_query.strip()
-        if not sql_query:
-            return "Error: SQL query cannot be empty"
+        answer, plan = prepare_query(sql_query, database, allow_full_scan, template, parameters)
+        if answer is not None:
+            return answer
         
-        # Safety checks - only allow SELECT statements
-        query_upper = sql_query.upper().strip()
-        if not query_upper.startswith('SELECT'):
-            return "Error: Only SELECT queries are allowed for security reasons"
+        # Wait for query completion - at most 60 seconds and never past the agent's request
+        # deadline; the query is stopped if the client disconnects while we wait
+        query_deadline = (current_deadline() or Deadline()).child(60)
+        try:
+            response, error = wait_for_query(plan['athena_client'], plan['query_execution_id'], query_deadline,
+                                             poll_interval=2)
+        finally:
+            query_deadline.close()
+        if error:
+            return f"Error: {error}"
         
-        # Check for potentially dangerous keywords
-        dangerous_keywords = ['DROP', 'DELETE', 'INSERT', 'UPDATE', 'CREATE', 'ALTER', 'TRUNCATE']
-        for keyword in dangerous_keywords:
-            if keyword in query_upper:
-                return f"Error: Query contains forbidden keyword '{keyword}'. Only SELECT queries are allowed."
+        return finish_query(plan, response)
         
-        # Start query execution
-        response = athena_client.start_query_execution(
-            QueryString=sql_query,
-            QueryExecutionContext={'Database': database},
-            ResultConfiguration={
-                'OutputLocation': f's3://{s3_output_bucket}/{s3_output_prefix}'
-            }
-        )
+    except Exception as e:
+        return f"Error executing Athena query: {str(e)}"
+
+
+async def query_athena_async(sql_query: str = "", database: str = "nfl_stats_database", allow_full_scan: bool = False,
+                             sql_queries: List[str] = None, template: str = None,
+                             parameters: Dict[str, Any] = None) -> str:
+    """
+    query_athena for the agent's event loop (picked up by agent_config.LocalTool).
+    
+    Validation, submission and result formatting run on the shared tool pool;
+    the wait for the query sleeps on the event loop between polls, so a long
+    query no longer holds a pool thread.
+    """
+    run_sync = get_tool_executor().run_sync
+    if sql_queries:
+        return await run_sync(query_athena_batch, sql_queries, database, allow_full_scan)
+    
+    try:
+        answer, plan = await run_sync(prepare_query, sql_query, database, allow_full_scan, template, parameters)
+        if answer is not None:
+            return answer
         
-        query_execution_id = response['QueryExecutionId']
+        query_deadline = (current_deadline() or Deadline()).child(60)
+        try:
+            response, error = await wait_for_query_async(plan['athena_client'], plan['query_execution_id'],
+                                                         query_deadline, poll_interval=2, run_sync=run_sync)
+        finally:
+            query_deadline.close()
+        if error:
+            return f"Error: {error}"
         
-        # Wait for query completion
-        max_wait_time = 60  # seconds
-        elapsed_time = 0
+        return await run_sync(finish_query, plan, response)
         
-        while elapsed_time < max_wait_time:
-            response = athena_client.get_query_execution(QueryExecutionId=query_execution_id)
-            status = response['QueryExecution']['Status']['State']
+    except Exception as e:
+        return f"Error executing Athena query: {str(e)}"
+
+
+def prepare_query(sql_query: str, database: str, allow_full_scan: bool, template: str = None,
+                  parameters: Dict[str, Any] = None):
+    """
+    Everything before the wait (blocking): resolve, validate, try the local
+    engine, guard the scan and start the Athena execution.
+    
+    Returns (answer, None) when the query is already answered or rejected, or
+    (None, plan) with the started execution.
+    """
+    if template:
+        # Same SQL the nfl-data-service runs as a prepared statement, with the values inlined
+        resolved, values, error = resolve(template, parameters)
+        if error:
+            return f"Error: {error}", None
+        sql_query = render(resolved, values)
+    
+    # Configuration
+    s3_output_bucket = "alt-nfl-bucket"
+    s3_output_prefix = "athena_queries/"
+    
+    # Basic query validation
+    sql_query = sql_query.strip()
+    validation_error = validate_query(sql_query)
+    if validation_error:
+        return validation_error, None
+    
+    # Small or mirrored tables are answered by the embedded engine (LOCAL_ENGINE_MODE=offline: never AWS).
+    # Development only: duckdb isn't in uv.lock, so in the agent container this always goes to Athena
+    local_result, local_route = execute_local(
+        sql_query, s3_client_factory=lambda: boto3.Session(profile_name='nfl').client('s3'))
+    if local_result is not None:
+        return format_results(local_result) + f"\n\nEngine: local ({local_route['elapsed_ms']} ms)", None
+    if local_route.get('error'):
+        return f"Error: {local_route['error']}", None
+    
+    # Initialize AWS session with nfl profile
+    session = boto3.Session(profile_name='nfl')
+    athena_client = session.client('athena')
+    
+    # Estimate bytes scanned and apply the full-scan policy before submitting
+    original_sql = sql_query
+    sql_query, scan_estimate, scan_error = guard_query(sql_query, allow_full_scan=allow_full_scan)
+    if scan_error:
+        return f"Error: {scan_error}", None
+    
+    # Start query execution
+    response = athena_client.start_query_execution(
+        QueryString=sql_query,
+        QueryExecutionContext={'Database': database},
+        ResultConfiguration={
+            'OutputLocation': f's3://{s3_output_bucket}/{s3_output_prefix}'
+        }
+    )
+    
+    return None, {
+        'athena_client': athena_client,
+        'query_execution_id': response['QueryExecutionId'],
+        'sql_query': sql_query,
+        'original_sql': original_sql,
+        'scan_estimate': scan_estimate,
+    }
+
+
+def finish_query(plan: Dict[str, Any], response: Dict[str, Any]) -> str:
+    """Everything after a successful wait (blocking): fetch, decode and format the results"""
+    scan_estimate = plan['scan_estimate']
+    
+    # Compare the estimate with what Athena actually scanned
+    statistics = response['QueryExecution'].get('Statistics', {})
+    compare_with_actual(scan_estimate, statistics.get('DataScannedInBytes'))
+    scan_text = f"Scan: estimated {scan_estimate['estimated_mb']} MB"
+    if 'actual_mb' in scan_estimate:
+        scan_text += f", actual {scan_estimate['actual_mb']} MB"
+    if plan['sql_query'] != plan['original_sql']:
+        scan_text += f" (confined to seasons {', '.join(scan_estimate['confined_to_seasons'])})"
+    
+    # Get query results
+    results = plan['athena_client'].get_query_results(QueryExecutionId=plan['query_execution_id'])
+    
+    # Decode into typed columns using the result set metadata
+    result = decode_result_set(results['ResultSet'])
+    
+    return format_results(result) + f"\n\n{scan_text}"
+
+
+def query_athena_batch(sql_queries: List[str], database: str = "nfl_stats_database",
+                       allow_full_scan: bool = False) -> str:
+    """
+    Run independent queries concurrently and return their results in input order.
+    
+    Every Athena statement is started at once (up to ATHENA_BATCH_MAX_CONCURRENCY)
+    and polled together, so the batch takes about as long as its slowest query.
+    """
+    if len(sql_queries) > MAX_STATEMENTS:
+        return f"Error: At most {MAX_STATEMENTS} queries can run in one batch"
+    
+    start_time = time.time()
+    sections = [""] * len(sql_queries)
+    athena_queries = []  # (index, sql)
+    
+    try:
+        for index, sql_query in enumerate(sql_queries):
+            sql_query = sql_query.strip()
+            validation_error = validate_query(sql_query)
+            if validation_error:
+                sections[index] = validation_error
+                continue
             
-            if status == 'SUCCEEDED':
-                break
-            elif status in ['FAILED', 'CANCELLED']:
-                error_reason = response['QueryExecution']['Status'].get('StateChangeReason', 'Unknown error')
-                return f"Error: Query failed - {error_reason}"
+            local_result, local_route = execute_local(
+                sql_query, s3_client_factory=lambda: boto3.Session(profile_name='nfl').client('s3'))
+            if local_result is not None:
+                sections[index] = format_results(local_result) + f"\n\nEngine: local ({local_route['elapsed_ms']} ms)"
+                continue
+            if local_route.get('error'):
+                sections[index] = f"Error: {local_route['error']}"
+                continue
             
-            time.sleep(2)
-            elapsed_time += 2
-        
-        if elapsed_time >= max_wait_time:
-            return "Error: Query timed out after 60 seconds"
+            guarded_sql, _, scan_error = guard_query(sql_query, allow_full_scan=allow_full_scan)
+            if scan_error:
+                sections[index] = f"Error: {scan_error}"
+                continue
+            athena_queries.append((index, guarded_sql))
         
-        # Get query results
-        results = athena_client.get_query_results(QueryExecutionId=query_execution_id)
+        if athena_queries:
+            session = boto3.Session(profile_name='nfl')
+            athena_client = session.client('athena')
+            batch = iter_batch(athena_client, [sql for _, sql in athena_queries], database,
+                               max_concurrency=MAX_CONCURRENCY, max_wait_time=60, deadline=current_deadline())
+            for position, execution, elapsed in batch:
+                index = athena_queries[position][0]
+                status = execution['Status']
+                if status['State'] != 'SUCCEEDED':
+                    reason = status.get('StateChangeReason', 'Unknown error')
+                    sections[index] = f"Error: {reason}" if reason.startswith('Query ') else f"Error: Query failed - {reason}"
+                    continue
+                results = athena_client.get_query_results(QueryExecutionId=execution['QueryExecutionId'])
+                scanned_mb = execution.get('Statistics', {}).get('DataScannedInBytes', 0) / (1024 * 1024)
+                sections[index] = (format_results(decode_result_set(results['ResultSet']))
+                                   + f"\n\nScan: actual {scanned_mb:.2f} MB, finished after {elapsed:.1f}s")
         
-        # Process results
-        rows = results['ResultSet']['Rows']
-        
-        if not rows:
-            return "Query executed successfully but returned no data rows."
-        
-        # Extract column names from first row
-        columns = [col['VarCharValue'] for col in rows[0]['Data']]
-        
-        # Extract data rows (skip header)
-        data_rows = []
-        for row in rows[1:]:  # Skip header row
-            row_data = []
-            for cell in row['Data']:
-                # Handle different data types
-                if 'VarCharValue' in cell:
-                    row_data.append(cell['VarCharValue'])
-                elif 'BigIntValue' in cell:
-                    row_data.append(str(cell['BigIntValue']))
-                elif 'IntegerValue' in cell:
-                    row_data.append(str(cell['IntegerValue']))
-                elif 'DoubleValue' in cell:
-                    row_data.append(str(cell['DoubleValue']))
-                else:
-                    row_data.append('NULL')
-            data_rows.append(row_data)
-        
-        # Format results as a readable table
-        if data_rows:
-            # Create DataFrame for better formatting
-            df = pd.DataFrame(data_rows, columns=columns)
-            result_text = f"Query Results ({len(data_rows)} rows):\n\n{df.to_string(index=False)}"
-        else:
-            result_text = "Query executed successfully but returned no data rows."
-        
-        return result_text
+        body = "\n\n".join(f"=== Query {i + 1} ===\n{section}" for i, section in enumerate(sections))
+        return f"{body}\n\nBatch of {len(sql_queries)} queries finished in {time.time() - start_time:.1f}s"
         
     except Exception as e:
-        return f"Error executing Athena query: {str(e)}"
+        return f"Error executing Athena batch: {str(e)}"
+
+
+def format_results(result) -> str:
+    """Format a decoded result as a readable table"""
+    if result.row_count:
+        df = result.to_pandas()
+        return f"Query Results ({result.row_count} rows):\n\n{df.to_string(index=False, na_rep='NULL')}"
+    return "Query executed successfully but returned no data rows."
 
 
 def main():
@@ -35,6 +35,11 @@ export const MODEL_OPTIONS: ModelOption[] = [
     id: 'us.anthropic.claude-sonnet-4-20250514-v1:0',
     name: 'Claude Sonnet 4',
     description: 'Advanced reasoning and analysis'
+  },
+  {
+    id: 'auto',
+    name: 'Auto (routed)',
+    description: 'Picks Nova Micro, Nova Pro or Claude Sonnet 4 per request'
   }
 ];
 